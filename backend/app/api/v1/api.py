@@ -2,7 +2,7 @@
 API v1 router
 """
 from fastapi import APIRouter
-from .endpoints import contacts, audio, query, events, vector_search, auth
+from .endpoints import contacts, audio, query, events, vector_search, auth, taxonomy, jobs, duplicates
 
 api_router = APIRouter()
 
@@ -12,3 +12,6 @@ api_router.include_router(audio.router, prefix="/audio", tags=["audio"])
 api_router.include_router(query.router, prefix="/query", tags=["query"])
 api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(vector_search.router, prefix="/search", tags=["vector-search"])
+api_router.include_router(taxonomy.router, prefix="/taxonomy", tags=["taxonomy"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(duplicates.router, prefix="/duplicates", tags=["duplicates"])
@@ -1,18 +1,26 @@
 """
 Audio processing endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 import os
-import aiofiles
-import openai
 from datetime import datetime
 
 from ....core.database import get_db
+from ....core.callbacks import check_callback_url
 from ....core.config import settings
-from ....models import AudioRecording, Contact, ContactInterest, ContactSkill
+from ....core.fields import parse_fields
+from ....core.uploads import AUDIO_EXTENSIONS, UploadTooLarge, save_upload
+from ....core.responses import FastJSONResponse, row_serializer
+from ....core.streaming import RangeFileResponse
+from ....models import AudioContactLink, AudioRecording
+from ....services.audio_processing import EXTRACTION_PROMPT_HASHES, audio_processing_service
+from ....services.audio_storage import audio_storage_service
+from ....services.extraction_cache import extraction_cache
+from ....services.jobs import job_service
+from ....services.transcripts import has_transcript, transcript_store
 from ....services.vector_store import vector_store
 
 router = APIRouter()
@@ -29,259 +37,367 @@ class AudioProcessingResponse(BaseModel):
 class TranscriptionRequest(BaseModel):
     audio_id: int
 
+class TranscodeRequest(BaseModel):
+    older_than_days: Optional[int] = None  # Defaults to settings.transcode_after_days
+    limit: Optional[int] = None  # Most files to transcode in this job
+    dry_run: bool = False
+    callback_url: Optional[str] = None
+
 @router.post("/upload")
 async def upload_audio(
     file: UploadFile = File(...),
     contact_id: Optional[int] = Form(None),
+    process: bool = Form(False),
+    callback_url: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ):
-    """Upload audio file"""
+    """Upload audio file
+
+    The upload is rejected with 413 as soon as the request body passes
+    ``max_file_size`` (see ``UploadSizeLimitMiddleware``); an accepted file is
+    copied to disk in chunks while its SHA-256 is computed.
+    Files are stored by content hash: uploading the same bytes again keeps one
+    copy on disk and creates a recording linked via ``duplicate_of``, which
+    reuses the transcription and extraction of the first one.
+    With ``process=true`` an ``audio_process`` job (transcribe, then extract) is
+    queued and its ``job_id`` returned.
+    """
+    check_callback_url(callback_url)
+    stored = None
     try:
         # Validate file type
-        if not file.filename.lower().endswith(('.mp3', '.wav', '.m4a', '.flac')):
+        if not file.filename.lower().endswith(AUDIO_EXTENSIONS):
             raise HTTPException(status_code=400, detail="Unsupported audio format")
         
-        # Create upload directory if it doesn't exist
-        os.makedirs(settings.upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join(settings.upload_dir, unique_filename)
-        
         # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        stored = await save_upload(file, settings.upload_dir, content_addressed=True)
+        original = audio_processing_service.find_original(db, stored["sha256"])
+        file_path = stored["path"]
+        shares_original = original and original.file_path != file_path and os.path.exists(original.file_path)
+        if shares_original:
+            # Stored before uploads were content-addressed, or transcoded since: keep that copy only
+            if not stored["existing"]:
+                os.remove(file_path)
+            file_path = original.file_path
         
         # Create database record
         audio_record = AudioRecording(
             contact_id=contact_id,
             file_path=file_path,
             file_name=file.filename,
-            duration_seconds=None  # Could be calculated if needed
+            file_size=stored["size"],
+            content_hash=stored["sha256"],
+            duplicate_of_id=original.id if original else None,
+            duration_seconds=original.duration_seconds if original else None
         )
+        if shares_original and original.transcoded_at:
+            audio_record.stored_size = original.stored_size
+            audio_record.original_path = original.original_path
+            audio_record.transcoded_at = original.transcoded_at
+        if contact_id:
+            audio_record.contact_links.append(AudioContactLink(contact_id=contact_id))
         db.add(audio_record)
         db.commit()
         db.refresh(audio_record)
         
-        return {
+        result = {
             "id": audio_record.id,
             "file_name": audio_record.file_name,
             "file_path": audio_record.file_path,
+            "file_size": audio_record.file_size,
+            "content_hash": audio_record.content_hash,
+            "duplicate_of": audio_record.duplicate_of_id,
             "message": "File uploaded successfully"
         }
+        if process:
+            params = {"audio_id": audio_record.id}
+            if callback_url:
+                params["callback_url"] = callback_url
+            job = job_service.enqueue(db, "audio_process", params)
+            result["job_id"] = job.id
+            result["status_url"] = f"{settings.api_v1_str}/jobs/{job.id}"
+        return result
         
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
+        db.rollback()
+        if stored and not stored["existing"] and os.path.exists(stored["path"]):
+            os.remove(stored["path"])
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @router.post("/transcribe/{audio_id}")
-async def transcribe_audio(audio_id: int, db: Session = Depends(get_db)):
-    """Transcribe audio file using OpenAI Whisper"""
+def transcribe_audio(
+    audio_id: int,
+    response: Response,
+    background: bool = False,
+    callback_url: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Transcribe audio file using OpenAI Whisper
+
+    With ``?background=true`` the transcription is queued for the worker pool and
+    the job is returned (202); poll ``GET /jobs/{job_id}`` or pass
+    ``callback_url`` to be POSTed the final job state.
+    """
+    check_callback_url(callback_url)
     try:
-        # Get audio record
-        audio_record = db.query(AudioRecording).filter(AudioRecording.id == audio_id).first()
-        if not audio_record:
-            raise HTTPException(status_code=404, detail="Audio record not found")
-        
-        if not settings.openai_api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        
-        # Check if file exists
-        if not os.path.exists(audio_record.file_path):
-            raise HTTPException(status_code=404, detail="Audio file not found")
-        
-        # Transcribe using OpenAI Whisper
-        client = openai.OpenAI(api_key=settings.openai_api_key)
-        
-        with open(audio_record.file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file
-            )
-        
-        # Update database record
-        audio_record.transcription = transcript.text
-        audio_record.processed_at = datetime.now()
-        db.commit()
+        audio_record = audio_processing_service.get_recording(db, audio_id)
+        if background:
+            return enqueue_audio_job(db, response, "audio_transcribe", audio_record.id, callback_url)
         
+        text = audio_processing_service.transcribe(db, audio_record)
         return {
             "id": audio_record.id,
-            "transcription": transcript.text,
+            "transcription": text,
             "message": "Transcription completed successfully"
         }
         
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
 @router.post("/extract/{audio_id}")
-async def extract_contact_data(audio_id: int, db: Session = Depends(get_db)):
-    """Extract contact information from transcribed audio"""
-    try:
-        # Get audio record
-        audio_record = db.query(AudioRecording).filter(AudioRecording.id == audio_id).first()
-        if not audio_record:
-            raise HTTPException(status_code=404, detail="Audio record not found")
-        
-        if not audio_record.transcription:
-            raise HTTPException(status_code=400, detail="Audio must be transcribed first")
-        
-        if not settings.openai_api_key:
-            raise HTTPException(status_code=500, detail="OpenAI API key not configured")
-        
-        # Extract structured data using GPT
-        client = openai.OpenAI(api_key=settings.openai_api_key)
-        
-        extraction_prompt = f"""
-        Extract contact information from this conversation transcript and return it as JSON:
-
-        Transcript: "{audio_record.transcription}"
-
-        Extract the following information if available:
-        - first_name: string
-        - last_name: string
-        - email: string
-        - phone: string
-        - job_title: string
-        - company: string
-        - location: string (city, state/country)
-        - age: integer
-        - has_pets: boolean
-        - business_needs: string (what they need help with)
-        - personal_notes: string (interesting personal details)
-        - interests: array of objects with "interest_category" and "interest_value"
-        - skills: array of objects with "skill_name", "skill_level", and "years_experience"
+def extract_contact_data(
+    audio_id: int,
+    response: Response,
+    mode: str = "single",
+    background: bool = False,
+    callback_url: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Extract contact information from transcribed audio
 
-        Return only valid JSON without any additional text or formatting.
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert at extracting structured contact information from conversations. Always return valid JSON."},
-                {"role": "user", "content": extraction_prompt}
-            ],
-            temperature=0.1
-        )
-        
-        # Parse extracted data
-        import json
-        try:
-            extracted_data = json.loads(response.choices[0].message.content)
-        except json.JSONDecodeError:
-            # Fallback: try to clean the response
-            content = response.choices[0].message.content.strip()
-            if content.startswith('```json'):
-                content = content[7:]
-            if content.endswith('```'):
-                content = content[:-3]
-            extracted_data = json.loads(content)
-        
-        # Create or update contact if we have enough information
-        contact = None
-        if extracted_data.get('first_name'):
-            # Check if contact already linked to this audio
-            if audio_record.contact_id:
-                contact = db.query(Contact).filter(Contact.id == audio_record.contact_id).first()
-            
-            if not contact:
-                # Create new contact
-                contact = Contact(
-                    first_name=extracted_data.get('first_name', ''),
-                    last_name=extracted_data.get('last_name'),
-                    email=extracted_data.get('email'),
-                    phone=extracted_data.get('phone'),
-                    job_title=extracted_data.get('job_title'),
-                    company=extracted_data.get('company'),
-                    location=extracted_data.get('location'),
-                    age=extracted_data.get('age'),
-                    has_pets=extracted_data.get('has_pets', False),
-                    business_needs=extracted_data.get('business_needs'),
-                    personal_notes=extracted_data.get('personal_notes')
-                )
-                db.add(contact)
-                db.flush()
-                
-                # Add interests
-                for interest_data in extracted_data.get('interests', []):
-                    if interest_data.get('interest_value'):
-                        interest = ContactInterest(
-                            contact_id=contact.id,
-                            interest_category=interest_data.get('interest_category', 'General'),
-                            interest_value=interest_data['interest_value'],
-                            confidence_score=0.8  # AI extracted
-                        )
-                        db.add(interest)
-                
-                # Add skills
-                for skill_data in extracted_data.get('skills', []):
-                    if skill_data.get('skill_name'):
-                        skill = ContactSkill(
-                            contact_id=contact.id,
-                            skill_name=skill_data['skill_name'],
-                            skill_level=skill_data.get('skill_level'),
-                            years_experience=skill_data.get('years_experience')
-                        )
-                        db.add(skill)
-                
-                # Link audio to contact
-                audio_record.contact_id = contact.id
-                
-                db.commit()
-                db.refresh(contact)
-                
-                # Add to vector store
-                contact_data = {
-                    "first_name": contact.first_name,
-                    "last_name": contact.last_name,
-                    "job_title": contact.job_title,
-                    "company": contact.company,
-                    "location": contact.location,
-                    "business_needs": contact.business_needs,
-                    "personal_notes": contact.personal_notes,
-                    "interests": [{"interest_value": i.interest_value} for i in contact.interests],
-                    "skills": [{"skill_name": s.skill_name} for s in contact.skills]
-                }
-                vector_store.add_contact_embedding(contact.id, contact_data)
+    ``?mode=people`` extracts everyone in the recording with speaker attribution
+    from a single model call, and creates or links a contact for each of them.
+    ``background`` and ``callback_url`` work as for ``/transcribe/{audio_id}``.
+    """
+    check_callback_url(callback_url)
+    try:
+        if mode not in EXTRACTION_PROMPT_HASHES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        audio_record = audio_processing_service.get_recording(db, audio_id)
+        if background:
+            if not audio_record.transcription:
+                raise ValueError("Audio must be transcribed first")
+            extra = {"mode": mode} if mode != "single" else None
+            return enqueue_audio_job(db, response, "audio_extract", audio_record.id, callback_url, extra)
         
-        return {
+        if mode == "people":
+            extraction = audio_processing_service.extract_people(db, audio_record)
+        else:
+            extraction = audio_processing_service.extract(db, audio_record)
+        result = {
             "id": audio_record.id,
-            "extracted_data": extracted_data,
-            "contact_id": contact.id if contact else None,
+            "extracted_data": extraction["extracted_data"],
+            "contact_id": extraction["contact_id"],
+            "reused": extraction["reused"],
             "message": "Data extraction completed successfully"
         }
+        if mode == "people":
+            result["people"] = extraction["people"]
+        return result
         
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Data extraction failed: {str(e)}")
 
+def enqueue_audio_job(db: Session, response: Response, job_type: str, audio_id: int,
+                      callback_url: Optional[str] = None, extra_params: Optional[dict] = None) -> dict:
+    """Queue an audio job for the worker pool and describe it for a 202 response"""
+    params = {"audio_id": audio_id, **(extra_params or {})}
+    if callback_url:
+        params["callback_url"] = callback_url
+    job = job_service.enqueue(db, job_type, params)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {
+        "id": audio_id,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{settings.api_v1_str}/jobs/{job.id}",
+        "message": "Job queued"
+    }
+
+# Columns of the recording list; transcripts live in their own table and
+# has_transcription is an indexed EXISTS, so listing never reads them
+AUDIO_LIST_COLUMNS = {
+    "id": AudioRecording.id,
+    "file_name": AudioRecording.file_name,
+    "contact_id": AudioRecording.contact_id,
+    "duration_seconds": AudioRecording.duration_seconds,
+    "has_transcription": has_transcript(),
+    "processed_at": AudioRecording.processed_at,
+    "created_at": AudioRecording.created_at,
+}
+
 @router.get("/", response_model=List[dict])
 def get_audio_recordings(
     skip: int = 0,
     limit: int = 100,
     contact_id: Optional[int] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get audio recordings"""
-    query = db.query(AudioRecording)
+    """Get audio recordings; ``?fields=file_name,created_at`` returns only those fields"""
+    selected = parse_fields(fields, AUDIO_LIST_COLUMNS) or list(AUDIO_LIST_COLUMNS)
+    query = db.query(*[AUDIO_LIST_COLUMNS[f] for f in selected])
     
     if contact_id:
         query = query.filter(AudioRecording.contact_id == contact_id)
     
-    recordings = query.offset(skip).limit(limit).all()
+    serialize = row_serializer(selected)
+    return FastJSONResponse([serialize(row) for row in query.offset(skip).limit(limit)])
+
+@router.get("/dedupe-report")
+def get_dedupe_report(db: Session = Depends(get_db)):
+    """Duplicate uploads found by content hash, and the storage and model calls they saved"""
+    return audio_processing_service.dedupe_report(db)
+
+@router.get("/extraction-cache")
+def get_extraction_cache_stats(db: Session = Depends(get_db)):
+    """Cached extractions, hits, and recordings extracted with an older prompt"""
+    return extraction_cache.stats(db, list(EXTRACTION_PROMPT_HASHES.values()))
+
+@router.post("/extraction-cache/re-extract", status_code=status.HTTP_202_ACCEPTED)
+def re_extract_stale_recordings(
+    limit: int = 500,
+    callback_url: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Queue ``audio_extract`` jobs for recordings extracted with an older prompt
+
+    Only those recordings are sent to the model again, in the mode they were
+    extracted with; everything extracted with a current prompt is left alone.
+    """
+    check_callback_url(callback_url)
+    try:
+        current = list(EXTRACTION_PROMPT_HASHES.values())
+        stale = extraction_cache.stale_recordings(
+            db, current, AudioRecording.id, AudioRecording.extraction_result
+        ).order_by(AudioRecording.id).limit(limit).all()
+        jobs = []
+        for audio_id, extraction_result in stale:
+            params = {"audio_id": audio_id}
+            if isinstance(extraction_result, dict) and "people" in extraction_result:
+                params["mode"] = "people"
+            if callback_url:
+                params["callback_url"] = callback_url
+            jobs.append(job_service.enqueue(db, "audio_extract", params))
+        return {
+            "queued": len(jobs),
+            "job_ids": [job.id for job in jobs],
+            "remaining": extraction_cache.stale_recordings(db, current).count() - len(jobs),
+            "prompt_hashes": EXTRACTION_PROMPT_HASHES
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to queue re-extraction: {str(e)}")
+
+@router.get("/transcript-storage")
+def get_transcript_storage(db: Session = Depends(get_db)):
+    """Stored transcripts and segments, and how much compression saves"""
+    return transcript_store.stats(db)
+
+@router.get("/storage-report")
+def get_storage_report(db: Session = Depends(get_db)):
+    """Disk used by recordings, and the bytes saved by transcoding and archiving originals"""
+    return audio_storage_service.report(db)
+
+@router.post("/transcode", status_code=status.HTTP_202_ACCEPTED)
+def transcode_audio_files(request: TranscodeRequest, db: Session = Depends(get_db)):
+    """Queue an ``audio_transcode`` job converting processed recordings to Opus
+
+    Only files whose recordings were all processed at least ``older_than_days``
+    ago are converted; each result is verified before the recordings sharing the
+    file are switched to it and the original is moved to ``audio_archive_dir``.
+    ``dry_run`` only reports how many files qualify.
+    """
+    if request.older_than_days is not None and request.older_than_days < 0:
+        raise HTTPException(status_code=400, detail="older_than_days must not be negative")
+    if request.limit is not None and request.limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    check_callback_url(request.callback_url)
+    
+    try:
+        matched = audio_storage_service.cold_files(db, request.older_than_days).count()
+        if request.dry_run:
+            return {"matched": matched}
+        
+        params = {"older_than_days": request.older_than_days, "limit": request.limit}
+        if request.callback_url:
+            params["callback_url"] = request.callback_url
+        job = job_service.enqueue(db, "audio_transcode", params)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "matched": matched,
+            "status_url": f"{settings.api_v1_str}/jobs/{job.id}"
+        }
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to queue transcoding: {str(e)}")
+
+@router.get("/{audio_id}/transcript")
+def get_audio_transcript(
+    audio_id: int,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    speaker: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Timestamped transcript segments of a recording
+
+    ``start``/``end`` (seconds) return only the segments overlapping that range and
+    ``speaker`` only one speaker's; these read just the matching segment rows. Without
+    filters the full text is included as well.
+    """
+    recording = db.query(AudioRecording).filter(AudioRecording.id == audio_id).first()
+    if not recording:
+        raise HTTPException(status_code=404, detail="Audio recording not found")
+    if recording.transcript is None:
+        raise HTTPException(status_code=404, detail="Audio recording has not been transcribed")
     
-    return [
-        {
-            "id": r.id,
-            "file_name": r.file_name,
-            "contact_id": r.contact_id,
-            "duration_seconds": r.duration_seconds,
-            "has_transcription": bool(r.transcription),
-            "processed_at": r.processed_at,
-            "created_at": r.created_at
-        } for r in recordings
-    ]
+    segments = transcript_store.find_segments(db, audio_id, start, end, speaker)
+    result = {
+        "id": recording.id,
+        "language": recording.transcript.language,
+        "segment_count": recording.transcript.segment_count,
+        "segments": [
+            {"start": s.start_seconds, "end": s.end_seconds, "speaker": s.speaker, "text": s.text}
+            for s in segments
+        ]
+    }
+    if start is None and end is None and speaker is None:
+        result["text"] = recording.transcript.text
+    return FastJSONResponse(result)
+
+@router.api_route("/{audio_id}/stream", methods=["GET", "HEAD"])
+def stream_audio_recording(audio_id: int, request: Request, db: Session = Depends(get_db)):
+    """Play a recording: the file, or the byte range named by a ``Range`` header
+
+    Answers ``206 Partial Content`` for a range, so seeking only transfers the bytes
+    needed, and ``304`` for ``If-None-Match``/``If-Modified-Since`` when the file is
+    unchanged. The file is sent in pieces (or with sendfile where the server supports
+    it), never read into memory whole.
+    """
+    row = db.query(AudioRecording.file_path, AudioRecording.file_name)\
+        .filter(AudioRecording.id == audio_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Audio recording not found")
+    
+    try:
+        return RangeFileResponse(row.file_path, request, filename=row.file_name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
 
 @router.get("/{audio_id}")
 def get_audio_recording(audio_id: int, db: Session = Depends(get_db)):
@@ -296,7 +412,17 @@ def get_audio_recording(audio_id: int, db: Session = Depends(get_db)):
         "file_path": recording.file_path,
         "contact_id": recording.contact_id,
         "duration_seconds": recording.duration_seconds,
+        "file_size": recording.file_size,
+        "stored_size": recording.stored_size,
+        "transcoded_at": recording.transcoded_at,
+        "content_hash": recording.content_hash,
+        "duplicate_of": recording.duplicate_of_id,
+        "contacts": [
+            {"contact_id": link.contact_id, "speaker": link.speaker} for link in recording.contact_links
+        ],
         "transcription": recording.transcription,
+        "language": recording.transcript.language if recording.transcript else None,
+        "segment_count": recording.transcript.segment_count if recording.transcript else 0,
         "processed_at": recording.processed_at,
         "created_at": recording.created_at
     }
@@ -309,13 +435,27 @@ def delete_audio_recording(audio_id: int, db: Session = Depends(get_db)):
         if not recording:
             raise HTTPException(status_code=404, detail="Audio recording not found")
         
-        # Delete file if it exists
-        if os.path.exists(recording.file_path):
-            os.remove(recording.file_path)
+        # Duplicates of this recording now point at the oldest remaining copy
+        copies = db.query(AudioRecording).filter(
+            AudioRecording.duplicate_of_id == recording.id
+        ).order_by(AudioRecording.id).all()
+        for copy in copies:
+            copy.duplicate_of_id = copies[0].id if copy is not copies[0] else None
+        
+        # Delete the file (and its archived original) unless another recording shares it
+        shared = db.query(AudioRecording.id).filter(
+            AudioRecording.file_path == recording.file_path,
+            AudioRecording.id != recording.id
+        ).first()
+        if not shared:
+            for path in (recording.file_path, recording.original_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
         
         # Delete database record
         db.delete(recording)
         db.commit()
+        vector_store.delete_transcript_chunks(audio_id)
         
         return {"message": "Audio recording deleted successfully"}
         
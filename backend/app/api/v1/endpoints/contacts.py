@@ -1,15 +1,34 @@
 """
 Contact management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, Response, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ValidationError
 from datetime import datetime
+import json
+import os
 
+from ....core.callbacks import check_callback_url
+from ....core.config import settings
 from ....core.database import get_db
+from ....core.etag import CONTACT_TABLES, compute_etag, etag_matches, not_modified, set_etag
+from ....core.fields import parse_fields
+from ....core.profiling import get_profiler
+from ....core.responses import FastJSONResponse, row_serializer
+from ....core.uploads import UploadTooLarge, save_upload
 from ....models import Contact, ContactInterest, ContactSkill
 from ....services.vector_store import vector_store
+from ....services.taxonomy import taxonomy_service, normalize_term
+from ....services.search_index import search_index
+from ....services.bulk_contacts import REMOVE_ACTIONS, bulk_contact_service, contact_embedding_data, run_bulk_remove_job
+from ....services.contact_import import detect_format, run_import_job
+from ....services.contact_export import EXPORT_FORMATS, contact_export_service
+from ....services.field_backfill import field_backfill_service
+from ....services.jobs import job_service
 
 router = APIRouter()
 
@@ -69,12 +88,65 @@ class ContactResponse(BaseModel):
     personal_notes: Optional[str]
     created_at: datetime
     updated_at: datetime
+    archived_at: Optional[datetime] = None
     interests: List[dict]
     skills: List[dict]
 
     class Config:
         from_attributes = True
 
+CONTACT_LIST_FIELDS = list(ContactResponse.model_fields)
+
+class ContactUpdateResponse(ContactResponse):
+    changes: dict
+
+class BulkContactRequest(BaseModel):
+    contacts: List[Dict[str, Any]]
+    chunk_size: int = 500
+    embed: bool = True
+
+class BulkContactResult(BaseModel):
+    index: int
+    status: str
+    contact_id: Optional[int] = None
+    error: Optional[Any] = None
+    embedding_error: Optional[str] = None
+
+class ContactFilter(BaseModel):
+    search: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+    archived: Optional[bool] = None
+
+class BulkRemoveRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[ContactFilter] = None
+    chunk_size: int = 500
+    dry_run: bool = False
+
+class FieldBackfillRequest(BaseModel):
+    fields: List[str]
+    include_defaults: bool = False
+    batch_size: int = 10
+    concurrency: int = 4
+    embed: bool = True
+    dry_run: bool = False
+    callback_url: Optional[str] = None
+
+class BulkContactResponse(BaseModel):
+    results: List[BulkContactResult]
+    created: int
+    updated: int
+    failed: int
+    elapsed_seconds: float
+    contacts_per_second: Optional[float] = None
+
+MAX_BULK_CONTACTS = 10000
+# Larger bulk deletes/archives run as a background job
+BULK_REMOVE_SYNC_LIMIT = 1000
+
 @router.post("/", response_model=ContactResponse)
 def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
     """Create a new contact"""
@@ -97,22 +169,26 @@ def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
         db.flush()  # Get the ID
         
         # Add interests
-        for interest_data in contact.interests or []:
+        interests = taxonomy_service.normalize_interests(db, [i.dict() for i in contact.interests or []])
+        for interest_data in interests:
             interest = ContactInterest(
                 contact_id=db_contact.id,
-                interest_category=interest_data.interest_category,
-                interest_value=interest_data.interest_value,
-                confidence_score=interest_data.confidence_score
+                interest_id=interest_data["interest_id"],
+                interest_category=interest_data["interest_category"],
+                interest_value=interest_data["interest_value"],
+                confidence_score=interest_data["confidence_score"]
             )
             db.add(interest)
         
         # Add skills
-        for skill_data in contact.skills or []:
+        skills = taxonomy_service.normalize_skills(db, [s.dict() for s in contact.skills or []])
+        for skill_data in skills:
             skill = ContactSkill(
                 contact_id=db_contact.id,
-                skill_name=skill_data.skill_name,
-                skill_level=skill_data.skill_level,
-                years_experience=skill_data.years_experience
+                skill_id=skill_data["skill_id"],
+                skill_name=skill_data["skill_name"],
+                skill_level=skill_data["skill_level"],
+                years_experience=skill_data["years_experience"]
             )
             db.add(skill)
         
@@ -139,99 +215,368 @@ def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create contact: {str(e)}")
 
+@router.post("/bulk", response_model=BulkContactResponse)
+def bulk_upsert_contacts(request: BulkContactRequest, db: Session = Depends(get_db)):
+    """Create or update many contacts at once
+
+    Each item is validated as a ``ContactCreate``; an item whose email matches an
+    existing contact updates it instead. Invalid items are reported in ``results``
+    without failing the rest of the request.
+    """
+    if len(request.contacts) > MAX_BULK_CONTACTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_CONTACTS} contacts can be sent per request"
+        )
+    if not 1 <= request.chunk_size <= 5000:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 5000")
+    
+    items = []
+    invalid = {}
+    for index, raw in enumerate(request.contacts):
+        try:
+            items.append(ContactCreate(**raw).dict(exclude_unset=True))
+        except ValidationError as e:
+            items.append(None)
+            invalid[index] = e.errors(include_url=False)
+    
+    try:
+        summary = bulk_contact_service.upsert(
+            db, items, chunk_size=request.chunk_size, embed=request.embed
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Bulk upsert failed: {str(e)}")
+    
+    for index, errors in invalid.items():
+        summary["results"][index] = {
+            "index": index,
+            "status": "error",
+            "contact_id": None,
+            "error": errors
+        }
+    summary["failed"] += len(invalid)
+    return summary
+
+@router.post("/bulk/{action}")
+def bulk_remove_contacts(
+    action: str,
+    request: BulkRemoveRequest,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Delete, archive or restore many contacts, selected by ``ids`` and/or ``filter``
+
+    ``action`` is ``delete``, ``archive`` or ``restore``. Rows are processed in chunked
+    transactions and vectors are removed (or re-added on restore) in batches. Repeating a
+    request is harmless: contacts already gone or already in the target state are skipped.
+    Up to 1000 contacts are handled inline; larger sets start a job (202) to poll at
+    GET /jobs/{job_id}. ``dry_run`` only reports how many contacts match.
+    """
+    if action not in REMOVE_ACTIONS:
+        raise HTTPException(status_code=400, detail=f"action must be one of: {', '.join(REMOVE_ACTIONS)}")
+    filters = request.filter.dict(exclude_none=True) if request.filter else {}
+    if request.ids is None and not filters:
+        raise HTTPException(status_code=400, detail="Provide ids or a filter")
+    if not 1 <= request.chunk_size <= 5000:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 5000")
+    
+    try:
+        contact_ids = bulk_contact_service.match_ids(db, request.ids, filters)
+        if request.dry_run:
+            return {"action": action, "matched": len(contact_ids), "sample_ids": contact_ids[:20]}
+        
+        if len(contact_ids) > BULK_REMOVE_SYNC_LIMIT:
+            job = job_service.create(db, f"contacts_{action}", {
+                "ids": request.ids,
+                "filter": jsonable_encoder(filters),
+                "matched": len(contact_ids),
+                "chunk_size": request.chunk_size
+            })
+            background_tasks.add_task(run_bulk_remove_job, job.id, contact_ids, action, request.chunk_size)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {
+                "job_id": job.id,
+                "status": job.status,
+                "matched": len(contact_ids),
+                "status_url": f"{settings.api_v1_str}/jobs/{job.id}"
+            }
+        
+        return bulk_contact_service.remove(db, contact_ids, action, request.chunk_size)
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Bulk {action} failed: {str(e)}")
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_contacts(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    mapping: Optional[str] = Form(None),
+    chunk_size: int = Form(1000),
+    embed: bool = Form(True),
+    db: Session = Depends(get_db)
+):
+    """Import contacts from a CSV or XLSX spreadsheet in the background
+
+    ``mapping`` is an optional JSON column mapping (see ``app/services/contact_import.py``).
+    Poll ``GET /jobs/{job_id}`` for progress.
+    """
+    try:
+        file_format = detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        column_mapping = json.loads(mapping) if mapping else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid mapping JSON: {str(e)}")
+    if column_mapping is not None and not isinstance(column_mapping, dict):
+        raise HTTPException(status_code=400, detail="Mapping must be a JSON object")
+    if not 1 <= chunk_size <= 5000:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 5000")
+    
+    try:
+        # Stream the upload to disk instead of reading it into memory
+        stored = await save_upload(file, os.path.join(settings.upload_dir, "imports"),
+                                   max_size=settings.max_import_size)
+        file_path = stored["path"]
+        
+        job = job_service.create(db, "contact_import", {
+            "file_name": file.filename,
+            "format": file_format,
+            "mapping": column_mapping,
+            "chunk_size": chunk_size,
+            "embed": embed
+        })
+        background_tasks.add_task(
+            run_import_job, job.id, file_path, file_format,
+            column_mapping, chunk_size, embed, True
+        )
+        
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"{settings.api_v1_str}/jobs/{job.id}"
+        }
+        
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
+
+@router.post("/backfill-fields", status_code=status.HTTP_202_ACCEPTED)
+def backfill_contact_fields(request: FieldBackfillRequest, db: Session = Depends(get_db)):
+    """Fill missing contact fields from recording transcripts without a full re-extraction
+
+    Only contacts linked to a transcribed recording that lack a value for one of
+    ``fields`` are sent, ``batch_size`` to a request with ``concurrency`` requests
+    in flight, and existing values are never overwritten. ``include_defaults`` also
+    treats a column still at its default (``has_pets`` = false) as missing. The job
+    runs on the worker pool and checkpoints after every page; poll
+    ``GET /jobs/{job_id}``. ``dry_run`` only reports how many contacts match.
+    """
+    try:
+        fields = field_backfill_service.validate_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not 1 <= request.batch_size <= 50:
+        raise HTTPException(status_code=400, detail="batch_size must be between 1 and 50")
+    if not 1 <= request.concurrency <= 16:
+        raise HTTPException(status_code=400, detail="concurrency must be between 1 and 16")
+    check_callback_url(request.callback_url)
+    
+    try:
+        matched = field_backfill_service.candidates(db, fields, request.include_defaults).count()
+        if request.dry_run:
+            return {"fields": fields, "matched": matched}
+        
+        params = {
+            "fields": fields,
+            "include_defaults": request.include_defaults,
+            "batch_size": request.batch_size,
+            "concurrency": request.concurrency,
+            "embed": request.embed
+        }
+        if request.callback_url:
+            params["callback_url"] = request.callback_url
+        job = job_service.enqueue(db, "contact_field_backfill", params)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "fields": fields,
+            "matched": matched,
+            "status_url": f"{settings.api_v1_str}/jobs/{job.id}"
+        }
+        
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Field backfill failed: {str(e)}")
+
 @router.get("/", response_model=List[ContactResponse])
 def get_contacts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
+    fields: Optional[str] = None,
+    include_archived: bool = False,
+    profile: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get all contacts with optional search"""
-    query = db.query(Contact)
+    """Get all contacts with optional search
+
+    ``?fields=first_name,last_name`` returns only the named fields (``id`` is
+    always included) and selects just those columns; interests and skills are
+    loaded only when asked for. Archived contacts are left out unless
+    ``include_archived=true``.
+    With ``?profile=true`` the list is wrapped as ``{"results": [...], "profile": {...}}``
+    where the profile holds the executed SQL, query plans and timings.
+    Otherwise the response carries a weak ETag and ``If-None-Match`` is honoured.
+    Rows are encoded directly with orjson rather than re-validated against ``ContactResponse``.
+    """
+    selected = parse_fields(fields, CONTACT_LIST_FIELDS)
+    etag = None
+    if not profile:
+        etag = compute_etag(db, CONTACT_TABLES, "contacts", skip, limit, search, selected, include_archived)
+        if etag_matches(request, etag):
+            return not_modified(etag)
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Contact.first_name.ilike(search_term)) |
-            (Contact.last_name.ilike(search_term)) |
-            (Contact.email.ilike(search_term)) |
-            (Contact.job_title.ilike(search_term)) |
-            (Contact.company.ilike(search_term)) |
-            (Contact.location.ilike(search_term))
+    profiler = get_profiler(db, profile).start()
+    try:
+        query = db.query(Contact)
+        
+        if not include_archived:
+            query = query.filter(Contact.archived_at.is_(None))
+        if search:
+            query = query.filter(
+                search_index.contains(Contact, [
+                    "first_name", "last_name", "email", "job_title", "company", "location"
+                ], search)
+            )
+        
+        query = query.offset(skip).limit(limit)
+        if selected:
+            results = select_contact_fields(db, query, selected)
+        else:
+            contacts = query.options(
+                undefer_group("large_text"),
+                selectinload(Contact.interests),
+                selectinload(Contact.skills)
+            ).all()
+            results = [format_contact_response(contact) for contact in contacts]
+        
+        if profile:
+            return FastJSONResponse({"results": results, "profile": profiler.report()})
+    finally:
+        profiler.stop()  # Detaches the engine listeners when the query fails
+    
+    json_response = FastJSONResponse(results)
+    set_etag(json_response, etag)
+    return json_response
+
+@router.get("/export")
+def export_contacts(format: str = "csv", batch_size: int = 1000, include_archived: bool = False):
+    """Export contacts as CSV, XLSX or Parquet
+
+    Rows are streamed from the database in batches with interests and skills
+    joined into ``"; "``-separated strings. Archived contacts are left out
+    unless ``include_archived=true``; the ``archived_at`` column marks them.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    if not 1 <= batch_size <= 10000:
+        raise HTTPException(status_code=400, detail="batch_size must be between 1 and 10000")
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"contacts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    
+    if format == "csv":
+        return StreamingResponse(
+            contact_export_service.stream_csv(batch_size, include_archived),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
     
-    contacts = query.offset(skip).limit(limit).all()
-    return [format_contact_response(contact) for contact in contacts]
+    try:
+        path = contact_export_service.export_to_file(format, batch_size, include_archived)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        background=BackgroundTask(os.remove, path)
+    )
 
 @router.get("/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: int, db: Session = Depends(get_db)):
+def get_contact(contact_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific contact"""
+    etag = compute_etag(db, CONTACT_TABLES, "contact", contact_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return format_contact_response(contact)
+    json_response = FastJSONResponse(format_contact_response(contact))
+    set_etag(json_response, etag)
+    return json_response
 
-@router.put("/{contact_id}", response_model=ContactResponse)
+@router.put("/{contact_id}", response_model=ContactUpdateResponse)
 def update_contact(contact_id: int, contact_update: ContactUpdate, db: Session = Depends(get_db)):
-    """Update a contact"""
+    """Update a contact
+
+    Interests and skills are diffed against the existing rows, so only added,
+    removed or modified entries are written, and the contact is re-embedded
+    only when its searchable document changed or it has no stored embedding
+    (archived contacts are never embedded).
+    ``changes`` reports what was touched; ``reembedded`` is true only when the
+    new embedding was actually stored.
+    """
     try:
         contact = db.query(Contact).filter(Contact.id == contact_id).first()
         if not contact:
             raise HTTPException(status_code=404, detail="Contact not found")
         
+        previous_document = vector_store.build_contact_document(contact_embedding_data(contact))
+        changes = {"fields": [], "interests": None, "skills": None, "reembedded": False}
+        
         # Update basic fields
         update_data = contact_update.dict(exclude_unset=True, exclude={"interests", "skills"})
         for field, value in update_data.items():
-            setattr(contact, field, value)
+            if getattr(contact, field) != value:
+                setattr(contact, field, value)
+                changes["fields"].append(field)
         
         # Update interests if provided
         if contact_update.interests is not None:
-            # Delete existing interests
-            db.query(ContactInterest).filter(ContactInterest.contact_id == contact_id).delete()
-            
-            # Add new interests
-            for interest_data in contact_update.interests:
-                interest = ContactInterest(
-                    contact_id=contact_id,
-                    interest_category=interest_data.interest_category,
-                    interest_value=interest_data.interest_value,
-                    confidence_score=interest_data.confidence_score
-                )
-                db.add(interest)
+            interests = taxonomy_service.normalize_interests(db, [i.dict() for i in contact_update.interests])
+            changes["interests"] = sync_interests(db, contact, interests)
         
         # Update skills if provided
         if contact_update.skills is not None:
-            # Delete existing skills
-            db.query(ContactSkill).filter(ContactSkill.contact_id == contact_id).delete()
-            
-            # Add new skills
-            for skill_data in contact_update.skills:
-                skill = ContactSkill(
-                    contact_id=contact_id,
-                    skill_name=skill_data.skill_name,
-                    skill_level=skill_data.skill_level,
-                    years_experience=skill_data.years_experience
-                )
-                db.add(skill)
+            skills = taxonomy_service.normalize_skills(db, [s.dict() for s in contact_update.skills])
+            changes["skills"] = sync_skills(db, contact, skills)
         
         db.commit()
         db.refresh(contact)
         
-        # Update vector store
-        contact_data = {
-            "first_name": contact.first_name,
-            "last_name": contact.last_name,
-            "job_title": contact.job_title,
-            "company": contact.company,
-            "location": contact.location,
-            "business_needs": contact.business_needs,
-            "personal_notes": contact.personal_notes,
-            "interests": [{"interest_value": i.interest_value} for i in contact.interests],
-            "skills": [{"skill_name": s.skill_name} for s in contact.skills]
-        }
-        vector_store.add_contact_embedding(contact.id, contact_data)
+        # Update vector store when the embedded text changed or an earlier embed failed;
+        # archived contacts stay out of it
+        contact_data = contact_embedding_data(contact)
+        if contact.archived_at is None and (
+            vector_store.build_contact_document(contact_data) != previous_document
+            or vector_store.missing_contact_embeddings([contact.id])
+        ):
+            changes["reembedded"] = vector_store.add_contact_embedding(contact.id, contact_data)
         
-        return format_contact_response(contact)
+        return {**format_contact_response(contact), "changes": changes}
         
     except HTTPException:
         raise
@@ -278,6 +623,134 @@ def get_similar_contacts(contact_id: int, limit: int = 5, db: Session = Depends(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to find similar contacts: {str(e)}")
 
+def sync_interests(db: Session, contact: Contact, interests: List[dict]) -> dict:
+    """Apply the difference between a contact's interests and the normalized new list"""
+    def key(interest_id, value, category):
+        return (interest_id or normalize_term(value), (category or "").lower())
+    
+    existing = {}
+    for row in contact.interests:
+        existing.setdefault(key(row.interest_id, row.interest_value, row.interest_category), row)
+    
+    stats = {"added": 0, "removed": 0, "updated": 0, "unchanged": 0}
+    wanted = set()
+    for interest_data in interests:
+        interest_key = key(interest_data["interest_id"], interest_data["interest_value"], interest_data["interest_category"])
+        if interest_key in wanted:
+            continue
+        wanted.add(interest_key)
+        
+        row = existing.get(interest_key)
+        if row is None:
+            contact.interests.append(ContactInterest(
+                interest_id=interest_data["interest_id"],
+                interest_category=interest_data["interest_category"],
+                interest_value=interest_data["interest_value"],
+                confidence_score=interest_data["confidence_score"]
+            ))
+            stats["added"] += 1
+        elif row.confidence_score != interest_data["confidence_score"]:
+            row.confidence_score = interest_data["confidence_score"]
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+    
+    # Rows no longer wanted go, as do duplicate rows for the same interest
+    for row in list(contact.interests):
+        if row.id is None:
+            continue
+        row_key = key(row.interest_id, row.interest_value, row.interest_category)
+        if row_key not in wanted or existing.get(row_key) is not row:
+            contact.interests.remove(row)
+            stats["removed"] += 1
+    return stats
+
+def sync_skills(db: Session, contact: Contact, skills: List[dict]) -> dict:
+    """Apply the difference between a contact's skills and the normalized new list"""
+    def key(skill_id, name):
+        return skill_id or normalize_term(name)
+    
+    existing = {}
+    for row in contact.skills:
+        existing.setdefault(key(row.skill_id, row.skill_name), row)
+    
+    stats = {"added": 0, "removed": 0, "updated": 0, "unchanged": 0}
+    wanted = set()
+    for skill_data in skills:
+        skill_key = key(skill_data["skill_id"], skill_data["skill_name"])
+        if skill_key in wanted:
+            continue
+        wanted.add(skill_key)
+        
+        row = existing.get(skill_key)
+        if row is None:
+            contact.skills.append(ContactSkill(
+                skill_id=skill_data["skill_id"],
+                skill_name=skill_data["skill_name"],
+                skill_level=skill_data["skill_level"],
+                years_experience=skill_data["years_experience"]
+            ))
+            stats["added"] += 1
+        elif (row.skill_level, row.years_experience) != (skill_data["skill_level"], skill_data["years_experience"]):
+            row.skill_level = skill_data["skill_level"]
+            row.years_experience = skill_data["years_experience"]
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+    
+    # Rows no longer wanted go, as do duplicate rows for the same skill
+    for row in list(contact.skills):
+        if row.id is None:
+            continue
+        row_key = key(row.skill_id, row.skill_name)
+        if row_key not in wanted or existing.get(row_key) is not row:
+            contact.skills.remove(row)
+            stats["removed"] += 1
+    return stats
+
+def select_contact_fields(db: Session, query, fields: List[str]) -> List[dict]:
+    """Run a contact query selecting only ``fields``; interests and skills are batch-loaded"""
+    keys = [f for f in fields if f not in ("interests", "skills")]
+    serialize = row_serializer(keys)
+    results = [serialize(row) for row in query.with_entities(*[getattr(Contact, k) for k in keys])]
+    ids = [r["id"] for r in results]
+    
+    if "interests" in fields:
+        by_contact = {contact_id: [] for contact_id in ids}
+        if ids:
+            for interest in db.query(ContactInterest).filter(ContactInterest.contact_id.in_(ids)):
+                by_contact[interest.contact_id].append(format_interest(interest))
+        for result in results:
+            result["interests"] = by_contact[result["id"]]
+    
+    if "skills" in fields:
+        by_contact = {contact_id: [] for contact_id in ids}
+        if ids:
+            for skill in db.query(ContactSkill).filter(ContactSkill.contact_id.in_(ids)):
+                by_contact[skill.contact_id].append(format_skill(skill))
+        for result in results:
+            result["skills"] = by_contact[result["id"]]
+    
+    return results
+
+def format_interest(interest: ContactInterest) -> dict:
+    return {
+        "id": interest.id,
+        "interest_id": interest.interest_id,
+        "interest_category": interest.interest_category,
+        "interest_value": interest.interest_value,
+        "confidence_score": interest.confidence_score
+    }
+
+def format_skill(skill: ContactSkill) -> dict:
+    return {
+        "id": skill.id,
+        "skill_id": skill.skill_id,
+        "skill_name": skill.skill_name,
+        "skill_level": skill.skill_level,
+        "years_experience": skill.years_experience
+    }
+
 def format_contact_response(contact: Contact) -> dict:
     """Format contact for response"""
     return {
@@ -295,20 +768,7 @@ def format_contact_response(contact: Contact) -> dict:
         "personal_notes": contact.personal_notes,
         "created_at": contact.created_at,
         "updated_at": contact.updated_at,
-        "interests": [
-            {
-                "id": i.id,
-                "interest_category": i.interest_category,
-                "interest_value": i.interest_value,
-                "confidence_score": i.confidence_score
-            } for i in contact.interests
-        ],
-        "skills": [
-            {
-                "id": s.id,
-                "skill_name": s.skill_name,
-                "skill_level": s.skill_level,
-                "years_experience": s.years_experience
-            } for s in contact.skills
-        ]
+        "archived_at": contact.archived_at,
+        "interests": [format_interest(i) for i in contact.interests],
+        "skills": [format_skill(s) for s in contact.skills]
     }
@@ -0,0 +1,141 @@
+"""
+Duplicate contact detection and merge endpoints
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.orm import Session, aliased
+from typing import Optional
+from pydantic import BaseModel
+
+from ....core.config import settings
+from ....core.database import get_db
+from ....models import Contact, DuplicateSuggestion
+from ....services.dedupe import dedupe_service, run_dedupe_job
+from ....services.jobs import job_service
+
+router = APIRouter()
+
+# Pydantic models
+class DedupeScanRequest(BaseModel):
+    threshold: float = 0.8
+    max_block_size: int = 100
+
+class MergeRequest(BaseModel):
+    primary_contact_id: int
+    duplicate_contact_id: int
+
+@router.post("/scan", status_code=status.HTTP_202_ACCEPTED)
+def scan_duplicates(
+    request: DedupeScanRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Start a background scan for duplicate contacts; poll GET /jobs/{job_id} for progress"""
+    if not 0 < request.threshold <= 1:
+        raise HTTPException(status_code=400, detail="threshold must be between 0 and 1")
+    if request.max_block_size < 2:
+        raise HTTPException(status_code=400, detail="max_block_size must be at least 2")
+
+    try:
+        job = job_service.create(db, "dedupe", request.dict())
+        background_tasks.add_task(run_dedupe_job, job.id, request.threshold, request.max_block_size)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"{settings.api_v1_str}/jobs/{job.id}"
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to start duplicate scan: {str(e)}")
+
+@router.get("/")
+def get_duplicate_suggestions(
+    status: str = "pending",
+    min_score: float = 0.0,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """List duplicate suggestions, highest score first"""
+    first, second = aliased(Contact), aliased(Contact)
+    rows = db.query(DuplicateSuggestion, first, second)\
+        .join(first, first.id == DuplicateSuggestion.contact_id)\
+        .join(second, second.id == DuplicateSuggestion.duplicate_contact_id)\
+        .filter(DuplicateSuggestion.status == status, DuplicateSuggestion.score >= min_score)\
+        .order_by(DuplicateSuggestion.score.desc(), DuplicateSuggestion.id)\
+        .offset(skip).limit(limit).all()
+
+    return [
+        {
+            "id": suggestion.id,
+            "score": suggestion.score,
+            "status": suggestion.status,
+            "features": suggestion.features,
+            "contact": format_contact_summary(contact),
+            "duplicate_contact": format_contact_summary(duplicate),
+            "created_at": suggestion.created_at
+        } for suggestion, contact, duplicate in rows
+    ]
+
+@router.post("/merge")
+def merge_contacts(request: MergeRequest, db: Session = Depends(get_db)):
+    """Merge a duplicate contact into the primary contact"""
+    try:
+        return dedupe_service.merge(db, request.primary_contact_id, request.duplicate_contact_id)
+    except LookupError as e:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Merge failed: {str(e)}")
+
+@router.post("/{suggestion_id}/merge")
+def merge_suggestion(
+    suggestion_id: int,
+    keep: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Merge the pair of a suggestion; ``keep`` picks the surviving contact (defaults to the older one)"""
+    suggestion = db.query(DuplicateSuggestion).filter(DuplicateSuggestion.id == suggestion_id).first()
+    if not suggestion:
+        raise HTTPException(status_code=404, detail="Duplicate suggestion not found")
+
+    pair = (suggestion.contact_id, suggestion.duplicate_contact_id)
+    primary_id = keep if keep is not None else pair[0]
+    if primary_id not in pair:
+        raise HTTPException(status_code=400, detail="keep must be one of the suggested contacts")
+    duplicate_id = pair[1] if primary_id == pair[0] else pair[0]
+
+    return merge_contacts(MergeRequest(primary_contact_id=primary_id, duplicate_contact_id=duplicate_id), db)
+
+@router.post("/{suggestion_id}/dismiss")
+def dismiss_suggestion(suggestion_id: int, db: Session = Depends(get_db)):
+    """Mark a suggestion as not a duplicate so later scans do not raise it again"""
+    try:
+        suggestion = db.query(DuplicateSuggestion).filter(DuplicateSuggestion.id == suggestion_id).first()
+        if not suggestion:
+            raise HTTPException(status_code=404, detail="Duplicate suggestion not found")
+
+        suggestion.status = "dismissed"
+        db.commit()
+        return {"message": "Suggestion dismissed"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to dismiss suggestion: {str(e)}")
+
+def format_contact_summary(contact: Contact) -> dict:
+    """Format the fields used to compare two contacts"""
+    return {
+        "id": contact.id,
+        "name": f"{contact.first_name} {contact.last_name or ''}".strip(),
+        "email": contact.email,
+        "phone": contact.phone,
+        "company": contact.company,
+        "job_title": contact.job_title,
+        "location": contact.location
+    }
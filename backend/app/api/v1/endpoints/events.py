@@ -1,8 +1,9 @@
 """
 Event management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer_group
+from sqlalchemy import func, select
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -10,8 +11,12 @@ import openai
 
 from ....core.database import get_db
 from ....core.config import settings
+from ....core.etag import EVENT_TABLES, compute_etag, etag_matches, not_modified, set_etag
+from ....core.fields import parse_fields
+from ....core.responses import FastJSONResponse, row_serializer
 from ....models import Event, EventParticipation, Contact, ContactInterest
 from ....services.vector_store import vector_store
+from ....services.taxonomy import taxonomy_service
 
 router = APIRouter()
 
@@ -56,6 +61,8 @@ class EventResponse(BaseModel):
     class Config:
         from_attributes = True
 
+EVENT_LIST_FIELDS = list(EventResponse.model_fields)
+
 @router.post("/", response_model=EventResponse)
 def create_event(event: EventCreate, db: Session = Depends(get_db)):
     """Create a new event"""
@@ -80,13 +87,24 @@ def create_event(event: EventCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[EventResponse])
 def get_events(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     event_type: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all events with optional filtering"""
+    """Get all events with optional filtering
+
+    ``?fields=name,event_date`` returns only the named fields (``id`` is always
+    included); participants are loaded only when asked for.
+    """
+    selected = parse_fields(fields, EVENT_LIST_FIELDS)
+    etag = compute_etag(db, EVENT_TABLES, "events", skip, limit, status, event_type, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     query = db.query(Event)
     
     if status:
@@ -94,16 +112,33 @@ def get_events(
     if event_type:
         query = query.filter(Event.event_type == event_type)
     
-    events = query.offset(skip).limit(limit).all()
-    return [format_event_response(event) for event in events]
+    query = query.offset(skip).limit(limit)
+    if selected:
+        results = select_event_fields(db, query, selected)
+    else:
+        events = query.options(
+            undefer_group("large_text"),
+            selectinload(Event.participations).joinedload(EventParticipation.contact)
+        ).all()
+        results = [format_event_response(event) for event in events]
+    
+    json_response = FastJSONResponse(results)
+    set_etag(json_response, etag)
+    return json_response
 
 @router.get("/{event_id}", response_model=EventResponse)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(event_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific event"""
+    etag = compute_etag(db, EVENT_TABLES, "event", event_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return format_event_response(event)
+    json_response = FastJSONResponse(format_event_response(event))
+    set_etag(json_response, etag)
+    return json_response
 
 @router.put("/{event_id}", response_model=EventResponse)
 def update_event(event_id: int, event_update: EventUpdate, db: Session = Depends(get_db)):
@@ -285,7 +320,9 @@ async def recommend_participants(
             recommendations = []
             for result in vector_results:
                 if result["contact_id"] not in current_participant_ids:
-                    contact = db.query(Contact).filter(Contact.id == result["contact_id"]).first()
+                    contact = db.query(Contact).filter(
+                        Contact.id == result["contact_id"], Contact.archived_at.is_(None)
+                    ).first()
                     if contact:
                         recommendations.append({
                             "contact": {
@@ -312,10 +349,14 @@ async def recommend_participants(
             recommendations = []
             if event.event_type:
                 # Find contacts with interests related to event type
-                relevant_contacts = db.query(Contact).join(ContactInterest).filter(
-                    ContactInterest.interest_value.ilike(f"%{event.event_type}%")
+                interest_ids = taxonomy_service.match_interest_ids(db, event.event_type)
+                relevant_contacts = db.query(Contact).filter(
+                    Contact.id.in_(
+                        select(ContactInterest.contact_id).where(ContactInterest.interest_id.in_(interest_ids))
+                    )
                 ).filter(
-                    ~Contact.id.in_(current_participant_ids)
+                    ~Contact.id.in_(current_participant_ids),
+                    Contact.archived_at.is_(None)
                 ).limit(limit).all()
                 
                 for contact in relevant_contacts:
@@ -349,19 +390,45 @@ async def recommend_participants(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get recommendations: {str(e)}")
 
+def select_event_fields(db: Session, query, fields: List[str]) -> List[dict]:
+    """Run an event query selecting only ``fields``; participants are batch-loaded"""
+    participant_count = select(func.count(EventParticipation.id))\
+        .where(EventParticipation.event_id == Event.id)\
+        .correlate(Event)\
+        .scalar_subquery()
+    keys = [f for f in fields if f != "participants"]
+    columns = [participant_count if k == "participant_count" else getattr(Event, k) for k in keys]
+    serialize = row_serializer(keys)
+    results = [serialize(row) for row in query.with_entities(*columns)]
+    
+    if "participants" in fields:
+        ids = [r["id"] for r in results]
+        by_event = {event_id: [] for event_id in ids}
+        if ids:
+            participations = db.query(EventParticipation)\
+                .options(joinedload(EventParticipation.contact))\
+                .filter(EventParticipation.event_id.in_(ids))
+            for participation in participations:
+                by_event[participation.event_id].append(format_participant(participation))
+        for result in results:
+            result["participants"] = by_event[result["id"]]
+    
+    return results
+
+def format_participant(participation: EventParticipation) -> dict:
+    contact = participation.contact
+    return {
+        "contact_id": contact.id,
+        "name": f"{contact.first_name} {contact.last_name or ''}".strip(),
+        "email": contact.email,
+        "participation_status": participation.participation_status,
+        "interest_level": participation.interest_level,
+        "notes": participation.notes
+    }
+
 def format_event_response(event: Event) -> dict:
     """Format event for response"""
-    participants = []
-    for participation in event.participations:
-        contact = participation.contact
-        participants.append({
-            "contact_id": contact.id,
-            "name": f"{contact.first_name} {contact.last_name or ''}".strip(),
-            "email": contact.email,
-            "participation_status": participation.participation_status,
-            "interest_level": participation.interest_level,
-            "notes": participation.notes
-        })
+    participants = [format_participant(p) for p in event.participations]
     
     return {
         "id": event.id,
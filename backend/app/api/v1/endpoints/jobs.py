@@ -0,0 +1,83 @@
+"""
+Background job status endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+from ....core.database import get_db
+from ....models import Job
+from ....services.jobs import job_service
+
+router = APIRouter()
+
+# Pydantic models
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Optional[dict]
+    total: Optional[int]
+    processed: int
+    succeeded: int
+    failed: int
+    progress: Optional[float]
+    result: Optional[Any]
+    error: Optional[str]
+    attempts: Optional[int] = None
+    max_attempts: Optional[int] = None
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(
+    job_type: Optional[str] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """List jobs, newest first"""
+    query = db.query(Job)
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    if status:
+        query = query.filter(Job.status == status)
+    jobs = query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
+    return [format_job_response(job) for job in jobs]
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Get the status and progress of a job"""
+    job = job_service.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return format_job_response(job)
+
+def format_job_response(job: Job) -> dict:
+    """Format job for response"""
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "params": job.params,
+        "total": job.total,
+        "processed": job.processed,
+        "succeeded": job.succeeded,
+        "failed": job.failed,
+        "progress": round(min(job.processed / job.total, 1.0), 4) if job.total else None,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
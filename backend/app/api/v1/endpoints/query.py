@@ -2,8 +2,8 @@
 Query and search endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy import or_, and_, func, select
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
@@ -12,8 +12,11 @@ import json
 
 from ....core.database import get_db
 from ....core.config import settings
+from ....core.profiling import get_profiler
 from ....models import Contact, ContactInterest, ContactSkill, QueryHistory
 from ....services.vector_store import vector_store
+from ....services.taxonomy import taxonomy_service
+from ....services.search_index import search_index
 
 router = APIRouter()
 
@@ -30,6 +33,7 @@ class QueryResponse(BaseModel):
     execution_time_ms: int
     search_method: str
     explanation: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
 
 class QueryHistoryResponse(BaseModel):
     id: int
@@ -44,9 +48,14 @@ class QueryHistoryResponse(BaseModel):
 @router.post("/", response_model=QueryResponse)
 async def natural_language_query(
     query_request: QueryRequest,
+    profile: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Process natural language queries about contacts"""
+    """Process natural language queries about contacts
+
+    With ``?profile=true`` the response carries the executed SQL, query plans
+    and external-call timings in ``profile``.
+    """
     
     print(f"\n=== QUERY DEBUG START ===")
     print(f"Query: {query_request.query}")
@@ -57,20 +66,23 @@ async def natural_language_query(
     start_time = datetime.now()
     search_method = "database"
     explanation = None
+    profiler = get_profiler(db, profile).start()
     
     try:
         # Check vector store stats first
-        vector_stats = vector_store.get_collection_stats()
+        with profiler.track("vector_store.collection_stats"):
+            vector_stats = vector_store.get_collection_stats()
         print(f"Vector store stats: {vector_stats}")
         
         # Try vector search first if enabled and OpenAI is configured
         if query_request.use_vector_search and settings.openai_api_key:
             print("Attempting vector search...")
             try:
-                vector_results = vector_store.search_contacts(
-                    query_request.query, 
-                    query_request.limit
-                )
+                with profiler.track("vector_store.search_contacts"):
+                    vector_results = vector_store.search_contacts(
+                        query_request.query, 
+                        query_request.limit
+                    )
                 print(f"Vector search returned {len(vector_results)} results")
                 
                 if vector_results:
@@ -79,7 +91,8 @@ async def natural_language_query(
                     contact_ids = [result["contact_id"] for result in vector_results]
                     print(f"Contact IDs from vector search: {contact_ids}")
                     
-                    contacts = db.query(Contact).filter(Contact.id.in_(contact_ids)).all()
+                    contacts = db.query(Contact).options(undefer(Contact.business_needs))\
+                        .filter(Contact.id.in_(contact_ids), Contact.archived_at.is_(None)).all()
                     print(f"Found {len(contacts)} contacts in database")
                     
                     # Create contact lookup
@@ -115,7 +128,8 @@ async def natural_language_query(
                         results_count=len(formatted_results),
                         execution_time_ms=execution_time,
                         search_method=search_method,
-                        explanation=explanation
+                        explanation=explanation,
+                        profile=profiler.report()
                     )
                 else:
                     print("Vector search returned no results, falling back to database search")
@@ -127,7 +141,8 @@ async def natural_language_query(
         
         # Fallback to database search with AI parsing
         print("Starting database search...")
-        parsed_query = await parse_natural_language_query(query_request.query)
+        with profiler.track("openai.parse_query"):
+            parsed_query = await parse_natural_language_query(query_request.query)
         print(f"Parsed query: {parsed_query}")
         
         results = execute_parsed_query(db, parsed_query, query_request.limit)
@@ -157,10 +172,12 @@ async def natural_language_query(
             results_count=len(results),
             execution_time_ms=execution_time,
             search_method=search_method,
-            explanation=parsed_query.get("explanation", "Database search completed")
+            explanation=parsed_query.get("explanation", "Database search completed"),
+            profile=profiler.report()
         )
         
     except Exception as e:
+        profiler.stop()
         print(f"Query processing failed with error: {str(e)}")
         print(f"=== QUERY DEBUG END ===\n")
         raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
@@ -262,7 +279,8 @@ def execute_parsed_query(db: Session, parsed_query: dict, limit: int = 10) -> Li
     print(f"Executing parsed query with limit: {limit}")
     print(f"Filters: {parsed_query.get('filters', {})}")
     
-    query = db.query(Contact)
+    query = db.query(Contact).options(undefer(Contact.business_needs))\
+        .filter(Contact.archived_at.is_(None))
     filters = parsed_query.get("filters", {})
     
     # Check if this is a "show all" query (empty filters)
@@ -279,49 +297,32 @@ def execute_parsed_query(db: Session, parsed_query: dict, limit: int = 10) -> Li
     
     # General keyword search
     if "keyword" in filters and filters["keyword"]:
-        keyword_term = f"%{filters['keyword']}%"
         conditions.append(
-            or_(
-                Contact.first_name.ilike(keyword_term),
-                Contact.last_name.ilike(keyword_term),
-                Contact.email.ilike(keyword_term),
-                Contact.job_title.ilike(keyword_term),
-                Contact.company.ilike(keyword_term),
-                Contact.location.ilike(keyword_term),
-                Contact.business_needs.ilike(keyword_term),
-                Contact.personal_notes.ilike(keyword_term)
-            )
+            search_index.contains(Contact, [
+                "first_name", "last_name", "email", "job_title",
+                "company", "location", "business_needs", "personal_notes"
+            ], filters["keyword"])
         )
     
     # Name filter
     if "name" in filters and filters["name"]:
-        name_term = f"%{filters['name']}%"
-        conditions.append(
-            or_(
-                Contact.first_name.ilike(name_term),
-                Contact.last_name.ilike(name_term)
-            )
-        )
+        conditions.append(search_index.contains(Contact, ["first_name", "last_name"], filters["name"]))
     
     # Email filter
     if "email" in filters and filters["email"]:
-        email_term = f"%{filters['email']}%"
-        conditions.append(Contact.email.ilike(email_term))
+        conditions.append(search_index.contains(Contact, ["email"], filters["email"]))
     
     # Job title filter
     if "job_title" in filters and filters["job_title"]:
-        job_term = f"%{filters['job_title']}%"
-        conditions.append(Contact.job_title.ilike(job_term))
+        conditions.append(search_index.contains(Contact, ["job_title"], filters["job_title"]))
     
     # Company filter
     if "company" in filters and filters["company"]:
-        company_term = f"%{filters['company']}%"
-        conditions.append(Contact.company.ilike(company_term))
+        conditions.append(search_index.contains(Contact, ["company"], filters["company"]))
     
     # Location filter
     if "location" in filters and filters["location"]:
-        location_term = f"%{filters['location']}%"
-        conditions.append(Contact.location.ilike(location_term))
+        conditions.append(search_index.contains(Contact, ["location"], filters["location"]))
     
     # Age filters
     if "age_min" in filters and filters["age_min"] is not None:
@@ -335,8 +336,7 @@ def execute_parsed_query(db: Session, parsed_query: dict, limit: int = 10) -> Li
     
     # Business needs filter
     if "business_needs" in filters and filters["business_needs"]:
-        business_term = f"%{filters['business_needs']}%"
-        conditions.append(Contact.business_needs.ilike(business_term))
+        conditions.append(search_index.contains(Contact, ["business_needs"], filters["business_needs"]))
     
     # Apply all conditions
     if conditions:
@@ -345,34 +345,30 @@ def execute_parsed_query(db: Session, parsed_query: dict, limit: int = 10) -> Li
     else:
         print("No filter conditions applied - will return all contacts")
     
-    # Handle interests filter
+    # Handle interests filter: resolve terms to dictionary IDs once and
+    # semi-join on the indexed integer column, or on each row's own category
     if "interests" in filters and filters["interests"]:
-        interest_conditions = []
-        for interest in filters["interests"]:
-            interest_term = f"%{interest}%"
-            interest_conditions.append(
-                Contact.interests.any(
-                    or_(
-                        ContactInterest.interest_category.ilike(interest_term),
-                        ContactInterest.interest_value.ilike(interest_term)
-                    )
-                )
+        interest_conditions = [
+            taxonomy_service.interest_condition(db, interest) for interest in filters["interests"]
+        ]
+        query = query.filter(
+            Contact.id.in_(
+                select(ContactInterest.contact_id).where(or_(*interest_conditions))
             )
-        if interest_conditions:
-            query = query.filter(or_(*interest_conditions))
-            print(f"Applied {len(interest_conditions)} interest conditions")
+        )
+        print(f"Applied {len(interest_conditions)} interest conditions")
     
     # Handle skills filter
     if "skills" in filters and filters["skills"]:
-        skill_conditions = []
+        skill_ids = set()
         for skill in filters["skills"]:
-            skill_term = f"%{skill}%"
-            skill_conditions.append(
-                Contact.skills.any(ContactSkill.skill_name.ilike(skill_term))
+            skill_ids.update(taxonomy_service.match_skill_ids(db, skill))
+        query = query.filter(
+            Contact.id.in_(
+                select(ContactSkill.contact_id).where(ContactSkill.skill_id.in_(skill_ids))
             )
-        if skill_conditions:
-            query = query.filter(or_(*skill_conditions))
-            print(f"Applied {len(skill_conditions)} skill conditions")
+        )
+        print(f"Applied skill filter resolving to {len(skill_ids)} terms")
     
     # Execute query with limit
     results = query.limit(limit).all()
@@ -396,16 +392,19 @@ async def get_query_history(
 @router.post("/test-db-search")
 async def test_database_search(
     query_request: QueryRequest,
+    profile: bool = False,
     db: Session = Depends(get_db)
 ):
     """Test database search without vector search (for debugging)"""
     
     print(f"\n=== DATABASE SEARCH TEST ===")
     print(f"Query: {query_request.query}")
+    profiler = get_profiler(db, profile).start()
     
     try:
         # Force database search only
-        parsed_query = await parse_natural_language_query(query_request.query)
+        with profiler.track("openai.parse_query"):
+            parsed_query = await parse_natural_language_query(query_request.query)
         print(f"Parsed query: {parsed_query}")
         
         results = execute_parsed_query(db, parsed_query, query_request.limit)
@@ -423,15 +422,19 @@ async def test_database_search(
         print(f"Formatted {len(formatted_results)} results")
         print(f"=== DATABASE SEARCH TEST END ===\n")
         
-        return {
+        response = {
             "query": query_request.query,
             "results": formatted_results,
             "results_count": len(results),
             "search_method": "database_only",
             "parsed_query": parsed_query
         }
+        if profile:
+            response["profile"] = profiler.report()
+        return response
         
     except Exception as e:
+        profiler.stop()
         print(f"Database search test failed: {e}")
         import traceback
         traceback.print_exc()
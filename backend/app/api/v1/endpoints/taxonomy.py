@@ -0,0 +1,85 @@
+"""
+Interest and skill taxonomy endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from pydantic import BaseModel
+
+from ....core.database import get_db
+from ....models import InterestTerm, SkillTerm
+from ....services.taxonomy import taxonomy_service, normalize_term
+
+router = APIRouter()
+
+# Pydantic models
+class AliasCreate(BaseModel):
+    alias: str
+
+class TermResponse(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    aliases: List[str]
+
+TERM_MODELS = {
+    "interests": ("interest", InterestTerm),
+    "skills": ("skill", SkillTerm),
+}
+
+def _resolve_kind(kind: str):
+    if kind not in TERM_MODELS:
+        raise HTTPException(status_code=404, detail="Unknown taxonomy kind")
+    return TERM_MODELS[kind]
+
+@router.get("/{kind}", response_model=List[TermResponse])
+def get_terms(
+    kind: str,
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """List canonical interest or skill terms with their aliases"""
+    _, term_model = _resolve_kind(kind)
+    query = db.query(term_model).options(selectinload(term_model.aliases))
+
+    if search:
+        query = query.filter(term_model.normalized_name.like(f"%{normalize_term(search)}%"))
+
+    terms = query.order_by(term_model.name).offset(skip).limit(limit).all()
+    return [format_term_response(term) for term in terms]
+
+@router.post("/{kind}/{term_id}/aliases", response_model=TermResponse)
+def add_term_alias(kind: str, term_id: int, alias: AliasCreate, db: Session = Depends(get_db)):
+    """Register an alias so that future writes and filters resolve it to the term"""
+    taxonomy_kind, _ = _resolve_kind(kind)
+    try:
+        term = taxonomy_service.add_alias(db, taxonomy_kind, term_id, alias.alias)
+        db.commit()
+        db.refresh(term)
+        return format_term_response(term)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to add alias: {str(e)}")
+
+@router.post("/backfill")
+def backfill_taxonomy(db: Session = Depends(get_db)):
+    """Link interest and skill rows written without a term ID"""
+    try:
+        return taxonomy_service.backfill(db)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Taxonomy backfill failed: {str(e)}")
+
+def format_term_response(term) -> dict:
+    """Format taxonomy term for response"""
+    return {
+        "id": term.id,
+        "name": term.name,
+        "category": getattr(term, "category", None),
+        "aliases": [a.alias for a in term.aliases]
+    }
@@ -2,11 +2,12 @@
 Vector search endpoints using ChromaDB
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from sqlalchemy.orm import Session, undefer
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
 from ....core.database import get_db
+from ....services.transcript_index import transcript_index
 from ....services.vector_store import vector_store
 from ....models import Contact
 
@@ -18,6 +19,12 @@ class VectorSearchRequest(BaseModel):
     limit: int = 10
 
 
+class TranscriptSearchRequest(BaseModel):
+    query: str
+    limit: int = 10
+    contact_id: Optional[int] = None
+
+
 class VectorSearchResponse(BaseModel):
     query: str
     results: List[Dict[str, Any]]
@@ -39,7 +46,8 @@ async def semantic_search(
         
         # Get full contact details from database
         contact_ids = [result["contact_id"] for result in vector_results]
-        contacts = db.query(Contact).filter(Contact.id.in_(contact_ids)).all()
+        contacts = db.query(Contact).options(undefer(Contact.business_needs))\
+            .filter(Contact.id.in_(contact_ids), Contact.archived_at.is_(None)).all()
         
         # Create contact lookup
         contact_lookup = {contact.id: contact for contact in contacts}
@@ -76,6 +84,32 @@ async def semantic_search(
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.post("/transcripts")
+def search_transcripts(
+    search_request: TranscriptSearchRequest,
+    db: Session = Depends(get_db)
+):
+    """Find what was said in recordings: transcript passages most similar to the query
+
+    Each result has the recording, the passage's start and end in seconds (null for
+    transcripts stored without timestamps) and the contacts linked to the recording.
+    ``contact_id`` searches only that contact's recordings.
+    """
+    if not 1 <= search_request.limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    try:
+        results = transcript_index.search(
+            db, search_request.query, search_request.limit, search_request.contact_id
+        )
+        return {
+            "query": search_request.query,
+            "results": results,
+            "total_results": len(results)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transcript search failed: {str(e)}")
+
+
 @router.get("/similar/{contact_id}")
 async def find_similar_contacts(
     contact_id: int,
@@ -94,7 +128,8 @@ async def find_similar_contacts(
         
         # Get full contact details
         similar_contact_ids = [result["contact_id"] for result in similar_results]
-        similar_contacts = db.query(Contact).filter(Contact.id.in_(similar_contact_ids)).all()
+        similar_contacts = db.query(Contact)\
+            .filter(Contact.id.in_(similar_contact_ids), Contact.archived_at.is_(None)).all()
         
         # Create lookup
         contact_lookup = {contact.id: contact for contact in similar_contacts}
@@ -0,0 +1,51 @@
+"""
+Job callback URL checks
+
+Jobs POST their final state, which can include extracted contact details, to
+a client-supplied ``callback_url``. Only http(s) URLs are accepted, and unless
+the host is listed in ``settings.callback_allowed_hosts`` every address it
+resolves to must be public, so a callback cannot be aimed at the server's own
+loopback, private network or cloud metadata addresses. The check runs when
+the job is queued and again right before the POST, since DNS can change in
+between.
+"""
+import ipaddress
+import socket
+from typing import Optional
+from urllib.parse import urlsplit
+
+from fastapi import HTTPException
+
+from .config import settings
+
+
+def callback_url_error(url: str) -> Optional[str]:
+    """Why ``url`` may not be used as a callback, or None when it may"""
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return "callback_url is not a valid URL"
+    if parts.scheme not in ("http", "https") or not host:
+        return "callback_url must be an http or https URL"
+
+    if host.lower() in settings.get_callback_allowed_hosts():
+        return None
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port or 443, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError):
+        return f"callback_url host {host} could not be resolved"
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if not ip.is_global or ip.is_multicast:
+            return f"callback_url host {host} resolves to a non-public address"
+    return None
+
+
+def check_callback_url(url: Optional[str]):
+    """Reject a disallowed ``callback_url`` with 400"""
+    if url:
+        error = callback_url_error(url)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
@@ -0,0 +1,51 @@
+"""
+Text compression for large stored values
+
+Transcripts compress 3-4x with zlib; zstd (needs the optional ``zstandard``
+package) compresses about as well and decompresses faster. The codec is
+stored next to every value, so changing ``settings.transcript_compression``
+only affects new values and old ones stay readable.
+"""
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # Only needed for TRANSCRIPT_COMPRESSION=zstd
+    zstandard = None
+
+CODECS = ("none", "zlib", "zstd")
+
+
+def compress_text(text: str, codec: str = "zlib") -> Tuple[bytes, str]:
+    """Encode and compress text; returns the bytes and the codec actually used
+
+    Falls back to zlib when zstd is not installed, and to no compression when
+    compressing does not make the value smaller.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown compression codec: {codec}")
+    raw = text.encode("utf-8")
+    if codec == "zstd" and zstandard is None:
+        codec = "zlib"
+    if codec == "zstd":
+        data = zstandard.ZstdCompressor(level=10).compress(raw)
+    elif codec == "zlib":
+        data = zlib.compress(raw, 6)
+    else:
+        return raw, "none"
+    if len(data) >= len(raw):
+        return raw, "none"
+    return data, codec
+
+
+def decompress_text(data: bytes, codec: str) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed text requires the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec != "none":
+        raise ValueError(f"Unknown compression codec: {codec}")
+    return data.decode("utf-8")
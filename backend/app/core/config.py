@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     # ChromaDB
     chroma_persist_directory: str = "./.chromadb"
     chroma_collection_name: str = "contacts_embeddings"
+    chroma_transcript_collection_name: str = "transcript_chunks"
     
     # OpenAI
     openai_api_key: Optional[str] = None
@@ -34,6 +35,35 @@ class Settings(BaseSettings):
     # File Upload
     upload_dir: str = "./uploads"
     max_file_size: int = 50 * 1024 * 1024  # 50MB
+    max_import_size: int = 100 * 1024 * 1024  # 100MB, for contact spreadsheets
+    upload_chunk_size: int = 1024 * 1024  # Bytes read per step while streaming an upload to disk
+    stream_accel_redirect: Optional[str] = None  # nginx internal location mapped to upload_dir, e.g. "/protected-audio"
+    
+    # Audio storage tiering
+    audio_archive_dir: str = "./archive"  # Originals of transcoded recordings are moved here (can be a cheaper mount)
+    transcode_bitrate: str = "24k"  # Opus bitrate for transcoded recordings; speech stays clear well below this
+    transcode_after_days: int = 7  # Only files whose recordings were all processed this long ago are transcoded
+    transcode_duration_tolerance: float = 0.5  # Seconds a transcoded file's duration may differ from the original
+    
+    # Transcription
+    transcription_backend: str = "openai"  # "openai" (hosted whisper-1) or "local" (Whisper on CPU)
+    local_whisper_engine: str = "faster-whisper"  # or "openai-whisper"
+    local_whisper_model: str = "base"  # tiny, base, small, medium, large-v2, ...
+    local_whisper_compute_type: str = "int8"  # faster-whisper only
+    transcription_workers: int = 2  # Processes in the local transcription pool, one model each
+    transcription_cpu_threads: int = 1  # CPU threads per transcription process
+    transcription_concurrency: int = 4  # Chunks sent to the hosted API at once
+    transcription_chunk_seconds: int = 300  # Longer recordings are split at silences into chunks of about this length; 0 disables
+    transcription_chunk_overlap: float = 1.0  # Seconds of audio shared by neighbouring chunks
+    transcript_compression: str = "zlib"  # Stored transcript text: "none", "zlib" or "zstd" (needs zstandard)
+    
+    # Job workers (transcription and extraction queue)
+    job_workers: int = 2  # Worker threads started with the API; 0 to run them only via run_workers.py
+    job_poll_interval: float = 1.0  # Seconds an idle worker waits before polling again
+    job_lease_seconds: int = 900  # A job not finished within its lease is handed to another worker
+    job_max_attempts: int = 3
+    job_retry_backoff: int = 30  # Seconds before the first retry, doubled on every further attempt
+    callback_allowed_hosts: str = ""  # Comma-separated callback hosts allowed even on private addresses
     
     # API Configuration
     api_v1_str: str = "/api/v1"
@@ -48,5 +78,9 @@ class Settings(BaseSettings):
         """Get CORS origins as a list from comma-separated string"""
         return [origin.strip() for origin in self.allowed_origins.split(',')]
 
+    def get_callback_allowed_hosts(self) -> List[str]:
+        """Callback hosts exempt from the public address check, lowercased"""
+        return [host.strip().lower() for host in self.callback_allowed_hosts.split(',') if host.strip()]
+
 
 settings = Settings()
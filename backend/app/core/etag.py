@@ -0,0 +1,69 @@
+"""
+Weak ETags and conditional GET support
+
+ETags are built from per-table version counters (``table_versions``, bumped
+by triggers on every write) plus the request's own parameters, so checking
+``If-None-Match`` costs one tiny query and no ORM hydration. Databases
+without the triggers fall back to ``count(*)``/``max(updated_at)`` aggregates.
+"""
+import hashlib
+from typing import Dict, Iterable
+
+from fastapi import Request, Response
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+CONTACT_TABLES = ("contacts", "contact_interests", "contact_skills")
+EVENT_TABLES = ("events", "event_participations", "contacts")
+
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> Dict[str, str]:
+    """Current version of each table"""
+    tables = sorted(set(tables))
+    if settings.database_url.startswith("sqlite"):
+        rows = db.execute(
+            text("SELECT table_name, version FROM table_versions WHERE table_name IN :names")
+            .bindparams(bindparam("names", expanding=True)),
+            {"names": tables}
+        ).all()
+        if len(rows) == len(tables):
+            return {name: str(version) for name, version in rows}
+
+    versions = {}
+    for table in tables:
+        columns = {c["name"] for c in inspect(db.get_bind()).get_columns(table)}
+        latest = "max(updated_at)" if "updated_at" in columns else "max(id)"
+        count, last = db.execute(text(f"SELECT count(*), {latest} FROM {table}")).one()
+        versions[table] = f"{count}:{last}"
+    return versions
+
+
+def compute_etag(db: Session, tables: Iterable[str], *parts) -> str:
+    """Weak ETag for a response built from ``tables`` and shaped by ``parts`` (IDs, filters)"""
+    versions = get_table_versions(db, tables)
+    key = "|".join([f"{t}={v}" for t, v in sorted(versions.items())] + [repr(p) for p in parts])
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of the ETag against the request's If-None-Match header"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the ETag"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str):
+    """Attach the ETag to a full response; clients must revalidate before reuse"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,25 @@
+"""
+Sparse fieldset support for list endpoints
+
+``?fields=id,first_name,email`` restricts a list response to the named
+fields so the endpoint can select just those columns instead of loading
+whole ORM entities.
+"""
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], always: Iterable[str] = ("id",)) -> Optional[List[str]]:
+    """Validate a comma-separated ``fields`` parameter; None means every field"""
+    if not fields:
+        return None
+    allowed = list(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys([*always, *requested]))
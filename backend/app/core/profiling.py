@@ -0,0 +1,210 @@
+"""
+Opt-in request profiling for query and list endpoints
+
+A ``QueryProfiler`` captures every SQL statement executed while it is active
+(through SQLAlchemy engine events), the SQLite ``EXPLAIN QUERY PLAN`` of each
+SELECT and the timings of external calls (OpenAI, ChromaDB). The engine
+listeners are only attached while at least one profiler is active, so the
+normal request path pays nothing.
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import engine
+
+_active_profiler: ContextVar[Optional["QueryProfiler"]] = ContextVar("active_query_profiler", default=None)
+_listener_lock = threading.Lock()
+_listener_users = 0
+
+_SCAN_PATTERN = re.compile(r"^SCAN (\w+)")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiler = _active_profiler.get()
+    if profiler is not None and profiler.capturing:
+        context._profile_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiler = _active_profiler.get()
+    start = getattr(context, "_profile_start", None)
+    if profiler is not None and start is not None:
+        profiler.statements.append({
+            "sql": statement,
+            "parameters": parameters,
+            "executemany": executemany,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "rowcount": cursor.rowcount,
+        })
+
+
+def _attach_listeners():
+    global _listener_users
+    with _listener_lock:
+        if _listener_users == 0:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        _listener_users += 1
+
+
+def _detach_listeners():
+    global _listener_users
+    with _listener_lock:
+        _listener_users -= 1
+        if _listener_users == 0:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class QueryProfiler:
+    """Collects SQL statements, query plans and external-call timings for one request"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.statements: List[Dict[str, Any]] = []
+        self.external_calls: List[Dict[str, Any]] = []
+        self.capturing = False
+        self._token = None
+        self._start = None
+        self._total_ms = None
+
+    def start(self) -> "QueryProfiler":
+        """Start capturing statements executed in the current context"""
+        _attach_listeners()
+        self._token = _active_profiler.set(self)
+        self.capturing = True
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Stop capturing; safe to call more than once"""
+        if self._token is None:
+            return
+        self._total_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        self.capturing = False
+        _active_profiler.reset(self._token)
+        self._token = None
+        _detach_listeners()
+
+    @contextmanager
+    def track(self, name: str):
+        """Time an external (non-SQL) call such as an OpenAI or ChromaDB request"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.external_calls.append({
+                "name": name,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def _explain(self, statement: Dict[str, Any], table_sizes: Dict[str, int]):
+        """Attach EXPLAIN QUERY PLAN output and an estimate of rows scanned"""
+        statement["plan"] = None
+        statement["rows_scanned"] = None
+        if not settings.database_url.startswith("sqlite"):
+            return
+        if statement["executemany"] or not statement["sql"].lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+
+        connection = self.db.connection()
+        try:
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement['sql']}", tuple(statement["parameters"] or ())
+            ).all()
+        except Exception as e:
+            statement["plan"] = [f"EXPLAIN failed: {e}"]
+            return
+
+        statement["plan"] = [row[3] for row in plan]
+
+        # Full scans read every row of the table; index searches are not counted
+        rows_scanned = 0
+        for detail in statement["plan"]:
+            match = _SCAN_PATTERN.match(detail)
+            if not match or "VIRTUAL TABLE" in detail:
+                continue
+            table = match.group(1)
+            if table not in table_sizes:
+                base_table = re.sub(r"_\d+$", "", table)
+                try:
+                    table_sizes[table] = connection.exec_driver_sql(
+                        f'SELECT COUNT(*) FROM "{base_table}"'
+                    ).scalar()
+                except Exception:
+                    table_sizes[table] = 0
+            rows_scanned += table_sizes[table]
+        statement["rows_scanned"] = rows_scanned
+
+    def report(self) -> Dict[str, Any]:
+        """Stop capturing and build the profile returned to the client"""
+        self.stop()
+
+        table_sizes: Dict[str, int] = {}
+        for statement in self.statements:
+            self._explain(statement, table_sizes)
+
+        sql_total_ms = sum(s["duration_ms"] for s in self.statements)
+        return {
+            "total_ms": self._total_ms,
+            "sql": {
+                "statement_count": len(self.statements),
+                "total_ms": round(sql_total_ms, 3),
+                "rows_scanned": sum(s["rows_scanned"] or 0 for s in self.statements),
+                "statements": [
+                    {
+                        "sql": s["sql"],
+                        "parameters": _json_safe(s["parameters"]),
+                        "duration_ms": s["duration_ms"],
+                        "rowcount": s["rowcount"],
+                        "plan": s["plan"],
+                        "rows_scanned": s["rows_scanned"],
+                    } for s in self.statements
+                ],
+            },
+            "external_calls": self.external_calls,
+            "external_total_ms": round(sum(c["duration_ms"] for c in self.external_calls), 3),
+        }
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op"""
+
+    def start(self) -> "NullProfiler":
+        return self
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def track(self, name: str):
+        yield
+
+    def report(self) -> None:
+        return None
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def get_profiler(db: Session, profile: bool):
+    """Return a real profiler when ``profile=true`` was requested, else the no-op one"""
+    return QueryProfiler(db) if profile else NULL_PROFILER
@@ -0,0 +1,49 @@
+"""
+Fast JSON responses
+
+Returning dicts through an endpoint's ``response_model`` makes FastAPI
+validate every row against the Pydantic model, walk the result again with
+``jsonable_encoder`` and then encode it with the stdlib ``json`` module. The
+row dicts built by the ``format_*`` helpers (or by ``row_serializer`` for
+column projections) already have the right shape, so read endpoints return a
+``FastJSONResponse`` instead, which encodes them in one pass with orjson. Endpoints keep their ``response_model`` so the OpenAPI
+schema does not change.
+"""
+import json
+from typing import Any, Callable, Dict, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Anything orjson does not know natively (Decimal, sets, Pydantic models, ...)
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that skips ``jsonable_encoder`` and encodes with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_serializer(keys: Sequence[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """Prebuilt converter from SQL result tuples in ``keys`` order to dicts"""
+    keys = tuple(keys)
+    return lambda row: dict(zip(keys, row))
+
@@ -0,0 +1,181 @@
+"""
+File responses with HTTP Range support
+
+Starlette's ``FileResponse`` always sends the whole file, so seeking in a long
+recording would download it from the start. ``RangeFileResponse`` answers
+``Range: bytes=...`` with ``206 Partial Content`` and only those bytes,
+``If-None-Match``/``If-Modified-Since`` with ``304``, and honours ``If-Range``.
+
+The body is never read into memory whole. When the ASGI server offers the
+``http.response.zerocopysend`` extension the kernel copies the range straight
+from the file (``sendfile``); otherwise it is read and sent in
+``chunk_size`` pieces. Behind nginx, setting ``settings.stream_accel_redirect``
+hands the file to nginx with ``X-Accel-Redirect`` instead, and nginx serves
+the ranges with ``sendfile`` itself.
+"""
+import hashlib
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from mimetypes import guess_type
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+
+ByteRange = Tuple[int, int]  # First and last byte, inclusive
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[ByteRange]:
+    """The single byte range requested, or None to send the whole file
+
+    Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if not first:  # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None  # Malformed ranges are ignored
+    if start > end and last:
+        return None  # Invalid, so ignored
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    digest = hashlib.md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+class RangeFileResponse(Response):
+    """Serve a file, or the byte range the request asks for"""
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        request: Request,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        content_disposition_type: str = "inline"
+    ):
+        stat_result = os.stat(path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.size = stat_result.st_size
+        self.background = None
+        self.media_type = media_type or guess_type(path)[0] or guess_type(filename or "")[0] \
+            or "application/octet-stream"
+        self.send_header_only = request.method == "HEAD"
+        self.byte_range: Optional[ByteRange] = None
+        self.status_code = 200
+        self.init_headers({})
+
+        etag = file_etag(stat_result)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["etag"] = etag
+        self.headers["last-modified"] = last_modified
+        if filename:
+            self.headers["content-disposition"] = f"{content_disposition_type}; filename*=utf-8''{quote(filename)}"
+
+        if self._not_modified(request, etag, stat_result.st_mtime):
+            self.status_code = 304
+            self.send_header_only = True
+            return
+
+        if_range = request.headers.get("if-range")
+        range_header = request.headers.get("range")
+        if if_range and if_range not in (etag, last_modified):
+            range_header = None  # The file changed since the client's partial copy
+        try:
+            self.byte_range = parse_range(range_header, self.size)
+        except RangeNotSatisfiable:
+            self.status_code = 416
+            self.send_header_only = True
+            self.headers["content-range"] = f"bytes */{self.size}"
+            self.headers["content-length"] = "0"
+            return
+
+        start, end = self.byte_range or (0, self.size - 1)
+        if self.byte_range:
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.size}"
+        self.headers["content-length"] = str(max(end - start + 1, 0))
+
+        if settings.stream_accel_redirect:
+            # nginx serves the file (and the range) itself from this internal location
+            relative = os.path.relpath(os.path.abspath(path), os.path.abspath(settings.upload_dir))
+            self.status_code = 200
+            self.send_header_only = True
+            if "content-range" in self.headers:
+                del self.headers["content-range"]
+            self.headers["content-length"] = "0"
+            self.headers["x-accel-redirect"] = f"{settings.stream_accel_redirect.rstrip('/')}/{quote(relative)}"
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            return any(tag.strip() in (etag, f"W/{etag}", "*") for tag in if_none_match.split(","))
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        start, end = self.byte_range or (0, self.size - 1)
+        count = end - start + 1
+        if count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "offset": start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(start)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break  # Truncated while sending; the client sees a short body
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
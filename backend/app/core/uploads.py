@@ -0,0 +1,189 @@
+"""
+Streaming file uploads
+
+Starlette parses a multipart body completely, spooling file parts to a
+temporary file, before the endpoint runs. ``UploadSizeLimitMiddleware``
+therefore enforces the size limit of the upload endpoints while the body
+arrives: a request whose ``Content-Length`` is over the limit is answered
+with 413 before any of it is read, and any other is cut off with 413 as soon
+as the bytes received pass the limit.
+
+``save_upload`` then copies the spooled file to its final location in
+``upload_chunk_size`` pieces instead of reading it into memory whole. The
+SHA-256 digest and size are computed while copying, and the finished file is
+moved into place with an atomic rename so a partial upload is never visible
+under its final name.
+
+With ``content_addressed=True`` the file is stored as ``blobs/<sha256>`` (plus
+its extension) instead, so uploading the same bytes again keeps a single copy.
+``import_file`` does the same for a file already on this machine, hard-linking
+it into place when it is on the same filesystem.
+"""
+import hashlib
+import os
+import secrets
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.flac')
+MULTIPART_OVERHEAD = 64 * 1024  # Allowance for boundaries, part headers and the other form fields
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the size limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_size / (1024 * 1024):g} MB")
+        self.max_size = max_size
+
+
+def upload_limits() -> Dict[str, int]:
+    """File size limit of each upload endpoint, by path"""
+    return {
+        f"{settings.api_v1_str}/audio/upload": settings.max_file_size,
+        f"{settings.api_v1_str}/contacts/import": settings.max_import_size,
+    }
+
+
+class UploadSizeLimitMiddleware:
+    """Rejects upload requests with 413 once their body passes the endpoint's limit"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        max_size = upload_limits().get(scope["path"].rstrip("/")) if scope["type"] == "http" else None
+        if max_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_size + MULTIPART_OVERHEAD
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": str(UploadTooLarge(max_size))}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing, which passes HTTPException through
+                    raise HTTPException(status_code=413, detail=str(UploadTooLarge(max_size)))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def save_upload(
+    file: UploadFile,
+    directory: str,
+    max_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    content_addressed: bool = False
+) -> Dict[str, Any]:
+    """Copy an upload into ``directory`` and return its ``path``, ``size`` and ``sha256``.
+
+    Raises UploadTooLarge (nothing is left on disk) when the file is over ``max_size``;
+    for HTTP uploads ``UploadSizeLimitMiddleware`` has normally rejected it already.
+    For content-addressed uploads ``existing`` tells whether the blob was already stored.
+    """
+    max_size = settings.max_file_size if max_size is None else max_size
+    chunk_size = chunk_size or settings.upload_chunk_size
+
+    # Starlette records the size of every spooled part; the check while copying
+    # covers an UploadFile built without one
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLarge(max_size)
+
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    os.close(fd)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(max_size)
+                digest.update(chunk)
+                await f.write(chunk)
+
+        sha256 = digest.hexdigest()
+        if content_addressed:
+            return store_blob(temp_path, directory, sha256, size, file.filename)
+
+        # The random part keeps two uploads of the same file in the same second apart
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_name = f"{timestamp}_{sha256[:8]}_{secrets.token_hex(4)}_{os.path.basename(file.filename or 'upload')}"
+        path = os.path.join(directory, file_name)
+        os.replace(temp_path, path)
+        return {"path": path, "size": size, "sha256": sha256}
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def blob_path(directory: str, sha256: str, file_name: Optional[str] = None) -> str:
+    """Where a content-addressed file is stored; fanned out by hash prefix"""
+    extension = os.path.splitext(file_name or "")[1].lower()
+    return os.path.join(directory, "blobs", sha256[:2], f"{sha256}{extension}")
+
+
+def store_blob(temp_path: str, directory: str, sha256: str, size: int, file_name: Optional[str]) -> Dict[str, Any]:
+    """Move a hashed temp file to its blob path, or drop it when the blob exists"""
+    path = blob_path(directory, sha256, file_name)
+    existing = os.path.exists(path)
+    if existing:
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    return {"path": path, "size": size, "sha256": sha256, "existing": existing}
+
+
+def import_file(source_path: str, directory: str, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Hash a local file and store it content-addressed, returning what ``save_upload`` does"""
+    chunk_size = chunk_size or settings.upload_chunk_size
+    digest = hashlib.sha256()
+    size = 0
+    with open(source_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            size += len(chunk)
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+
+    path = blob_path(directory, sha256, source_path)
+    if os.path.exists(path):
+        return {"path": path, "size": size, "sha256": sha256, "existing": True}
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.part"
+    try:
+        try:
+            os.link(source_path, temp_path)  # No copy, and deleting the blob keeps the source
+        except OSError:
+            shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {"path": path, "size": size, "sha256": sha256, "existing": False}
@@ -2,16 +2,33 @@
 Database models for Personal AI Database
 """
 from .contact import Contact, ContactInterest, ContactSkill
-from .audio import AudioRecording
+from .taxonomy import InterestTerm, InterestAlias, SkillTerm, SkillAlias
+from .audio import AudioRecording, AudioContactLink
+from .transcript import Transcript, TranscriptSegment
 from .event import Event, EventParticipation
 from .query import QueryHistory
+from .job import Job
+from .duplicate import DuplicateSuggestion
+from .version import TableVersion
+from .extraction import ExtractionCache
 
 __all__ = [
     "Contact",
     "ContactInterest", 
     "ContactSkill",
+    "InterestTerm",
+    "InterestAlias",
+    "SkillTerm",
+    "SkillAlias",
     "AudioRecording",
+    "AudioContactLink",
+    "Transcript",
+    "TranscriptSegment",
     "Event",
     "EventParticipation",
-    "QueryHistory"
+    "QueryHistory",
+    "Job",
+    "DuplicateSuggestion",
+    "TableVersion",
+    "ExtractionCache"
 ]
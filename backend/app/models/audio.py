@@ -1,8 +1,10 @@
 """
 Audio recording database models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import BigInteger, Boolean, Column, Integer, JSON, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from ..core.database import Base
 
@@ -12,12 +14,49 @@ class AudioRecording(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id"))
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False, index=True)  # Shared by duplicate uploads
     file_name = Column(String(255), nullable=False)
     duration_seconds = Column(Integer)
-    transcription = Column(Text)
+    file_size = Column(BigInteger)  # Size as uploaded
+    stored_size = Column(BigInteger)  # Size of file_path after transcoding
+    original_path = Column(String(500))  # The uploaded file, moved to the archive once transcoded
+    transcoded_at = Column(DateTime(timezone=True))
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded bytes
+    duplicate_of_id = Column(Integer, ForeignKey("audio_recordings.id"), index=True)  # First upload of the same bytes
+    extraction_result = deferred(Column(JSON), group="large_text")  # Model output, reused by duplicates
+    extraction_prompt_hash = Column(String(64), index=True)  # Prompt version that produced extraction_result
+    transcription_reused = Column(Boolean, default=False)  # Copied from a recording with the same content
+    extraction_reused = Column(Boolean, default=False)
     processed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     contact = relationship("Contact", back_populates="audio_recordings")
+    contact_links = relationship("AudioContactLink", back_populates="audio_recording", cascade="all, delete-orphan")
+    # Transcripts are stored in their own tables (see transcript.py)
+    transcript = relationship("Transcript", back_populates="audio_recording", uselist=False, cascade="all, delete-orphan")
+    segments = relationship("TranscriptSegment", back_populates="audio_recording", order_by="TranscriptSegment.position",
+                            cascade="all, delete-orphan")
+
+    @property
+    def transcription(self) -> Optional[str]:
+        """The full transcript text, or None before transcription"""
+        return self.transcript.text if self.transcript is not None else None
+
+
+class AudioContactLink(Base):
+    """A person heard in a recording (``contact_id`` on the recording is the main one)"""
+    __tablename__ = "audio_contact_links"
+    __table_args__ = (
+        UniqueConstraint("audio_recording_id", "contact_id", name="uq_audio_contact_link"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    audio_recording_id = Column(Integer, ForeignKey("audio_recordings.id", ondelete="CASCADE"), nullable=False, index=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    speaker = Column(String(100))  # How the transcript refers to them, e.g. "Speaker 2" or a name
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    audio_recording = relationship("AudioRecording", back_populates="contact_links")
+    contact = relationship("Contact", back_populates="audio_links")
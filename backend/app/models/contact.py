@@ -1,8 +1,8 @@
 """
 Contact-related database models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from ..core.database import Base
 
@@ -20,23 +20,31 @@ class Contact(Base):
     location = Column(String(200))
     age = Column(Integer)
     has_pets = Column(Boolean, default=False)
-    business_needs = Column(Text)
-    personal_notes = Column(Text)
+    # Large free text loads on first access unless the query undefers "large_text"
+    business_needs = deferred(Column(Text), group="large_text")
+    personal_notes = deferred(Column(Text), group="large_text")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    archived_at = Column(DateTime(timezone=True), index=True)  # Soft-archived contacts are hidden from lists and search
     
     # Relationships
     audio_recordings = relationship("AudioRecording", back_populates="contact")
+    audio_links = relationship("AudioContactLink", back_populates="contact", cascade="all, delete-orphan")
     interests = relationship("ContactInterest", back_populates="contact", cascade="all, delete-orphan")
     skills = relationship("ContactSkill", back_populates="contact", cascade="all, delete-orphan")
     event_participations = relationship("EventParticipation", back_populates="contact")
 
 
+# Case-insensitive email lookups (bulk upsert and import matching)
+Index("ix_contacts_email_lower", func.lower(Contact.email))
+
+
 class ContactInterest(Base):
     __tablename__ = "contact_interests"
     
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"))
+    interest_id = Column(Integer, ForeignKey("interest_terms.id"), index=True)
     interest_category = Column(String(100))
     interest_value = Column(String(200))
     confidence_score = Column(Float)
@@ -44,6 +52,7 @@ class ContactInterest(Base):
     
     # Relationships
     contact = relationship("Contact", back_populates="interests")
+    term = relationship("InterestTerm")
 
 
 class ContactSkill(Base):
@@ -51,6 +60,7 @@ class ContactSkill(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"))
+    skill_id = Column(Integer, ForeignKey("skill_terms.id"), index=True)
     skill_name = Column(String(200))
     skill_level = Column(String(50))
     years_experience = Column(Integer)
@@ -58,3 +68,4 @@ class ContactSkill(Base):
     
     # Relationships
     contact = relationship("Contact", back_populates="skills")
+    term = relationship("SkillTerm")
@@ -0,0 +1,23 @@
+"""
+Duplicate contact detection database models
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class DuplicateSuggestion(Base):
+    __tablename__ = "contact_duplicate_suggestions"
+    __table_args__ = (
+        UniqueConstraint("contact_id", "duplicate_contact_id", name="uq_duplicate_suggestion_pair"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)  # Lower ID of the pair
+    duplicate_contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+    features = Column(JSON)  # Per-feature similarity scores and the blocking keys that paired them
+    status = Column(String(50), default="pending", index=True)  # pending, dismissed
+    job_id = Column(Integer, ForeignKey("jobs.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -2,7 +2,7 @@
 Event-related database models
 """
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from ..core.database import Base
 
@@ -12,7 +12,7 @@ class Event(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
-    description = Column(Text)
+    description = deferred(Column(Text), group="large_text")
     event_type = Column(String(100))  # e.g., "Sing with Me", "Community Outreach"
     location = Column(String(200))
     event_date = Column(DateTime(timezone=True))
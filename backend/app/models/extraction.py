@@ -0,0 +1,22 @@
+"""
+Extraction cache database models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class ExtractionCache(Base):
+    __tablename__ = "extraction_cache"
+    __table_args__ = (
+        UniqueConstraint("transcript_hash", "prompt_hash", name="uq_extraction_cache_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    transcript_hash = Column(String(64), nullable=False)  # SHA-256 of the transcript text
+    prompt_hash = Column(String(64), nullable=False, index=True)  # SHA-256 of model, settings and prompt
+    model = Column(String(50))
+    result = Column(JSON, nullable=False)
+    hit_count = Column(Integer, default=0)
+    last_hit_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
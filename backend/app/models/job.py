@@ -0,0 +1,35 @@
+"""
+Background job database models
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False, index=True)  # e.g., "contact_import"
+    status = Column(String(50), default="pending", index=True)  # pending, running, completed, failed
+    params = Column(JSON)
+    total = Column(Integer)  # Items to process, when known up front
+    processed = Column(Integer, default=0)
+    succeeded = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    result = Column(JSON)
+    error = Column(Text)
+    # Queue bookkeeping for jobs run by the worker pool
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=1)
+    run_after = Column(DateTime(timezone=True))  # Retry backoff: not claimable before this time
+    lease_expires_at = Column(DateTime(timezone=True))  # A running job past its lease is re-claimed
+    locked_by = Column(String(100))  # Worker holding the lease
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Worker pool claim lookups
+Index("ix_jobs_queue", Job.status, Job.job_type, Job.run_after)
@@ -0,0 +1,58 @@
+"""
+Interest and skill taxonomy database models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class InterestTerm(Base):
+    __tablename__ = "interest_terms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)  # Canonical display value
+    normalized_name = Column(String(200), nullable=False, unique=True, index=True)
+    category = Column(String(100))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    aliases = relationship("InterestAlias", back_populates="term", cascade="all, delete-orphan")
+
+
+class InterestAlias(Base):
+    __tablename__ = "interest_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    term_id = Column(Integer, ForeignKey("interest_terms.id", ondelete="CASCADE"), nullable=False, index=True)
+    alias = Column(String(200), nullable=False)
+    normalized_alias = Column(String(200), nullable=False, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    term = relationship("InterestTerm", back_populates="aliases")
+
+
+class SkillTerm(Base):
+    __tablename__ = "skill_terms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)  # Canonical display value
+    normalized_name = Column(String(200), nullable=False, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    aliases = relationship("SkillAlias", back_populates="term", cascade="all, delete-orphan")
+
+
+class SkillAlias(Base):
+    __tablename__ = "skill_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    term_id = Column(Integer, ForeignKey("skill_terms.id", ondelete="CASCADE"), nullable=False, index=True)
+    alias = Column(String(200), nullable=False)
+    normalized_alias = Column(String(200), nullable=False, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    term = relationship("SkillTerm", back_populates="aliases")
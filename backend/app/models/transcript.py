@@ -0,0 +1,54 @@
+"""
+Transcript database models
+
+Transcripts live outside ``audio_recordings`` so listing and joining
+recordings only reads small metadata rows. The full text is stored compressed
+in ``transcripts``, and the timestamped segments in ``transcript_segments``,
+where a time range or speaker lookup reads only the rows it needs.
+"""
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.compression import decompress_text
+from ..core.database import Base
+
+
+class Transcript(Base):
+    __tablename__ = "transcripts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    audio_recording_id = Column(Integer, ForeignKey("audio_recordings.id", ondelete="CASCADE"), nullable=False, unique=True)
+    compression = Column(String(10), nullable=False, server_default="none")  # none, zlib or zstd
+    text_data = Column(LargeBinary, nullable=False)
+    char_count = Column(Integer, nullable=False, server_default="0")
+    stored_bytes = Column(Integer, nullable=False, server_default="0")
+    segment_count = Column(Integer, nullable=False, server_default="0")
+    language = Column(String(20))
+    embedded_at = Column(DateTime(timezone=True))  # When its passages were added to the vector store
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    audio_recording = relationship("AudioRecording", back_populates="transcript")
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.text_data, self.compression)
+
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        UniqueConstraint("audio_recording_id", "position", name="uq_transcript_segment_position"),
+        Index("ix_transcript_segments_recording_start", "audio_recording_id", "start_seconds"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    audio_recording_id = Column(Integer, ForeignKey("audio_recordings.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    start_seconds = Column(Float)
+    end_seconds = Column(Float)
+    speaker = Column(String(100))  # Set when the transcript distinguishes speakers
+    text = Column(Text, nullable=False)
+
+    # Relationships
+    audio_recording = relationship("AudioRecording", back_populates="segments")
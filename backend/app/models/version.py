@@ -0,0 +1,12 @@
+"""
+Table version database models
+"""
+from sqlalchemy import Column, Integer, String
+from ..core.database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # Bumped by triggers on every row written
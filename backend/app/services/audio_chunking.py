@@ -0,0 +1,207 @@
+"""
+Silence-aware chunking of long recordings
+
+Sending a 30-90 minute session to Whisper as one file is slow (one request or
+one process does all the work) and exceeds the hosted API's 25 MB upload
+limit. ``transcribe_recording`` decodes the file with ffmpeg to 16 kHz mono,
+finds pauses with a simple energy-based voice activity detector and cuts the
+audio at the longest pause near every ``settings.transcription_chunk_seconds``.
+Each chunk is written as a WAV file with ``settings.transcription_chunk_overlap``
+seconds of context on either side and submitted to the transcriber, so chunks
+run in parallel on the local process pool or as concurrent API requests.
+
+The chunk transcripts are stitched back together on the recording's timeline:
+segment timestamps are shifted by the chunk offset, and a segment from the
+overlap is kept only by the chunk whose own range contains its midpoint, so
+words near a cut are neither lost nor repeated. Chunks with no speech at all
+are skipped (Whisper tends to invent text for silence).
+
+Recordings shorter than one chunk, and all recordings when ffmpeg is not
+installed, are transcribed as a single file as before.
+"""
+import shutil
+import subprocess
+import tempfile
+import wave
+from collections import Counter
+from concurrent.futures import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from .transcription import get_transcriber
+
+SAMPLE_RATE = 16000  # What Whisper resamples everything to
+FRAME_SECONDS = 0.03  # VAD frame length
+MIN_SILENCE_SECONDS = 0.3  # Shorter pauses are not considered as cut points
+SILENCE_MARGIN_DB = 10.0  # Frames within this much of the noise floor count as silence
+SILENCE_CEILING_DB = -60.0  # Frames quieter than this always count as silence
+
+Span = Tuple[float, float]
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Duration in seconds from ffprobe, or None when it cannot tell"""
+    if not shutil.which("ffprobe"):
+        return None
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def decode_audio(path: str) -> np.ndarray:
+    """Decode any format ffmpeg reads to 16 kHz mono 16-bit samples"""
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-i", path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise ValueError(f"Could not decode audio: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def frame_energy(samples: np.ndarray, block_frames: int = 10000) -> np.ndarray:
+    """Energy of every VAD frame in dBFS, computed a block at a time to bound memory"""
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    num_frames = len(samples) // frame
+    energy = np.empty(num_frames, dtype=np.float32)
+    for first in range(0, num_frames, block_frames):
+        last = min(first + block_frames, num_frames)
+        block = samples[first * frame:last * frame].reshape(-1, frame).astype(np.float32) / 32768.0
+        energy[first:last] = 10 * np.log10(np.mean(block * block, axis=1) + 1e-10)
+    return energy
+
+
+def voiced_frames(energy: np.ndarray) -> np.ndarray:
+    """Boolean mask of frames above the silence threshold"""
+    if not len(energy):
+        return np.zeros(0, dtype=bool)
+    floor, peak = (float(level) for level in np.percentile(energy, [5, 95]))
+    # Halfway to the speech level when the recording has little dynamic range
+    threshold = max(min(floor + SILENCE_MARGIN_DB, (floor + peak) / 2), SILENCE_CEILING_DB)
+    return energy > threshold
+
+
+def find_silences(voiced: np.ndarray) -> List[Span]:
+    """Pauses of at least MIN_SILENCE_SECONDS as (start, end) in seconds"""
+    # Edges of silent runs: +1 where silence starts, -1 where it ends
+    edges = np.diff(np.concatenate(([0], (~voiced).astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    min_frames = MIN_SILENCE_SECONDS / FRAME_SECONDS
+    return [
+        (float(start * FRAME_SECONDS), float(end * FRAME_SECONDS))
+        for start, end in zip(starts, ends) if end - start >= min_frames
+    ]
+
+
+def plan_chunks(duration: float, silences: List[Span], chunk_seconds: float) -> List[Span]:
+    """Cut points at the longest pause in the second half of every chunk-length window"""
+    spans = []
+    start = 0.0
+    while duration - start > chunk_seconds:
+        low, high = start + chunk_seconds / 2, start + chunk_seconds
+        candidates = [s for s in silences if low <= (s[0] + s[1]) / 2 <= high]
+        if candidates:
+            silence = max(candidates, key=lambda s: s[1] - s[0])
+            cut = (silence[0] + silence[1]) / 2
+        else:
+            cut = high  # No pause: a hard cut, the overlap covers the broken word
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, duration))
+    return spans
+
+
+def write_wav(path: str, samples: np.ndarray):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def stitch(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Segments of all chunks on the recording's timeline, without overlap duplicates"""
+    segments = []
+    for chunk in chunks:
+        start, end = chunk["span"]
+        offset = chunk["offset"]
+        result = chunk["result"]
+        chunk_segments = result.get("segments") or (
+            [{"start": start - offset, "end": end - offset, "text": result["text"]}]
+            if result.get("text") else []
+        )
+        for segment in chunk_segments:
+            segment_start, segment_end = segment["start"] + offset, segment["end"] + offset
+            if start <= (segment_start + segment_end) / 2 < end and segment["text"].strip():
+                segments.append({
+                    "start": round(segment_start, 2),
+                    "end": round(min(segment_end, chunk["audio_end"]), 2),
+                    "text": segment["text"].strip(),
+                })
+    return segments
+
+
+def transcribe_recording(
+    path: str,
+    transcriber=None,
+    chunk_seconds: Optional[float] = None,
+    overlap: Optional[float] = None,
+    language: Optional[str] = None
+) -> Dict[str, Any]:
+    """Transcribe a recording, in parallel chunks when it is longer than one chunk"""
+    transcriber = transcriber or get_transcriber()
+    chunk_seconds = settings.transcription_chunk_seconds if chunk_seconds is None else chunk_seconds
+    overlap = settings.transcription_chunk_overlap if overlap is None else overlap
+
+    if not chunk_seconds or not shutil.which("ffmpeg"):
+        return {**transcriber.transcribe(path, language), "chunks": 1}
+    duration = probe_duration(path)
+    if duration is not None and duration <= chunk_seconds:
+        return {**transcriber.transcribe(path, language), "chunks": 1}
+
+    samples = decode_audio(path)
+    duration = len(samples) / SAMPLE_RATE
+    if duration <= chunk_seconds:
+        return {**transcriber.transcribe(path, language), "chunks": 1}
+
+    voiced = voiced_frames(frame_energy(samples))
+    spans = plan_chunks(duration, find_silences(voiced), chunk_seconds)
+
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as workdir:
+        chunks, futures = [], []
+        try:
+            for index, (start, end) in enumerate(spans):
+                if not voiced[int(start / FRAME_SECONDS):int(end / FRAME_SECONDS)].any():
+                    continue
+                audio_start, audio_end = max(start - overlap, 0.0), min(end + overlap, duration)
+                chunk_path = f"{workdir}/chunk_{index:04d}.wav"
+                write_wav(chunk_path, samples[int(audio_start * SAMPLE_RATE):int(audio_end * SAMPLE_RATE)])
+                chunks.append({"span": (start, end), "offset": audio_start, "audio_end": audio_end})
+                futures.append(transcriber.submit(chunk_path, language))
+
+            for chunk, future in zip(chunks, futures):
+                chunk["result"] = future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            # Chunks already running cannot be cancelled; their files must outlive them
+            wait(futures)
+            raise
+
+    segments = stitch(chunks)
+    languages = Counter(c["result"].get("language") for c in chunks if c["result"].get("language"))
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": languages.most_common(1)[0][0] if languages else language,
+        "duration": duration,
+        "chunks": len(chunks),
+    }
@@ -0,0 +1,274 @@
+"""
+Bulk audio ingestion pipeline
+
+Registers the recordings found in a directory and runs them through
+transcription, extraction and embedding without going through the HTTP API.
+Each stage has its own pool of workers, and the stages are connected by
+bounded queues. A slow stage fills its queue, which stalls the stage before
+it and eventually the directory scan, so memory and the work in flight stay
+bounded however many files are waiting.
+
+Files are stored content-addressed (see ``core/uploads.import_file``), so a
+file is registered once however often it is scanned. All progress lives in
+``audio_recordings``: an interrupted run is resumed by running it again, and
+every recording continues at the first stage it has not finished. Embedding
+leaves no trace in the database, so for an extracted recording the vector
+store is asked which of its linked contacts have no embedding, and those are
+queued for the embed stage again.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import selectinload, undefer_group
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.uploads import AUDIO_EXTENSIONS, import_file
+from ..models import AudioContactLink, AudioRecording, Contact
+from .audio_processing import audio_processing_service
+from .bulk_contacts import contact_embedding_data
+from .vector_store import vector_store
+
+STAGES = ("register", "transcribe", "extract", "embed")
+SETTLE_SECONDS = 5.0  # When watching, files modified more recently may still be being copied
+EMBED_LINGER_SECONDS = 2.0  # How long a partial embedding batch waits for more contacts
+
+
+class AudioIngestPipeline:
+    """Scan (or watch) a directory and process its recordings stage by stage"""
+
+    def __init__(
+        self,
+        directory: str,
+        transcribe_workers: int = 2,
+        extract_workers: int = 2,
+        embed_batch_size: int = 50,
+        queue_size: int = 8,
+        extract: bool = True,
+        embed: bool = True,
+        recursive: bool = True,
+        extract_mode: str = "single"
+    ):
+        self.directory = directory
+        self.transcribe_workers = transcribe_workers
+        self.extract_workers = extract_workers
+        self.embed_batch_size = embed_batch_size
+        self.queue_size = queue_size
+        self.extract = extract
+        self.embed = embed and extract
+        self.recursive = recursive
+        self.extract_mode = extract_mode
+        self._seen: Dict[str, Tuple[int, float]] = {}
+        self.stats: Dict[str, Any] = {
+            **{stage: 0 for stage in STAGES},
+            "failed": {stage: 0 for stage in STAGES},
+            "already_done": 0,
+            "audio_seconds": 0,
+        }
+
+    def scan(self, min_age: float = 0.0) -> Iterator[str]:
+        """Audio files that are new or changed since the last scan and unmodified for ``min_age`` seconds"""
+        now = time.time()
+        for root, dirs, files in os.walk(self.directory):
+            if not self.recursive:
+                dirs.clear()
+            for name in sorted(files):
+                if not name.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Removed while scanning
+                signature = (stat.st_size, stat.st_mtime)
+                if self._seen.get(path) != signature and now - stat.st_mtime >= min_age:
+                    self._seen[path] = signature
+                    yield path
+
+    async def run(self, watch_interval: Optional[float] = None) -> Dict[str, Any]:
+        """Process every file once, or keep watching for new files when ``watch_interval`` is set"""
+        self._transcribe_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._extract_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._embed_queue: asyncio.Queue = asyncio.Queue(self.embed_batch_size * 2)
+        workers = [asyncio.create_task(self._transcribe_worker()) for _ in range(self.transcribe_workers)]
+        if self.extract:
+            workers += [asyncio.create_task(self._extract_worker()) for _ in range(self.extract_workers)]
+        if self.embed:
+            workers.append(asyncio.create_task(self._embed_worker()))
+
+        started = time.perf_counter()
+        try:
+            while True:
+                for path in self.scan(0.0 if watch_interval is None else SETTLE_SECONDS):
+                    await self._register(path)
+                if watch_interval is None:
+                    break
+                await asyncio.sleep(watch_interval)
+
+            # Drain the stages in order
+            await self._transcribe_queue.join()
+            await self._extract_queue.join()
+            await self._embed_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.stats["elapsed_seconds"] = time.perf_counter() - started
+        return self.stats
+
+    async def _register(self, path: str):
+        try:
+            audio_id, stage, contact_ids = await asyncio.to_thread(self._register_file, path)
+        except Exception as e:
+            self._failed("register", path, e)
+            return
+        if stage == "transcribe":
+            await self._transcribe_queue.put(audio_id)
+        elif stage == "extract" and self.extract:
+            await self._extract_queue.put(audio_id)
+        elif stage == "embed" and self.embed:
+            for contact_id in contact_ids:
+                await self._embed_queue.put(contact_id)
+        else:
+            self.stats["already_done"] += 1
+
+    def _register_file(self, path: str) -> Tuple[int, Optional[str], List[int]]:
+        """Store and register a file; returns its recording, the first stage it still needs
+        and, for the embed stage, the contacts still to embed"""
+        stored = import_file(path, settings.upload_dir)
+        db = SessionLocal()
+        try:
+            audio_record = db.query(AudioRecording).options(undefer_group("large_text")).filter(
+                AudioRecording.content_hash == stored["sha256"]
+            ).order_by(AudioRecording.id).first()
+            if audio_record is not None and audio_record.file_path != stored["path"] and not stored["existing"]:
+                os.remove(stored["path"])  # The recording's file was transcoded; keep only that
+            if audio_record is None:
+                audio_record = AudioRecording(
+                    file_path=stored["path"],
+                    file_name=os.path.basename(path),
+                    file_size=stored["size"],
+                    content_hash=stored["sha256"]
+                )
+                db.add(audio_record)
+                db.commit()
+                self.stats["register"] += 1
+                print(f"Registered {path} as recording {audio_record.id}")
+
+            if audio_record.transcript is None:
+                return audio_record.id, "transcribe", []
+            if audio_record.extraction_result is None:
+                return audio_record.id, "extract", []
+            if self.embed:
+                # An earlier run may have stopped between extraction and embedding
+                linked = [row.contact_id for row in db.query(AudioContactLink.contact_id)
+                          .join(Contact, Contact.id == AudioContactLink.contact_id)
+                          .filter(AudioContactLink.audio_recording_id == audio_record.id,
+                                  Contact.archived_at.is_(None))]
+                missing = vector_store.missing_contact_embeddings(linked)
+                if missing:
+                    return audio_record.id, "embed", missing
+            return audio_record.id, None, []
+        finally:
+            db.close()
+
+    async def _transcribe_worker(self):
+        while True:
+            audio_id = await self._transcribe_queue.get()
+            try:
+                seconds = await asyncio.to_thread(self._transcribe, audio_id)
+                self.stats["transcribe"] += 1
+                self.stats["audio_seconds"] += seconds or 0
+                if self.extract:
+                    await self._extract_queue.put(audio_id)
+            except Exception as e:
+                self._failed("transcribe", audio_id, e)
+            finally:
+                self._transcribe_queue.task_done()
+
+    def _transcribe(self, audio_id: int) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            audio_record = audio_processing_service.get_recording(db, audio_id)
+            audio_processing_service.transcribe(db, audio_record)
+            return audio_record.duration_seconds
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _extract_worker(self):
+        while True:
+            audio_id = await self._extract_queue.get()
+            try:
+                contact_ids = await asyncio.to_thread(self._extract, audio_id)
+                self.stats["extract"] += 1
+                if self.embed:
+                    for contact_id in contact_ids:
+                        await self._embed_queue.put(contact_id)
+            except Exception as e:
+                self._failed("extract", audio_id, e)
+            finally:
+                self._extract_queue.task_done()
+
+    def _extract(self, audio_id: int) -> List[int]:
+        """Extract a recording; returns the contacts it created, which still need embedding"""
+        db = SessionLocal()
+        try:
+            audio_record = audio_processing_service.get_recording(db, audio_id)
+            if self.extract_mode == "people":
+                extraction = audio_processing_service.extract_people(db, audio_record, embed=False)
+            else:
+                extraction = audio_processing_service.extract(db, audio_record, embed=False)
+            return extraction["created_contact_ids"]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _embed_worker(self):
+        """Embed new contacts in batches of up to ``embed_batch_size``"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._embed_queue.get()]
+            deadline = loop.time() + EMBED_LINGER_SECONDS
+            while len(batch) < self.embed_batch_size and loop.time() < deadline:
+                try:
+                    batch.append(await asyncio.wait_for(self._embed_queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                outcome = await asyncio.to_thread(self._embed, batch)
+                for contact_id, error in outcome.items():
+                    if error:
+                        self._failed("embed", contact_id, error)
+                    else:
+                        self.stats["embed"] += 1
+            except Exception as e:
+                for contact_id in batch:
+                    self._failed("embed", contact_id, e)
+            finally:
+                for _ in batch:
+                    self._embed_queue.task_done()
+
+    def _embed(self, contact_ids: List[int]) -> Dict[int, Optional[str]]:
+        db = SessionLocal()
+        try:
+            contacts = db.query(Contact)\
+                .options(undefer_group("large_text"), selectinload(Contact.interests), selectinload(Contact.skills))\
+                .filter(Contact.id.in_(contact_ids))\
+                .all()
+            return vector_store.add_contact_embeddings(
+                [(contact.id, contact_embedding_data(contact)) for contact in contacts],
+                batch_size=self.embed_batch_size
+            )
+        finally:
+            db.close()
+
+    def _failed(self, stage: str, item: Any, error: Any):
+        self.stats["failed"][stage] += 1
+        print(f"{stage.capitalize()} failed for {item}: {error}")
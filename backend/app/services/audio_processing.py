@@ -0,0 +1,436 @@
+"""
+Audio processing service
+
+Transcribes recordings with Whisper (hosted or local, see ``transcription.py``;
+long recordings in parallel chunks, see ``audio_chunking.py``) and extracts
+contact data from the transcripts with GPT. The same code serves the
+synchronous endpoints and the queued ``audio_*`` jobs run by the worker pool.
+
+Transcripts are stored compressed with their timestamped segments in separate
+tables (see ``transcripts.py``) and indexed for passage search (see
+``transcript_index.py``).
+
+Uploads are keyed by the SHA-256 of their bytes. A recording whose content was
+already transcribed copies that transcript instead of calling Whisper again,
+extractions are cached by transcript and prompt (see ``extraction_cache.py``),
+and ``dedupe_report`` adds up what this saved.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import openai
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
+
+from ..core.config import settings
+from ..models import AudioContactLink, AudioRecording, Contact, ContactInterest, ContactSkill, Job
+from .bulk_contacts import contact_embedding_data
+from .extraction_cache import extraction_cache, prompt_hash, transcript_hash
+from .audio_chunking import transcribe_recording
+from .taxonomy import taxonomy_service
+from .transcript_index import transcript_index
+from .transcripts import has_transcript, transcript_store
+from .vector_store import vector_store
+
+EXTRACTION_MODEL = "gpt-4"
+EXTRACTION_TEMPERATURE = 0.1
+EXTRACTION_SYSTEM_PROMPT = "You are an expert at extracting structured contact information from conversations. Always return valid JSON."
+EXTRACTION_PROMPT = """
+        Extract contact information from this conversation transcript and return it as JSON:
+
+        Transcript: "{transcription}"
+
+        Extract the following information if available:
+        - first_name: string
+        - last_name: string
+        - email: string
+        - phone: string
+        - job_title: string
+        - company: string
+        - location: string (city, state/country)
+        - age: integer
+        - has_pets: boolean
+        - business_needs: string (what they need help with)
+        - personal_notes: string (interesting personal details)
+        - interests: array of objects with "interest_category" and "interest_value"
+        - skills: array of objects with "skill_name", "skill_level", and "years_experience"
+
+        Return only valid JSON without any additional text or formatting.
+        """
+
+PEOPLE_EXTRACTION_PROMPT = """
+        This conversation transcript may involve several people. Extract every person who speaks
+        or is described, and return JSON of the form {{"people": [...]}} with one object per person:
+
+        Transcript: "{transcription}"
+
+        Extract the following information for each person if available:
+        - speaker: string (how the transcript identifies them, e.g. their name or "Speaker 2")
+        - first_name: string
+        - last_name: string
+        - email: string
+        - phone: string
+        - job_title: string
+        - company: string
+        - location: string (city, state/country)
+        - age: integer
+        - has_pets: boolean
+        - business_needs: string (what they need help with)
+        - personal_notes: string (interesting personal details)
+        - interests: array of objects with "interest_category" and "interest_value"
+        - skills: array of objects with "skill_name", "skill_level", and "years_experience"
+
+        List each person once. Return only valid JSON without any additional text or formatting.
+        """
+
+# Change whenever anything that shapes the extraction output changes
+EXTRACTION_PROMPT_HASH = prompt_hash(
+    EXTRACTION_MODEL, EXTRACTION_TEMPERATURE, EXTRACTION_SYSTEM_PROMPT, EXTRACTION_PROMPT
+)
+PEOPLE_EXTRACTION_PROMPT_HASH = prompt_hash(
+    EXTRACTION_MODEL, EXTRACTION_TEMPERATURE, EXTRACTION_SYSTEM_PROMPT, PEOPLE_EXTRACTION_PROMPT
+)
+EXTRACTION_PROMPT_HASHES = {"single": EXTRACTION_PROMPT_HASH, "people": PEOPLE_EXTRACTION_PROMPT_HASH}
+
+
+def parse_model_json(content: str) -> Dict[str, Any]:
+    """Parse a JSON reply, tolerating a Markdown code fence around it"""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        content = content.strip()
+        if content.startswith('```json'):
+            content = content[7:]
+        if content.endswith('```'):
+            content = content[:-3]
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            # Model output varies between calls, so this is worth a retry
+            raise RuntimeError(f"Model returned invalid JSON: {e}")
+
+
+class AudioProcessingService:
+    """Service for transcribing recordings and extracting contacts from them"""
+
+    def get_recording(self, db: Session, audio_id: int) -> AudioRecording:
+        audio_record = db.query(AudioRecording).filter(AudioRecording.id == audio_id).first()
+        if not audio_record:
+            raise LookupError("Audio record not found")
+        return audio_record
+
+    def find_original(self, db: Session, content_hash: str) -> Optional[AudioRecording]:
+        """The first recording uploaded with these bytes"""
+        return db.query(AudioRecording).filter(
+            AudioRecording.content_hash == content_hash,
+            AudioRecording.duplicate_of_id.is_(None)
+        ).order_by(AudioRecording.id).first()
+
+    def find_processed_copy(self, db: Session, audio_record: AudioRecording, condition) -> Optional[AudioRecording]:
+        """Another recording with the same content for which ``condition`` holds"""
+        if not audio_record.content_hash:
+            return None
+        return db.query(AudioRecording).options(undefer_group("large_text")).filter(
+            AudioRecording.content_hash == audio_record.content_hash,
+            AudioRecording.id != audio_record.id,
+            condition
+        ).order_by(AudioRecording.id).first()
+
+    def _client(self) -> openai.OpenAI:
+        if not settings.openai_api_key:
+            raise RuntimeError("OpenAI API key not configured")
+        return openai.OpenAI(api_key=settings.openai_api_key)
+
+    def transcribe(self, db: Session, audio_record: AudioRecording) -> str:
+        """Transcribe a recording with the configured backend and store the transcript
+
+        Long recordings are split at pauses and their chunks transcribed in parallel.
+        """
+        source = self.find_processed_copy(db, audio_record, has_transcript())
+        if source:
+            transcript_store.copy(db, audio_record, source)
+            audio_record.duration_seconds = audio_record.duration_seconds or source.duration_seconds
+            audio_record.transcription_reused = True
+        else:
+            if not os.path.exists(audio_record.file_path):
+                raise LookupError("Audio file not found")
+
+            transcript = transcribe_recording(audio_record.file_path)
+
+            transcript_store.save(
+                db, audio_record, transcript["text"], transcript.get("segments"), transcript.get("language")
+            )
+            if transcript.get("duration") and not audio_record.duration_seconds:
+                audio_record.duration_seconds = round(transcript["duration"])
+            audio_record.transcription_reused = False
+        audio_record.processed_at = datetime.now()
+        db.commit()
+
+        # Passages for transcript search; index_transcripts.py retries any that fail here
+        if vector_store.openai_client:
+            try:
+                transcript_index.index(audio_record)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Error indexing transcript of recording {audio_record.id}: {e}")
+        return audio_record.transcription
+
+    def extract(self, db: Session, audio_record: AudioRecording, embed: bool = True) -> Dict[str, Any]:
+        """Extract contact data from a transcript; creates and links a contact when a name is found
+
+        With ``embed=False`` a new contact is not added to the vector store, for
+        callers that embed contacts in batches.
+        """
+        if not audio_record.transcription:
+            raise ValueError("Audio must be transcribed first")
+
+        # Same recording as one already linked: same person, so link that contact
+        source = self.find_processed_copy(db, audio_record, AudioRecording.contact_id.isnot(None))
+        if source:
+            audio_record.contact_id = audio_record.contact_id or source.contact_id
+
+        extracted_data = self._run_extraction(db, audio_record, EXTRACTION_PROMPT, EXTRACTION_PROMPT_HASH)
+
+        # Create or update contact if we have enough information
+        contact = None
+        created = False
+        if extracted_data.get('first_name'):
+            # Check if contact already linked to this audio
+            if audio_record.contact_id:
+                contact = db.query(Contact).filter(Contact.id == audio_record.contact_id).first()
+
+            if not contact:
+                contact = self._create_contact(db, extracted_data)
+                created = True
+
+                # Link audio to contact
+                audio_record.contact_id = contact.id
+            self._link_contact(db, audio_record, contact.id)
+
+            db.commit()
+            db.refresh(contact)
+
+            # Add to vector store
+            if created and embed:
+                vector_store.add_contact_embedding(contact.id, contact_embedding_data(contact))
+        db.commit()
+
+        return {
+            "extracted_data": extracted_data,
+            "contact_id": contact.id if contact else None,
+            "created_contact_ids": [contact.id] if created else [],
+            "reused": audio_record.extraction_reused
+        }
+
+    def extract_people(self, db: Session, audio_record: AudioRecording, embed: bool = True) -> Dict[str, Any]:
+        """Extract every person in a transcript with one model call and link them all
+
+        People are matched to existing contacts by email, or by first and last
+        name, and the rest are created. All contacts and links are written in
+        one transaction, and the new contacts embedded in one batched request.
+        """
+        if not audio_record.transcription:
+            raise ValueError("Audio must be transcribed first")
+
+        extracted_data = self._run_extraction(db, audio_record, PEOPLE_EXTRACTION_PROMPT, PEOPLE_EXTRACTION_PROMPT_HASH)
+        people = [
+            person for person in (extracted_data.get("people") or [])
+            if isinstance(person, dict) and person.get("first_name")
+        ]
+
+        results, created_contacts = [], []
+        try:
+            for person in people:
+                contact = self._match_linked_contact(audio_record, person) or self._match_contact(db, person)
+                if contact is None:
+                    contact = self._create_contact(db, person)
+                    created_contacts.append(contact)
+                self._link_contact(db, audio_record, contact.id, person.get("speaker"))
+                results.append({
+                    "speaker": person.get("speaker"),
+                    "contact_id": contact.id,
+                    "name": f"{contact.first_name} {contact.last_name or ''}".strip(),
+                    "created": contact in created_contacts,
+                })
+            if results and not audio_record.contact_id:
+                audio_record.contact_id = results[0]["contact_id"]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if created_contacts and embed:
+            vector_store.add_contact_embeddings(
+                [(contact.id, contact_embedding_data(contact)) for contact in created_contacts]
+            )
+
+        return {
+            "extracted_data": extracted_data,
+            "people": results,
+            "contact_id": audio_record.contact_id,
+            "created_contact_ids": [contact.id for contact in created_contacts],
+            "reused": audio_record.extraction_reused
+        }
+
+    def _run_extraction(self, db: Session, audio_record: AudioRecording, prompt: str, prompt_key: str) -> Dict[str, Any]:
+        """Run an extraction prompt over the transcript, or take its result from the cache"""
+        transcript_key = transcript_hash(audio_record.transcription)
+        extracted_data = extraction_cache.get(db, transcript_key, prompt_key)
+        audio_record.extraction_reused = extracted_data is not None
+        if extracted_data is None:
+            client = self._client()
+
+            response = client.chat.completions.create(
+                model=EXTRACTION_MODEL,
+                messages=[
+                    {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt.format(transcription=audio_record.transcription)}
+                ],
+                temperature=EXTRACTION_TEMPERATURE
+            )
+            extracted_data = parse_model_json(response.choices[0].message.content)
+            extraction_cache.put(transcript_key, prompt_key, EXTRACTION_MODEL, extracted_data)
+        audio_record.extraction_result = extracted_data
+        audio_record.extraction_prompt_hash = prompt_key
+        return extracted_data
+
+    def _match_linked_contact(self, audio_record: AudioRecording, person: Dict[str, Any]) -> Optional[Contact]:
+        """The contact already linked to this recording for the same speaker or name (re-extraction)"""
+        first_name = person["first_name"].strip().lower()
+        last_name = (person.get("last_name") or "").strip().lower()
+        for link in audio_record.contact_links:
+            if person.get("speaker") and link.speaker == str(person["speaker"])[:100]:
+                return link.contact
+        for link in audio_record.contact_links:
+            contact = link.contact
+            if contact and (contact.first_name or "").lower() == first_name \
+                    and (contact.last_name or "").lower() == last_name:
+                return contact
+        return None
+
+    def _match_contact(self, db: Session, person: Dict[str, Any]) -> Optional[Contact]:
+        """An existing contact that is clearly the same person"""
+        query = db.query(Contact).filter(Contact.archived_at.is_(None))
+        if person.get("email"):
+            contact = query.filter(func.lower(Contact.email) == person["email"].strip().lower()).first()
+            if contact:
+                return contact
+        if person.get("last_name"):
+            return query.filter(
+                func.lower(Contact.first_name) == person["first_name"].strip().lower(),
+                func.lower(Contact.last_name) == person["last_name"].strip().lower()
+            ).first()
+        return None
+
+    def _link_contact(self, db: Session, audio_record: AudioRecording, contact_id: int, speaker: Optional[str] = None):
+        if not any(link.contact_id == contact_id for link in audio_record.contact_links):
+            audio_record.contact_links.append(AudioContactLink(
+                contact_id=contact_id, speaker=str(speaker)[:100] if speaker else None
+            ))
+
+    def _create_contact(self, db: Session, extracted_data: Dict[str, Any]) -> Contact:
+        contact = Contact(
+            first_name=extracted_data.get('first_name', ''),
+            last_name=extracted_data.get('last_name'),
+            email=extracted_data.get('email'),
+            phone=extracted_data.get('phone'),
+            job_title=extracted_data.get('job_title'),
+            company=extracted_data.get('company'),
+            location=extracted_data.get('location'),
+            age=extracted_data.get('age'),
+            has_pets=extracted_data.get('has_pets', False),
+            business_needs=extracted_data.get('business_needs'),
+            personal_notes=extracted_data.get('personal_notes')
+        )
+        db.add(contact)
+        db.flush()
+
+        # Add interests
+        interests = taxonomy_service.normalize_interests(db, [
+            i for i in extracted_data.get('interests', []) if i.get('interest_value')
+        ])
+        for interest_data in interests:
+            db.add(ContactInterest(
+                contact_id=contact.id,
+                interest_id=interest_data['interest_id'],
+                interest_category=interest_data.get('interest_category', 'General'),
+                interest_value=interest_data['interest_value'],
+                confidence_score=0.8  # AI extracted
+            ))
+
+        # Add skills
+        skills = taxonomy_service.normalize_skills(db, [
+            s for s in extracted_data.get('skills', []) if s.get('skill_name')
+        ])
+        for skill_data in skills:
+            db.add(ContactSkill(
+                contact_id=contact.id,
+                skill_id=skill_data['skill_id'],
+                skill_name=skill_data['skill_name'],
+                skill_level=skill_data.get('skill_level'),
+                years_experience=skill_data.get('years_experience')
+            ))
+        return contact
+
+    def dedupe_report(self, db: Session) -> Dict[str, Any]:
+        """Storage and model calls saved by content-hash deduplication"""
+        duplicate = AudioRecording.duplicate_of_id.isnot(None)
+        transcription_reused = AudioRecording.transcription_reused.is_(True)
+        extraction_reused = AudioRecording.extraction_reused.is_(True)
+        row = db.query(
+            func.count(AudioRecording.id),
+            func.count(func.distinct(AudioRecording.content_hash)),
+            func.count(AudioRecording.id).filter(duplicate),
+            func.coalesce(func.sum(AudioRecording.file_size).filter(duplicate), 0),
+            func.count(AudioRecording.id).filter(transcription_reused),
+            func.coalesce(func.sum(AudioRecording.duration_seconds).filter(transcription_reused), 0),
+            func.count(AudioRecording.id).filter(extraction_reused),
+        ).one()
+        recordings, unique_contents, duplicates, bytes_saved, transcriptions, seconds, extractions = row
+        return {
+            "recordings": recordings,
+            "unique_contents": unique_contents,
+            "duplicate_uploads": duplicates,
+            "bytes_saved": bytes_saved,
+            "transcriptions_reused": transcriptions,
+            "audio_seconds_not_transcribed": seconds,
+            "extractions_reused": extractions,
+            "model_calls_saved": transcriptions + extractions,
+        }
+
+
+# Job handlers run by the worker pool; each returns the job result
+
+def handle_transcribe_job(db: Session, job: Job) -> Dict[str, Any]:
+    audio_record = audio_processing_service.get_recording(db, job.params["audio_id"])
+    text = audio_processing_service.transcribe(db, audio_record)
+    return {"audio_id": audio_record.id, "transcription_length": len(text)}
+
+
+def handle_extract_job(db: Session, job: Job) -> Dict[str, Any]:
+    audio_record = audio_processing_service.get_recording(db, job.params["audio_id"])
+    if job.params.get("mode") == "people":
+        return {"audio_id": audio_record.id, **audio_processing_service.extract_people(db, audio_record)}
+    return {"audio_id": audio_record.id, **audio_processing_service.extract(db, audio_record)}
+
+
+def handle_process_job(db: Session, job: Job) -> Dict[str, Any]:
+    """Transcribe (unless a retry finds a transcript already) and then extract"""
+    audio_record = audio_processing_service.get_recording(db, job.params["audio_id"])
+    if not audio_record.transcription:
+        audio_processing_service.transcribe(db, audio_record)
+    return {"audio_id": audio_record.id, **audio_processing_service.extract(db, audio_record)}
+
+
+AUDIO_JOB_HANDLERS = {
+    "audio_transcribe": handle_transcribe_job,
+    "audio_extract": handle_extract_job,
+    "audio_process": handle_process_job,
+}
+
+
+# Global instance
+audio_processing_service = AudioProcessingService()
@@ -0,0 +1,250 @@
+"""
+Audio storage transcoding and tiering
+
+Uploads are kept as they arrived (WAV, FLAC, M4A or MP3), which for speech is
+many times larger than needed once the recording has been transcribed. When
+every recording sharing a file was processed at least
+``settings.transcode_after_days`` ago, the file is converted to mono Opus at
+``settings.transcode_bitrate`` with ffmpeg, and ffprobe must report the same
+duration as the original (within ``settings.transcode_duration_tolerance``)
+before the result is used.
+
+Duplicate uploads share one file, so the switch is made per file rather than
+per recording, in an order that never leaves a recording pointing at a
+missing file: the Opus file is written under a temporary name and renamed
+into place, the original is copied (hard-linked when possible) into
+``settings.audio_archive_dir``, ``file_path`` of every recording sharing the
+file is updated in one transaction, and only then is the original removed
+from the upload directory. A transcode that is not smaller than the original
+is discarded and the file is only marked as done.
+"""
+import os
+import shutil
+import subprocess
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models import AudioRecording, Job
+from .audio_chunking import probe_duration
+from .jobs import job_service
+
+TRANSCODED_EXTENSION = ".opus"
+
+
+def transcode(source: str, target: str, bitrate: Optional[str] = None):
+    """Encode ``source`` as mono Ogg Opus tuned for speech"""
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", source, "-vn", "-ac", "1",
+         "-c:a", "libopus", "-b:a", bitrate or settings.transcode_bitrate, "-application", "voip",
+         "-f", "opus", target],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise ValueError(f"Could not transcode audio: {result.stderr.decode(errors='replace').strip()}")
+
+
+def verify_duration(source: str, target: str) -> float:
+    """The original's duration, once ffprobe confirms the transcoded file has it too"""
+    expected, actual = probe_duration(source), probe_duration(target)
+    if expected is None or actual is None:
+        raise ValueError("Could not read the duration of the original or transcoded file")
+    if abs(expected - actual) > settings.transcode_duration_tolerance:
+        raise ValueError(f"Transcoded file is {actual:.2f}s long, the original {expected:.2f}s")
+    return expected
+
+
+def archive_path(file_path: str) -> str:
+    """Where an original is archived: its place under the upload directory, mirrored"""
+    upload_dir = os.path.abspath(settings.upload_dir)
+    source = os.path.abspath(file_path)
+    if source.startswith(upload_dir + os.sep):
+        relative = os.path.relpath(source, upload_dir)
+    else:
+        relative = os.path.basename(source)
+    return os.path.join(settings.audio_archive_dir, relative)
+
+
+def copy_file(source: str, target: str):
+    """Copy (or hard-link) a file into place atomically"""
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    temp_path = f"{target}.{os.getpid()}.part"
+    try:
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class AudioStorageService:
+    """Transcodes processed recordings and reports the storage they use"""
+
+    def cold_files(self, db: Session, older_than_days: Optional[int] = None, after_id: int = 0):
+        """Files not transcoded yet whose recordings were all processed long enough ago
+
+        Rows are ``(file_path, first_id)``, ordered by ``first_id`` (the oldest
+        recording using the file), which also serves as the job checkpoint.
+        """
+        days = settings.transcode_after_days if older_than_days is None else older_than_days
+        cutoff = datetime.now() - timedelta(days=days)
+        first_id = func.min(AudioRecording.id)
+        return db.query(AudioRecording.file_path, first_id.label("first_id"))\
+            .filter(~AudioRecording.file_path.ilike(f"%{TRANSCODED_EXTENSION}"))\
+            .group_by(AudioRecording.file_path)\
+            .having(func.count(AudioRecording.id) == func.count(AudioRecording.id).filter(
+                AudioRecording.processed_at <= cutoff
+            ))\
+            .having(func.count(AudioRecording.transcoded_at) == 0)\
+            .having(first_id > after_id)\
+            .order_by(first_id)
+
+    def transcode_file(self, db: Session, file_path: str) -> Dict[str, Any]:
+        """Transcode one file and point every recording sharing it at the result"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        original_size = os.path.getsize(file_path)
+        target = os.path.splitext(file_path)[0] + TRANSCODED_EXTENSION
+        temp_path = f"{target}.{os.getpid()}.part"
+        sharing = AudioRecording.file_path == file_path
+        try:
+            transcode(file_path, temp_path)
+            duration = verify_duration(file_path, temp_path)
+            stored_size = os.path.getsize(temp_path)
+            if stored_size >= original_size:
+                os.remove(temp_path)
+                db.query(AudioRecording).filter(sharing).update(
+                    {"transcoded_at": datetime.now(), "stored_size": original_size},
+                    synchronize_session=False
+                )
+                db.commit()
+                return {"file_path": file_path, "kept_original": True,
+                        "original_size": original_size, "stored_size": original_size}
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        archived = archive_path(file_path)
+        try:
+            copy_file(file_path, archived)
+            db.query(AudioRecording).filter(sharing).update({
+                "file_path": target,
+                "original_path": archived,
+                "stored_size": stored_size,
+                "transcoded_at": datetime.now(),
+                "duration_seconds": func.coalesce(AudioRecording.duration_seconds, round(duration)),
+            }, synchronize_session=False)
+            db.commit()
+        except BaseException:
+            db.rollback()
+            for path in (target, archived):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        os.remove(file_path)
+        return {"file_path": target, "kept_original": False,
+                "original_size": original_size, "stored_size": stored_size}
+
+    def run(self, db: Session, job: Job) -> Dict[str, Any]:
+        """Transcode cold files, resuming from the job's checkpoint"""
+        if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+            raise RuntimeError("ffmpeg and ffprobe are required to transcode audio")
+        params = job.params or {}
+        older_than_days = params.get("older_than_days")
+        limit = params.get("limit")
+
+        state = dict(job.result or {})
+        for counter in ("transcoded", "kept_original", "original_bytes", "stored_bytes", "bytes_saved"):
+            state.setdefault(counter, 0)
+        state.setdefault("failed_paths", [])
+        checkpoint = state.get("checkpoint") or 0
+        processed, succeeded, failed = job.processed or 0, job.succeeded or 0, job.failed or 0
+        if job.total is None:
+            job.total = self.cold_files(db, older_than_days).count()
+            if limit:
+                job.total = min(job.total, limit)
+            db.commit()
+
+        while not limit or processed < limit:
+            row = self.cold_files(db, older_than_days, after_id=checkpoint).first()
+            if row is None:
+                break
+            try:
+                result = self.transcode_file(db, row.file_path)
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                state["failed_paths"] = (state["failed_paths"] + [row.file_path])[:100]
+                print(f"Transcoding {row.file_path} failed: {e}")
+            else:
+                succeeded += 1
+                if result["kept_original"]:
+                    state["kept_original"] += 1
+                else:
+                    state["transcoded"] += 1
+                    state["original_bytes"] += result["original_size"]
+                    state["stored_bytes"] += result["stored_size"]
+                    state["bytes_saved"] += result["original_size"] - result["stored_size"]
+
+            processed += 1
+            checkpoint = row.first_id
+            state["checkpoint"] = checkpoint
+            job_service.progress(db, job, processed, succeeded, failed, result=dict(state))
+            job_service.renew_lease(db, job)
+
+        return state
+
+    def report(self, db: Session) -> Dict[str, Any]:
+        """Disk used by recordings, per distinct file, and what transcoding saved"""
+        files = db.query(
+            AudioRecording.file_path,
+            func.count(AudioRecording.id).label("recordings"),
+            func.max(AudioRecording.file_size).label("file_size"),
+            func.max(AudioRecording.stored_size).label("stored_size"),
+            func.max(AudioRecording.original_path).label("original_path"),
+        ).group_by(AudioRecording.file_path).subquery()
+        transcoded = files.c.original_path.isnot(None)
+        row = db.query(
+            func.count(),
+            func.coalesce(func.sum(files.c.recordings), 0),
+            func.coalesce(func.sum(func.coalesce(files.c.stored_size, files.c.file_size)), 0),
+            func.count().filter(transcoded),
+            func.coalesce(func.sum(files.c.file_size).filter(transcoded), 0),
+            func.coalesce(func.sum(files.c.stored_size).filter(transcoded), 0),
+        ).one()
+        file_count, recordings, upload_bytes, transcoded_files, original_bytes, stored_bytes = row
+        return {
+            "recordings": recordings,
+            "files": file_count,
+            "upload_dir_bytes": upload_bytes,
+            "transcoded_files": transcoded_files,
+            "archived_bytes": original_bytes,
+            "transcoded_bytes": stored_bytes,
+            "bytes_saved": original_bytes - stored_bytes,
+            "compression_ratio": round(original_bytes / stored_bytes, 2) if stored_bytes else None,
+            "pending_files": self.cold_files(db).count(),
+            "bitrate": settings.transcode_bitrate,
+            "archive_dir": settings.audio_archive_dir,
+        }
+
+
+def handle_transcode_job(db: Session, job: Job) -> Dict[str, Any]:
+    return audio_storage_service.run(db, job)
+
+
+AUDIO_STORAGE_JOB_HANDLERS = {
+    "audio_transcode": handle_transcode_job,
+}
+
+
+# Global instance
+audio_storage_service = AudioStorageService()
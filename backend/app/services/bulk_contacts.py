@@ -0,0 +1,382 @@
+"""
+Bulk contact upsert service
+
+Loads thousands of contacts per request: every chunk is written in one
+transaction with executemany inserts for contacts, interests and skills
+(interest and skill terms are resolved once per chunk), and the vector store
+is fed in batched embedding requests instead of one call per contact.
+
+Bulk delete, archive and restore work the same way: IDs are processed in
+chunked transactions and their vectors removed or re-added in batches.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session, selectinload, undefer_group
+
+from ..core.database import SessionLocal
+from ..models import (
+    AudioContactLink, AudioRecording, Contact, ContactInterest, ContactSkill, DuplicateSuggestion, EventParticipation
+)
+from .jobs import job_service
+from .search_index import search_index
+from .taxonomy import taxonomy_service
+from .vector_store import vector_store
+
+CONTACT_FIELDS = [
+    "first_name", "last_name", "email", "phone", "job_title", "company",
+    "location", "age", "has_pets", "business_needs", "personal_notes",
+]
+
+REMOVE_ACTIONS = ("delete", "archive", "restore")
+MAX_REPORTED_ERRORS = 100
+
+
+def contact_embedding_data(contact: Contact) -> Dict[str, Any]:
+    """Build the dict passed to the vector store for a contact"""
+    return {
+        "first_name": contact.first_name,
+        "last_name": contact.last_name,
+        "job_title": contact.job_title,
+        "company": contact.company,
+        "location": contact.location,
+        "business_needs": contact.business_needs,
+        "personal_notes": contact.personal_notes,
+        "interests": [{"interest_value": i.interest_value} for i in contact.interests],
+        "skills": [{"skill_name": s.skill_name} for s in contact.skills]
+    }
+
+
+class BulkContactService:
+    """Service for creating and updating contacts in batches"""
+
+    def upsert(
+        self,
+        db: Session,
+        items: List[Optional[Dict[str, Any]]],
+        chunk_size: int = 500,
+        embed: bool = True,
+        embedding_batch_size: int = 100
+    ) -> Dict[str, Any]:
+        """Create or update contacts, matching existing ones by email (case-insensitive).
+
+        ``items`` are validated contact dicts (``ContactCreate.dict(exclude_unset=True)``);
+        ``None`` marks an item that failed validation and is reported as such by the caller.
+        Only the fields present on an item overwrite an existing contact, and interests or
+        skills are replaced only when the item carries them.
+        """
+        start = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        seen_emails = set()
+
+        pending = []
+        for index, item in enumerate(items):
+            if item is None:
+                continue
+            email_key = (item.get("email") or "").strip().lower()
+            if email_key and email_key in seen_emails:
+                results[index] = {
+                    "index": index,
+                    "status": "error",
+                    "contact_id": None,
+                    "error": f"Duplicate email in request: {item['email']}"
+                }
+                continue
+            if email_key:
+                seen_emails.add(email_key)
+            pending.append((index, item, email_key))
+
+        for offset in range(0, len(pending), chunk_size):
+            chunk = pending[offset:offset + chunk_size]
+            try:
+                chunk_results = self._write_chunk(db, chunk)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Bulk upsert chunk failed: {e}")
+                chunk_results = [
+                    {"index": index, "status": "error", "contact_id": None, "error": str(e)}
+                    for index, _, _ in chunk
+                ]
+
+            for result in chunk_results:
+                results[result["index"]] = result
+
+            if embed:
+                self._embed_chunk(db, chunk_results, embedding_batch_size)
+
+        elapsed = time.perf_counter() - start
+        written = [r for r in results if r and r["status"] in ("created", "updated")]
+        return {
+            "results": results,
+            "created": sum(1 for r in written if r["status"] == "created"),
+            "updated": sum(1 for r in written if r["status"] == "updated"),
+            "failed": sum(1 for r in results if r and r["status"] == "error"),
+            "elapsed_seconds": round(elapsed, 3),
+            "contacts_per_second": round(len(written) / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    def _write_chunk(self, db: Session, chunk) -> List[Dict[str, Any]]:
+        """Insert or update one chunk of contacts and their interests and skills"""
+        emails = [email_key for _, _, email_key in chunk if email_key]
+        existing = {}
+        if emails:
+            existing = dict(
+                db.query(func.lower(Contact.email), Contact.id)
+                .filter(func.lower(Contact.email).in_(emails))
+                .order_by(Contact.id.desc())
+                .all()
+            )
+
+        new_items = [(index, item) for index, item, email_key in chunk if email_key not in existing]
+        updated_items = [(index, item, existing[email_key]) for index, item, email_key in chunk if email_key in existing]
+
+        contact_ids = {}
+        if new_items:
+            rows = []
+            for _, item in new_items:
+                row = {field: item.get(field) for field in CONTACT_FIELDS}
+                if row["has_pets"] is None:
+                    row["has_pets"] = False
+                rows.append(row)
+            inserted = db.scalars(
+                insert(Contact).returning(Contact.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            for (index, _), contact_id in zip(new_items, inserted):
+                contact_ids[index] = contact_id
+
+        replace_interests, replace_skills = [], []
+        if updated_items:
+            # Group by the set of fields sent so every executemany batch has one shape
+            by_fields: Dict[tuple, List[Dict[str, Any]]] = {}
+            for index, item, contact_id in updated_items:
+                contact_ids[index] = contact_id
+                fields = {field: item[field] for field in CONTACT_FIELDS if field in item}
+                by_fields.setdefault(tuple(sorted(fields)), []).append({"id": contact_id, **fields})
+                if "interests" in item:
+                    replace_interests.append(contact_id)
+                if "skills" in item:
+                    replace_skills.append(contact_id)
+            for rows in by_fields.values():
+                db.execute(update(Contact), rows)
+
+            if replace_interests:
+                db.execute(delete(ContactInterest).where(ContactInterest.contact_id.in_(replace_interests)))
+            if replace_skills:
+                db.execute(delete(ContactSkill).where(ContactSkill.contact_id.in_(replace_skills)))
+
+        # Resolve every interest and skill in the chunk against the taxonomy at once
+        interests = taxonomy_service.normalize_interests(db, [
+            {**interest, "contact_id": contact_ids[index]}
+            for index, item, _ in chunk
+            for interest in item.get("interests") or []
+        ])
+        skills = taxonomy_service.normalize_skills(db, [
+            {**skill, "contact_id": contact_ids[index]}
+            for index, item, _ in chunk
+            for skill in item.get("skills") or []
+        ])
+
+        if interests:
+            db.execute(insert(ContactInterest), [
+                {
+                    "contact_id": i["contact_id"],
+                    "interest_id": i["interest_id"],
+                    "interest_category": i.get("interest_category"),
+                    "interest_value": i["interest_value"],
+                    "confidence_score": i.get("confidence_score"),
+                } for i in interests
+            ])
+        if skills:
+            db.execute(insert(ContactSkill), [
+                {
+                    "contact_id": s["contact_id"],
+                    "skill_id": s["skill_id"],
+                    "skill_name": s["skill_name"],
+                    "skill_level": s.get("skill_level"),
+                    "years_experience": s.get("years_experience"),
+                } for s in skills
+            ])
+
+        updated_indexes = {index for index, _, _ in updated_items}
+        return [
+            {
+                "index": index,
+                "status": "updated" if index in updated_indexes else "created",
+                "contact_id": contact_ids[index],
+                "error": None
+            } for index, _, _ in chunk
+        ]
+
+    def _embed_chunk(self, db: Session, chunk_results: List[Dict[str, Any]], batch_size: int):
+        """Embed the contacts written by a chunk; failures are reported per item
+
+        Archived contacts are left out of the vector store, so they are skipped.
+        """
+        by_id = {r["contact_id"]: r for r in chunk_results if r["contact_id"] is not None}
+        if not by_id:
+            return
+
+        contacts = db.query(Contact)\
+            .options(undefer_group("large_text"), selectinload(Contact.interests), selectinload(Contact.skills))\
+            .filter(Contact.id.in_(by_id.keys()), Contact.archived_at.is_(None))\
+            .all()
+        outcome = vector_store.add_contact_embeddings(
+            [(contact.id, contact_embedding_data(contact)) for contact in contacts],
+            batch_size=batch_size
+        )
+        for contact_id, error in outcome.items():
+            by_id[contact_id]["embedding_error"] = error
+        db.expunge_all()
+
+    def match_ids(
+        self,
+        db: Session,
+        contact_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[int]:
+        """IDs of the contacts selected by an ID list and/or a filter, in ID order.
+
+        Supported filters: ``search`` (substring over names, email, job, company and
+        location), ``company`` and ``location`` (exact, case-insensitive),
+        ``created_before``/``created_after`` and ``archived`` (true/false).
+        """
+        query = db.query(Contact.id)
+        if contact_ids is not None:
+            query = query.filter(Contact.id.in_(contact_ids))
+        filters = filters or {}
+        if filters.get("search"):
+            query = query.filter(search_index.contains(Contact, [
+                "first_name", "last_name", "email", "job_title", "company", "location"
+            ], filters["search"]))
+        if filters.get("company"):
+            query = query.filter(func.lower(Contact.company) == filters["company"].lower())
+        if filters.get("location"):
+            query = query.filter(func.lower(Contact.location) == filters["location"].lower())
+        if filters.get("created_before"):
+            query = query.filter(Contact.created_at < filters["created_before"])
+        if filters.get("created_after"):
+            query = query.filter(Contact.created_at >= filters["created_after"])
+        if filters.get("archived") is not None:
+            archived = Contact.archived_at.isnot(None)
+            query = query.filter(archived if filters["archived"] else ~archived)
+        return list(db.scalars(query.order_by(Contact.id).statement))
+
+    def remove(
+        self,
+        db: Session,
+        contact_ids: List[int],
+        action: str = "delete",
+        chunk_size: int = 500,
+        job_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Delete, archive or restore contacts, one transaction per chunk.
+
+        Deleting removes interests, skills, event participations, audio links and
+        duplicate suggestions with the contacts and detaches their audio recordings.
+        Archiving only stamps ``archived_at`` (related rows are kept so the
+        contact can be restored). Deleted and archived contacts leave the
+        vector store; restored ones are re-embedded. IDs that no longer exist,
+        or are already in the requested state, count as skipped, so repeating
+        a request is harmless. With ``job_id`` progress is recorded on the job.
+        """
+        if action not in REMOVE_ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+
+        start = time.perf_counter()
+        job = None
+        if job_id is not None:
+            job = job_service.get(db, job_id)
+            job_service.start(db, job, total=len(contact_ids))
+
+        stats = {"action": action, "matched": len(contact_ids), "affected": 0, "skipped": 0, "vector_errors": []}
+        processed = 0
+        try:
+            for offset in range(0, len(contact_ids), chunk_size):
+                chunk = contact_ids[offset:offset + chunk_size]
+                affected = self._remove_chunk(db, chunk, action)
+                db.commit()
+
+                # ChromaDB cannot join the SQL transaction, so it is synced per committed chunk
+                if action == "restore":
+                    errors = self._restore_embeddings(db, affected)
+                else:
+                    errors = vector_store.delete_contact_embeddings(affected)
+                stats["vector_errors"].extend(errors[:max(MAX_REPORTED_ERRORS - len(stats["vector_errors"]), 0)])
+
+                processed += len(chunk)
+                stats["affected"] += len(affected)
+                stats["skipped"] += len(chunk) - len(affected)
+                if job is not None:
+                    job = job_service.get(db, job_id)
+                    job_service.progress(db, job, processed, stats["affected"], 0, result=stats)
+
+            stats["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+            if job is not None:
+                job_service.complete(db, job_service.get(db, job_id), result=stats)
+            return stats
+
+        except Exception as e:
+            print(f"Bulk contact {action} failed: {e}")
+            db.rollback()
+            if job is not None:
+                job = job_service.get(db, job_id)
+                job.result = stats
+                job_service.fail(db, job, str(e))
+            raise
+
+    def _remove_chunk(self, db: Session, chunk: List[int], action: str) -> List[int]:
+        """Apply ``action`` to one chunk; returns the IDs actually changed"""
+        query = select(Contact.id).where(Contact.id.in_(chunk))
+        if action == "archive":
+            query = query.where(Contact.archived_at.is_(None))
+        elif action == "restore":
+            query = query.where(Contact.archived_at.isnot(None))
+        ids = list(db.scalars(query))
+        if not ids:
+            return ids
+
+        if action == "archive":
+            db.execute(update(Contact).where(Contact.id.in_(ids)).values(archived_at=func.now()))
+        elif action == "restore":
+            db.execute(update(Contact).where(Contact.id.in_(ids)).values(archived_at=None))
+        else:
+            for model in (ContactInterest, ContactSkill, EventParticipation, AudioContactLink):
+                db.execute(delete(model).where(model.contact_id.in_(ids)))
+            db.execute(delete(DuplicateSuggestion).where(or_(
+                DuplicateSuggestion.contact_id.in_(ids),
+                DuplicateSuggestion.duplicate_contact_id.in_(ids)
+            )))
+            db.execute(update(AudioRecording).where(AudioRecording.contact_id.in_(ids)).values(contact_id=None))
+            db.execute(delete(Contact).where(Contact.id.in_(ids)))
+        return ids
+
+    def _restore_embeddings(self, db: Session, contact_ids: List[int]) -> List[str]:
+        if not contact_ids or not vector_store.openai_client:
+            return []
+        contacts = db.query(Contact)\
+            .options(undefer_group("large_text"), selectinload(Contact.interests), selectinload(Contact.skills))\
+            .filter(Contact.id.in_(contact_ids))\
+            .all()
+        outcome = vector_store.add_contact_embeddings(
+            [(contact.id, contact_embedding_data(contact)) for contact in contacts]
+        )
+        db.expunge_all()
+        return [f"{contact_id}: {error}" for contact_id, error in outcome.items() if error]
+
+
+def run_bulk_remove_job(job_id: int, contact_ids: List[int], action: str, chunk_size: int = 500):
+    """Run a bulk delete/archive/restore with its own session (used as a FastAPI background task)"""
+    db = SessionLocal()
+    try:
+        bulk_contact_service.remove(db, contact_ids, action, chunk_size, job_id=job_id)
+    except Exception:
+        pass  # Recorded on the job
+    finally:
+        db.close()
+
+
+# Global instance
+bulk_contact_service = BulkContactService()
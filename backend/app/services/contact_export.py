@@ -0,0 +1,171 @@
+"""
+Streaming contact export service
+
+Produces the spreadsheet view of the contacts without paging through the
+API: rows come straight from a streamed cursor (``yield_per``) with interests
+and skills pre-aggregated in SQL, and are written out batch by batch as CSV,
+XLSX (openpyxl write-only mode) or Parquet (pyarrow, optional). Memory use
+depends on the batch size, not on the number of contacts. Archived contacts
+are left out unless asked for, as in the contact list.
+"""
+import csv
+import io
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import Contact, ContactInterest, ContactSkill
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "email", "phone", "job_title", "company",
+    "location", "age", "has_pets", "business_needs", "personal_notes",
+    "interests", "skills", "created_at", "updated_at", "archived_at",
+]
+
+LIST_SEPARATOR = "; "
+
+
+def _aggregate(column, separator: str):
+    """group_concat on SQLite, string_agg elsewhere"""
+    if settings.database_url.startswith("sqlite"):
+        return func.group_concat(column, separator)
+    return func.string_agg(column, separator)
+
+
+class ContactExportService:
+    """Service for exporting contacts as a flat table"""
+
+    def export_query(self, include_archived: bool = False):
+        """One row per contact with interests and skills joined into strings"""
+        interests = select(_aggregate(ContactInterest.interest_value, LIST_SEPARATOR))\
+            .where(ContactInterest.contact_id == Contact.id)\
+            .correlate(Contact)\
+            .scalar_subquery()
+        skills = select(_aggregate(ContactSkill.skill_name, LIST_SEPARATOR))\
+            .where(ContactSkill.contact_id == Contact.id)\
+            .correlate(Contact)\
+            .scalar_subquery()
+
+        columns = [getattr(Contact, c) for c in EXPORT_COLUMNS if c not in ("interests", "skills")]
+        query = select(*columns, interests.label("interests"), skills.label("skills"))\
+            .order_by(Contact.id)
+        if not include_archived:
+            query = query.where(Contact.archived_at.is_(None))
+        return query
+
+    def iter_batches(
+        self, db: Session, batch_size: int = 1000, include_archived: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield lists of row dicts from a streamed result"""
+        query = self.export_query(include_archived).execution_options(yield_per=batch_size)
+        result = db.execute(query)
+        for partition in result.mappings().partitions():
+            yield [{c: row[c] for c in EXPORT_COLUMNS} for row in partition]
+
+    def stream_csv(self, batch_size: int = 1000, include_archived: bool = False) -> Iterator[str]:
+        """Yield CSV text one batch at a time; opens its own session for the response lifetime"""
+        db = SessionLocal()
+        try:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for batch in self.iter_batches(db, batch_size, include_archived):
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            db.close()
+
+    def write_xlsx(self, db: Session, path: str, batch_size: int = 1000, include_archived: bool = False) -> int:
+        """Write an XLSX workbook in write-only mode; returns the number of rows"""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Contacts")
+        sheet.append(EXPORT_COLUMNS)
+        count = 0
+        for batch in self.iter_batches(db, batch_size, include_archived):
+            for row in batch:
+                sheet.append([_xlsx_value(row[c]) for c in EXPORT_COLUMNS])
+            count += len(batch)
+        workbook.save(path)
+        return count
+
+    def write_parquet(self, db: Session, path: str, batch_size: int = 1000, include_archived: bool = False) -> int:
+        """Write a Parquet file one row group per batch; returns the number of rows"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires the pyarrow package")
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("first_name", pa.string()),
+            ("last_name", pa.string()),
+            ("email", pa.string()),
+            ("phone", pa.string()),
+            ("job_title", pa.string()),
+            ("company", pa.string()),
+            ("location", pa.string()),
+            ("age", pa.int64()),
+            ("has_pets", pa.bool_()),
+            ("business_needs", pa.string()),
+            ("personal_notes", pa.string()),
+            ("interests", pa.string()),
+            ("skills", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+            ("archived_at", pa.timestamp("us")),
+        ])
+        count = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in self.iter_batches(db, batch_size, include_archived):
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+            if count == 0:
+                writer.write_table(schema.empty_table())
+        return count
+
+    def export_to_file(self, file_format: str, batch_size: int = 1000, include_archived: bool = False) -> str:
+        """Write an XLSX or Parquet export to a temporary file and return its path"""
+        writers = {"xlsx": self.write_xlsx, "parquet": self.write_parquet}
+        if file_format not in writers:
+            raise ValueError(f"Unsupported export format: {file_format}")
+
+        fd, path = tempfile.mkstemp(suffix=f".{file_format}")
+        os.close(fd)
+        db = SessionLocal()
+        try:
+            writers[file_format](db, path, batch_size, include_archived)
+            return path
+        except Exception:
+            os.remove(path)
+            raise
+        finally:
+            db.close()
+
+
+def _xlsx_value(value: Any) -> Any:
+    # Excel has no timezone-aware datetimes
+    if hasattr(value, "tzinfo") and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+# Global instance
+contact_export_service = ContactExportService()
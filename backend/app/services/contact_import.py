@@ -0,0 +1,272 @@
+"""
+Streaming spreadsheet import service
+
+Reads CSV or XLSX files one row at a time (csv module / openpyxl read-only
+mode), maps columns onto contacts, interests and skills, and writes them in
+chunks through the bulk upsert service. Only one chunk is held in memory, so
+memory stays flat however many rows the file has.
+
+A mapping describes how spreadsheet columns become contact data::
+
+    {
+        "fields": {"First Name": "first_name", "E-mail": "email"},
+        "interests": {"Hobbies": "Hobbies", "Favourite Music": "Music"},
+        "skills": ["Skills"],
+        "delimiter": ";"
+    }
+
+``fields`` maps column headers to ``Contact`` attributes, ``interests`` maps
+columns to the interest category their values belong to, ``skills`` lists
+columns holding skill names, and ``delimiter`` splits multi-valued cells.
+Without a mapping, headers matching contact attributes are used as is, an
+``interests`` column becomes "General" interests and a ``skills`` column skills.
+"""
+import csv
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from .bulk_contacts import CONTACT_FIELDS, bulk_contact_service
+from .jobs import job_service
+from .vector_store import vector_store
+
+SUPPORTED_FORMATS = ("csv", "xlsx")
+MAX_REPORTED_ERRORS = 100
+TRUE_VALUES = {"true", "yes", "y", "1", "x"}
+FALSE_VALUES = {"false", "no", "n", "0", ""}
+
+
+def _header_key(header: Any) -> str:
+    return "_".join(str(header or "").strip().lower().replace("-", " ").split())
+
+
+def detect_format(file_name: str) -> str:
+    """Infer the spreadsheet format from a file name"""
+    extension = os.path.splitext(file_name)[1].lower().lstrip(".")
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported spreadsheet format: .{extension} (expected .csv or .xlsx)")
+    return extension
+
+
+class ContactImportService:
+    """Service for importing contacts from spreadsheets"""
+
+    def iter_rows(self, path: str, file_format: str) -> Iterator[Dict[str, Any]]:
+        """Yield each data row as a header -> value dict"""
+        if file_format == "csv":
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                yield from csv.DictReader(f)
+        elif file_format == "xlsx":
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                headers = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+                for values in rows:
+                    if values is None or all(v is None for v in values):
+                        continue
+                    yield dict(zip(headers, values))
+            finally:
+                workbook.close()
+        else:
+            raise ValueError(f"Unsupported spreadsheet format: {file_format}")
+
+    def count_rows(self, path: str, file_format: str) -> Optional[int]:
+        """Number of data rows, used for progress reporting.
+
+        CSV files are counted by line breaks, so the count is approximate when
+        quoted values span several lines.
+        """
+        if file_format == "csv":
+            lines = 0
+            last = b"\n"
+            with open(path, "rb") as f:
+                while block := f.read(1024 * 1024):
+                    lines += block.count(b"\n")
+                    last = block[-1:]
+            if last != b"\n":
+                lines += 1
+            return max(lines - 1, 0)
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.active.max_row
+            return max(max_row - 1, 0) if max_row else None
+        finally:
+            workbook.close()
+
+    def resolve_mapping(self, headers: List[str], mapping: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fill in the default mapping for any part the caller left out"""
+        mapping = dict(mapping or {})
+        if "fields" not in mapping:
+            mapping["fields"] = {h: _header_key(h) for h in headers if _header_key(h) in CONTACT_FIELDS}
+        if "interests" not in mapping:
+            mapping["interests"] = {h: "General" for h in headers if _header_key(h) == "interests"}
+        if "skills" not in mapping:
+            mapping["skills"] = [h for h in headers if _header_key(h) == "skills"]
+        mapping.setdefault("delimiter", ";")
+
+        unknown = set(mapping["fields"].values()) - set(CONTACT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown contact fields in mapping: {', '.join(sorted(unknown))}")
+        if "first_name" not in mapping["fields"].values():
+            raise ValueError("Mapping must provide a column for first_name")
+        return mapping
+
+    def map_row(self, row: Dict[str, Any], mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a spreadsheet row into a contact dict; raises ValueError for bad rows"""
+        delimiter = mapping["delimiter"]
+        contact: Dict[str, Any] = {}
+
+        for column, field in mapping["fields"].items():
+            value = row.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "":
+                continue
+            if field == "age":
+                try:
+                    value = int(float(value))
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid age: {value!r}")
+            elif field == "has_pets":
+                if not isinstance(value, bool):
+                    text_value = str(value).strip().lower()
+                    if text_value not in TRUE_VALUES | FALSE_VALUES:
+                        raise ValueError(f"Invalid has_pets value: {value!r}")
+                    value = text_value in TRUE_VALUES
+            else:
+                value = str(value)
+            contact[field] = value
+
+        if not contact.get("first_name"):
+            raise ValueError("Missing first_name")
+
+        interests = []
+        for column, category in mapping["interests"].items():
+            for value in str(row.get(column) or "").split(delimiter):
+                if value.strip():
+                    interests.append({"interest_category": category, "interest_value": value.strip()})
+        if interests:
+            contact["interests"] = interests
+
+        skills = []
+        for column in mapping["skills"]:
+            for value in str(row.get(column) or "").split(delimiter):
+                if value.strip():
+                    skills.append({"skill_name": value.strip()})
+        if skills:
+            contact["skills"] = skills
+
+        return contact
+
+    def run(
+        self,
+        db: Session,
+        job_id: int,
+        path: str,
+        file_format: str,
+        mapping: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000,
+        embed: bool = True
+    ) -> Dict[str, Any]:
+        """Import a spreadsheet, reporting progress on the job after every chunk"""
+        job = job_service.get(db, job_id)
+        job_service.start(db, job, total=self.count_rows(path, file_format))
+
+        if embed and not vector_store.openai_client:
+            print("OpenAI API key not configured, importing without embeddings")
+            embed = False
+
+        stats = {"created": 0, "updated": 0, "failed": 0, "errors": [], "embedded": embed}
+        processed = 0
+
+        def flush(chunk: List[Tuple[int, Dict[str, Any]]]):
+            summary = bulk_contact_service.upsert(
+                db, [item for _, item in chunk], chunk_size=len(chunk), embed=embed
+            )
+            for (row_number, _), result in zip(chunk, summary["results"]):
+                if result["status"] == "error":
+                    self._record_error(stats, row_number, result["error"])
+            stats["created"] += summary["created"]
+            stats["updated"] += summary["updated"]
+            db.expunge_all()
+
+        try:
+            rows = self.iter_rows(path, file_format)
+            first = next(rows, None)
+            if first is None:
+                raise ValueError("Spreadsheet has no data rows")
+            mapping = self.resolve_mapping(list(first.keys()), mapping)
+
+            chunk: List[Tuple[int, Dict[str, Any]]] = []
+            row_number = 1  # Header row
+            for row in _prepend(first, rows):
+                row_number += 1
+                processed += 1
+                try:
+                    chunk.append((row_number, self.map_row(row, mapping)))
+                except ValueError as e:
+                    self._record_error(stats, row_number, str(e))
+
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+                    job = job_service.get(db, job_id)
+                    job_service.progress(db, job, processed, stats["created"] + stats["updated"],
+                                         stats["failed"], result=stats)
+            if chunk:
+                flush(chunk)
+
+            job = job_service.get(db, job_id)
+            job_service.progress(db, job, processed, stats["created"] + stats["updated"], stats["failed"])
+            job_service.complete(db, job, result=stats)
+            return stats
+
+        except Exception as e:
+            print(f"Contact import {job_id} failed: {e}")
+            db.rollback()
+            job = job_service.get(db, job_id)
+            job.result = stats
+            job_service.fail(db, job, str(e))
+            raise
+
+    def _record_error(self, stats: Dict[str, Any], row_number: int, error: Any):
+        stats["failed"] += 1
+        if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+            stats["errors"].append({"row": row_number, "error": error})
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def run_import_job(
+    job_id: int,
+    path: str,
+    file_format: str,
+    mapping: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 1000,
+    embed: bool = True,
+    delete_file: bool = False
+):
+    """Run an import with its own session (used as a FastAPI background task)"""
+    db = SessionLocal()
+    try:
+        contact_import_service.run(db, job_id, path, file_format, mapping, chunk_size, embed)
+    except Exception:
+        pass  # Recorded on the job
+    finally:
+        db.close()
+        if delete_file and os.path.exists(path):
+            os.remove(path)
+
+
+# Global instance
+contact_import_service = ContactImportService()
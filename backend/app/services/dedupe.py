@@ -0,0 +1,404 @@
+"""
+Duplicate contact detection and merge service
+
+Comparing every contact with every other one is O(n²). Instead contacts are
+grouped into blocks that share a normalized email, a normalized phone number
+or a phonetic (Soundex) key of their name or name + company, and only pairs
+inside a block are scored. Scoring is vectorized with numpy over batches of
+pairs: hashed character-trigram cosine for names and companies, exact
+matches for email and phone, and the cosine of the stored contact embeddings.
+"""
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models import (
+    AudioContactLink,
+    AudioRecording,
+    Contact,
+    ContactInterest,
+    ContactSkill,
+    DuplicateSuggestion,
+    EventParticipation,
+)
+from .bulk_contacts import CONTACT_FIELDS, contact_embedding_data
+from .jobs import job_service
+from .taxonomy import normalize_term
+from .vector_store import vector_store
+
+# Relative weight of each feature; features missing on either side are left out
+FEATURE_WEIGHTS = {
+    "email": 0.35,
+    "phone": 0.25,
+    "name": 0.25,
+    "company": 0.05,
+    "embedding": 0.10,
+}
+TRIGRAM_DIMENSIONS = 256
+SCORE_BATCH_SIZE = 20000
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def soundex(value: Optional[str]) -> str:
+    """American Soundex code ("Robert" -> "R163"); empty for values without letters"""
+    letters = re.sub(r"[^a-z]", "", (value or "").lower())
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def normalize_email(value: Optional[str]) -> str:
+    """Lower-case an email and drop any +tag from the local part"""
+    value = (value or "").strip().lower()
+    if "@" not in value:
+        return ""
+    local, domain = value.rsplit("@", 1)
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_phone(value: Optional[str]) -> str:
+    """Keep the last ten digits of a phone number; empty when too short to be one"""
+    digits = re.sub(r"\D", "", value or "")
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def _trigram_vectors(values: List[str]) -> np.ndarray:
+    """L2-normalized hashed character-trigram vectors, one row per value"""
+    vectors = np.zeros((len(values), TRIGRAM_DIMENSIONS), dtype=np.float32)
+    for row, value in enumerate(values):
+        padded = f"  {value} "
+        for i in range(len(padded) - 2):
+            vectors[row, zlib.crc32(padded[i:i + 3].encode()) % TRIGRAM_DIMENSIONS] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class DedupeService:
+    """Service for finding and merging duplicate contacts"""
+
+    def blocking_keys(self, first_name, last_name, email, phone, company) -> List[str]:
+        """Keys under which a contact is compared with others"""
+        keys = []
+        email_key = normalize_email(email)
+        if email_key:
+            keys.append(f"email:{email_key}")
+        phone_key = normalize_phone(phone)
+        if phone_key:
+            keys.append(f"phone:{phone_key}")
+        first_code, last_code = soundex(first_name), soundex(last_name)
+        if first_code and last_code:
+            keys.append(f"name:{first_code}:{last_code}")
+        company_code = soundex(normalize_term(company).split(" ")[0]) if company else ""
+        if first_code and company_code:
+            keys.append(f"company:{first_code}:{company_code}")
+        return keys
+
+    def find_candidates(self, db: Session, max_block_size: int = 100, batch_size: int = 2000):
+        """Stream contacts into blocks and return their records and candidate pairs"""
+        records: Dict[int, Dict[str, str]] = {}
+        blocks: Dict[str, List[int]] = defaultdict(list)
+
+        query = db.query(
+            Contact.id, Contact.first_name, Contact.last_name,
+            Contact.email, Contact.phone, Contact.company
+        ).filter(Contact.archived_at.is_(None)).execution_options(yield_per=batch_size)
+        for contact_id, first_name, last_name, email, phone, company in query:
+            records[contact_id] = {
+                "name": normalize_term(f"{first_name or ''} {last_name or ''}"),
+                "email": normalize_email(email),
+                "phone": normalize_phone(phone),
+                "company": normalize_term(company),
+            }
+            for key in self.blocking_keys(first_name, last_name, email, phone, company):
+                blocks[key].append(contact_id)
+
+        pairs: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        oversized = 0
+        for key, ids in blocks.items():
+            if len(ids) < 2:
+                continue
+            # Very common keys (e.g. "John Smith") say little and would reintroduce the quadratic blow-up
+            if len(ids) > max_block_size:
+                oversized += 1
+                continue
+            ids = sorted(ids)
+            for i, a in enumerate(ids):
+                for b in ids[i + 1:]:
+                    pairs[(a, b)].add(key.split(":", 1)[0])
+
+        stats = {
+            "contacts": len(records),
+            "blocks": len(blocks),
+            "oversized_blocks": oversized,
+            "candidate_pairs": len(pairs),
+        }
+        return records, pairs, stats
+
+    def score_pairs(
+        self,
+        records: Dict[int, Dict[str, str]],
+        pairs: List[Tuple[int, int]]
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score a batch of pairs; returns the scores and each feature's values (NaN when missing)"""
+        ids = sorted({contact_id for pair in pairs for contact_id in pair})
+        position = {contact_id: i for i, contact_id in enumerate(ids)}
+        left = np.array([position[a] for a, _ in pairs])
+        right = np.array([position[b] for _, b in pairs])
+
+        def exact(field):
+            values = np.array([records[i][field] for i in ids], dtype=object)
+            present = values != ""
+            available = present[left] & present[right]
+            return np.where(available, (values[left] == values[right]).astype(float), np.nan)
+
+        def trigram(field):
+            values = [records[i][field] for i in ids]
+            vectors = _trigram_vectors(values)
+            present = np.array([v != "" for v in values])
+            similarity = np.einsum("ij,ij->i", vectors[left], vectors[right])
+            return np.where(present[left] & present[right], similarity, np.nan)
+
+        features = {
+            "email": exact("email"),
+            "phone": exact("phone"),
+            "name": trigram("name"),
+            "company": trigram("company"),
+            "embedding": self._embedding_similarity(ids, left, right),
+        }
+
+        weighted = np.zeros(len(pairs))
+        total_weight = np.zeros(len(pairs))
+        for name, values in features.items():
+            available = ~np.isnan(values)
+            weighted += np.where(available, values, 0) * FEATURE_WEIGHTS[name]
+            total_weight += available * FEATURE_WEIGHTS[name]
+        scores = np.divide(weighted, total_weight, out=np.zeros_like(weighted), where=total_weight > 0)
+        return scores, features
+
+    def _embedding_similarity(self, ids: List[int], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Cosine similarity of stored contact embeddings (NaN where either is missing)"""
+        similarity = np.full(len(left), np.nan)
+        if not vector_store.collection:
+            return similarity
+        try:
+            result = vector_store.collection.get(ids=[str(i) for i in ids], include=["embeddings"])
+        except Exception as e:
+            print(f"Error loading embeddings for dedupe: {e}")
+            return similarity
+
+        embeddings = result.get("embeddings")
+        if embeddings is None:
+            embeddings = []
+        stored = {int(i): e for i, e in zip(result["ids"], embeddings) if e is not None}
+        if not stored:
+            return similarity
+        dimensions = len(next(iter(stored.values())))
+        vectors = np.zeros((len(ids), dimensions), dtype=np.float32)
+        present = np.zeros(len(ids), dtype=bool)
+        for row, contact_id in enumerate(ids):
+            if contact_id in stored:
+                vectors[row] = stored[contact_id]
+                present[row] = True
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        both = present[left] & present[right]
+        similarity[both] = np.clip(np.einsum("ij,ij->i", vectors[left[both]], vectors[right[both]]), 0, 1)
+        return similarity
+
+    def run(self, db: Session, job_id: int, threshold: float = 0.8, max_block_size: int = 100) -> Dict[str, Any]:
+        """Find duplicate pairs scoring at least ``threshold`` and store them as suggestions"""
+        job = job_service.get(db, job_id)
+        job_service.start(db, job)
+
+        try:
+            records, pairs, stats = self.find_candidates(db, max_block_size=max_block_size)
+            pair_list = list(pairs.keys())
+            job.total = len(pair_list)
+            db.commit()
+
+            existing = {
+                (a, b): (suggestion_id, status)
+                for suggestion_id, a, b, status in db.query(
+                    DuplicateSuggestion.id, DuplicateSuggestion.contact_id,
+                    DuplicateSuggestion.duplicate_contact_id, DuplicateSuggestion.status
+                )
+            }
+
+            found = set()
+            new_rows, updated_rows = [], []
+            for start in range(0, len(pair_list), SCORE_BATCH_SIZE):
+                batch = pair_list[start:start + SCORE_BATCH_SIZE]
+                scores, features = self.score_pairs(records, batch)
+                for i in np.nonzero(scores >= threshold)[0]:
+                    pair = batch[i]
+                    found.add(pair)
+                    pair_features = {
+                        name: (None if np.isnan(values[i]) else round(float(values[i]), 4))
+                        for name, values in features.items()
+                    }
+                    pair_features["blocks"] = sorted(pairs[pair])
+                    row = {"score": round(float(scores[i]), 4), "features": pair_features, "job_id": job_id}
+                    if pair not in existing:
+                        new_rows.append({"contact_id": pair[0], "duplicate_contact_id": pair[1],
+                                         "status": "pending", **row})
+                    elif existing[pair][1] == "pending":
+                        updated_rows.append({"id": existing[pair][0], **row})
+                job_service.progress(db, job, min(start + SCORE_BATCH_SIZE, len(pair_list)), len(found), 0)
+
+            if new_rows:
+                db.execute(insert(DuplicateSuggestion), new_rows)
+            if updated_rows:
+                db.execute(update(DuplicateSuggestion), updated_rows)
+
+            # Pending suggestions that no longer score high enough are dropped; dismissals are kept
+            stale = [suggestion_id for pair, (suggestion_id, status) in existing.items()
+                     if status == "pending" and pair not in found]
+            for start in range(0, len(stale), 500):
+                db.execute(delete(DuplicateSuggestion).where(
+                    DuplicateSuggestion.id.in_(stale[start:start + 500])
+                ))
+
+            stats.update({
+                "suggestions": len(found),
+                "new_suggestions": len(new_rows),
+                "removed_suggestions": len(stale),
+                "threshold": threshold,
+            })
+            job_service.complete(db, job, result=stats)
+            return stats
+
+        except Exception as e:
+            print(f"Dedupe job {job_id} failed: {e}")
+            db.rollback()
+            job_service.fail(db, job_service.get(db, job_id), str(e))
+            raise
+
+    def merge(self, db: Session, primary_id: int, duplicate_id: int) -> Dict[str, Any]:
+        """Fold a duplicate contact into the primary one in a single transaction.
+
+        Empty fields on the primary are filled from the duplicate; recordings, event
+        participations, interests and skills are re-pointed (dropping ones the primary
+        already has); the duplicate is deleted and the vector index updated.
+        """
+        if primary_id == duplicate_id:
+            raise ValueError("Cannot merge a contact into itself")
+        primary = db.query(Contact).filter(Contact.id == primary_id).first()
+        duplicate = db.query(Contact).filter(Contact.id == duplicate_id).first()
+        if not primary or not duplicate:
+            raise LookupError("Contact not found")
+
+        filled = []
+        for field in CONTACT_FIELDS:
+            primary_value, duplicate_value = getattr(primary, field), getattr(duplicate, field)
+            if duplicate_value in (None, ""):
+                continue
+            if primary_value in (None, ""):
+                setattr(primary, field, duplicate_value)
+                filled.append(field)
+            elif field in ("business_needs", "personal_notes") and duplicate_value not in primary_value:
+                setattr(primary, field, f"{primary_value}\n{duplicate_value}")
+                filled.append(field)
+            elif field == "has_pets" and duplicate_value and not primary_value:
+                primary.has_pets = True
+                filled.append(field)
+
+        moved = {}
+        moved["audio_recordings"] = db.execute(
+            update(AudioRecording).where(AudioRecording.contact_id == duplicate_id)
+            .values(contact_id=primary_id)
+        ).rowcount
+
+        primary_audio = db.query(AudioContactLink.audio_recording_id)\
+            .filter(AudioContactLink.contact_id == primary_id)
+        db.execute(delete(AudioContactLink).where(
+            AudioContactLink.contact_id == duplicate_id,
+            AudioContactLink.audio_recording_id.in_(primary_audio.scalar_subquery())
+        ))
+        db.execute(
+            update(AudioContactLink).where(AudioContactLink.contact_id == duplicate_id)
+            .values(contact_id=primary_id)
+        )
+
+        primary_events = db.query(EventParticipation.event_id)\
+            .filter(EventParticipation.contact_id == primary_id)
+        db.execute(delete(EventParticipation).where(
+            EventParticipation.contact_id == duplicate_id,
+            EventParticipation.event_id.in_(primary_events.scalar_subquery())
+        ))
+        moved["event_participations"] = db.execute(
+            update(EventParticipation).where(EventParticipation.contact_id == duplicate_id)
+            .values(contact_id=primary_id)
+        ).rowcount
+
+        for key, model, term_column in (
+            ("interests", ContactInterest, ContactInterest.interest_id),
+            ("skills", ContactSkill, ContactSkill.skill_id),
+        ):
+            primary_terms = db.query(term_column).filter(model.contact_id == primary_id)
+            db.execute(delete(model).where(
+                model.contact_id == duplicate_id,
+                term_column.in_(primary_terms.scalar_subquery())
+            ))
+            moved[key] = db.execute(
+                update(model).where(model.contact_id == duplicate_id).values(contact_id=primary_id)
+            ).rowcount
+
+        db.execute(delete(DuplicateSuggestion).where(or_(
+            DuplicateSuggestion.contact_id == duplicate_id,
+            DuplicateSuggestion.duplicate_contact_id == duplicate_id
+        )))
+        db.expunge(duplicate)
+        db.execute(delete(Contact).where(Contact.id == duplicate_id))
+        db.commit()
+
+        # ChromaDB cannot join the SQL transaction, so it is synced once the merge is committed
+        db.refresh(primary)
+        vector_store.delete_contact_embedding(duplicate_id)
+        vector_store.add_contact_embedding(primary.id, contact_embedding_data(primary))
+
+        return {
+            "contact_id": primary_id,
+            "merged_contact_id": duplicate_id,
+            "filled_fields": filled,
+            "moved": moved,
+        }
+
+
+def run_dedupe_job(job_id: int, threshold: float = 0.8, max_block_size: int = 100):
+    """Run a dedupe scan with its own session (used as a FastAPI background task)"""
+    db = SessionLocal()
+    try:
+        dedupe_service.run(db, job_id, threshold, max_block_size)
+    except Exception:
+        pass  # Recorded on the job
+    finally:
+        db.close()
+
+
+# Global instance
+dedupe_service = DedupeService()
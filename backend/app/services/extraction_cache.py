@@ -0,0 +1,90 @@
+"""
+Extraction result cache
+
+GPT extractions are stored under the SHA-256 of the transcript and a hash of
+everything else that shapes the output: model, temperature, system message and
+prompt template. Extracting the same transcript with the same prompt again is
+a single indexed lookup. Changing the prompt changes its hash, so only entries
+made with the old prompt stop matching, and recordings extracted with it can be
+listed and re-extracted selectively.
+
+Entries are written in their own session and committed immediately, so an
+extraction survives the caller's transaction being rolled back and a retry
+does not pay for the model call again.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Collection, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models import AudioRecording, ExtractionCache
+
+
+def transcript_hash(transcript: str) -> str:
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+def prompt_hash(*parts: Any) -> str:
+    """Version hash of a prompt from everything that affects its output"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ExtractionCacheService:
+    """Lookup and storage of extraction results"""
+
+    def get(self, db: Session, transcript_key: str, prompt_key: str) -> Optional[Dict[str, Any]]:
+        """The cached result, counting the hit, or None"""
+        entry = db.query(ExtractionCache).filter(
+            ExtractionCache.transcript_hash == transcript_key,
+            ExtractionCache.prompt_hash == prompt_key
+        ).first()
+        if entry is None:
+            return None
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_hit_at = datetime.now()
+        return entry.result
+
+    def put(self, transcript_key: str, prompt_key: str, model: str, result: Dict[str, Any]):
+        """Store a result and commit it independently of any caller's transaction"""
+        db = SessionLocal()
+        try:
+            db.add(ExtractionCache(
+                transcript_hash=transcript_key, prompt_hash=prompt_key, model=model, result=result
+            ))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # A concurrent extraction of the same transcript stored it first
+        finally:
+            db.close()
+
+    def stale_recordings(self, db: Session, prompt_keys: Collection[str], *columns):
+        """Query for recordings whose extraction was made with none of the current prompts"""
+        return db.query(*(columns or (AudioRecording.id,))).filter(
+            AudioRecording.extraction_result.isnot(None),
+            (AudioRecording.extraction_prompt_hash.is_(None))
+            | AudioRecording.extraction_prompt_hash.notin_(prompt_keys)
+        )
+
+    def stats(self, db: Session, prompt_keys: Collection[str]) -> Dict[str, Any]:
+        current = ExtractionCache.prompt_hash.in_(prompt_keys)
+        entries, current_entries, hits = db.query(
+            func.count(ExtractionCache.id),
+            func.count(ExtractionCache.id).filter(current),
+            func.coalesce(func.sum(ExtractionCache.hit_count), 0),
+        ).one()
+        return {
+            "prompt_hashes": list(prompt_keys),
+            "entries": entries,
+            "current_prompt_entries": current_entries,
+            "hits": hits,
+            "stale_recordings": self.stale_recordings(db, prompt_keys).count(),
+        }
+
+
+# Global instance
+extraction_cache = ExtractionCacheService()
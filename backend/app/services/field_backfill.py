@@ -0,0 +1,362 @@
+"""
+Contact field backfill
+
+When a field is added to ``Contact`` (``has_pets`` was one), existing contacts
+have no value for it, and re-running the full extraction over every transcript
+to fill it would repeat all of the work already done. A backfill asks only for
+the fields that are missing: contacts linked to a transcribed recording (see
+``audio_contact_links``) whose target fields are all set already are skipped,
+and the rest are sent several at a time with a compact prompt that lists just
+those fields. The prompt carries no instructions for the other fields, and a
+contact's own values are never overwritten, so the cost of a backfill scales
+with the fields requested rather than with the full extraction.
+
+Batches are sent with bounded concurrency, and after every page of contacts
+the job records the last contact ID it finished in ``job.result``. A job that
+is retried, or taken over after its worker died, continues from there. Per
+contact answers are also stored in the extraction cache, so repeating a
+backfill for the same fields reuses them instead of asking again.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
+
+import openai
+from sqlalchemy import Boolean, Integer, String, Text, or_, select, update
+from sqlalchemy.orm import Session, selectinload, undefer_group
+
+from ..core.config import settings
+from ..models import AudioContactLink, AudioRecording, Contact, Job, Transcript
+from .audio_processing import EXTRACTION_MODEL, EXTRACTION_SYSTEM_PROMPT, EXTRACTION_TEMPERATURE, parse_model_json
+from .bulk_contacts import contact_embedding_data
+from .extraction_cache import extraction_cache, prompt_hash, transcript_hash
+from .jobs import job_service
+from .vector_store import vector_store
+
+# Columns that are not extracted from conversations
+NON_BACKFILL_COLUMNS = {"id", "first_name", "created_at", "updated_at", "archived_at"}
+
+# Hints for fields whose type alone does not say what to extract
+FIELD_HINTS = {
+    "location": "city, state/country",
+    "business_needs": "what they need help with",
+    "personal_notes": "interesting personal details",
+}
+
+# Fields in the embedded contact document; filling one re-embeds the contact
+EMBEDDED_FIELDS = {"last_name", "job_title", "company", "location", "business_needs", "personal_notes"}
+
+MAX_TRANSCRIPT_CHARS = 24000  # Per contact, across all of their recordings
+BATCH_CHAR_BUDGET = 16000  # Transcript characters per request; a longer transcript goes alone
+
+BACKFILL_PROMPT = """
+        For each person below, read the conversation transcript and extract only these fields:
+{fields}
+
+        Use null for anything the transcript does not say. Return only valid JSON mapping each
+        person's id to their fields, for example {{"12": {{"{example}": null}}}}.
+
+{people}
+        """
+
+
+def backfill_fields() -> Dict[str, Any]:
+    """Contact columns that a backfill can fill, by name"""
+    return {
+        column.name: column for column in Contact.__table__.columns
+        if column.name not in NON_BACKFILL_COLUMNS
+    }
+
+
+def field_type(column) -> str:
+    if isinstance(column.type, Boolean):
+        return "boolean"
+    if isinstance(column.type, Integer):
+        return "integer"
+    return "string"
+
+
+def coerce_value(column, value: Any) -> Any:
+    """A model value converted to the column's type, or None when it does not fit"""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(column.type, Boolean):
+            if isinstance(value, str):
+                return {"true": True, "yes": True, "false": False, "no": False}.get(value.strip().lower())
+            return bool(value)
+        if isinstance(column.type, Integer):
+            return int(value)
+    except (TypeError, ValueError):
+        return None
+    value = value if isinstance(value, str) else json.dumps(value)
+    if isinstance(column.type, String) and not isinstance(column.type, Text) and column.type.length:
+        value = value[:column.type.length]
+    return value.strip() or None
+
+
+class FieldBackfillService:
+    """Fills missing contact fields from the transcripts of their recordings"""
+
+    def validate_fields(self, fields: Sequence[str]) -> List[str]:
+        columns = backfill_fields()
+        unknown = [field for field in fields if field not in columns]
+        if unknown or not fields:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown) or 'none given'}; "
+                f"choose from: {', '.join(columns)}"
+            )
+        return list(dict.fromkeys(fields))
+
+    def missing_condition(self, fields: Sequence[str], include_defaults: bool = False):
+        """SQL condition matching contacts that lack a value for any of ``fields``
+
+        With ``include_defaults`` a column still at its default (``has_pets``
+        is False unless set) also counts as missing.
+        """
+        columns = backfill_fields()
+        conditions = []
+        for field in fields:
+            column = getattr(Contact, field)
+            conditions.append(column.is_(None))
+            if isinstance(columns[field].type, String):
+                conditions.append(column == "")
+            default = columns[field].default
+            if include_defaults and default is not None and default.is_scalar:
+                conditions.append(column == default.arg)
+        return or_(*conditions)
+
+    def candidates(self, db: Session, fields: Sequence[str], include_defaults: bool = False,
+                   after_id: int = 0):
+        """Query for IDs of unarchived contacts with a transcript and a missing field"""
+        transcribed = select(AudioContactLink.contact_id).join(
+            Transcript, Transcript.audio_recording_id == AudioContactLink.audio_recording_id
+        ).where(Transcript.char_count > 0)
+        return db.query(Contact.id).filter(
+            Contact.id > after_id,
+            Contact.archived_at.is_(None),
+            Contact.id.in_(transcribed),
+            self.missing_condition(fields, include_defaults)
+        ).order_by(Contact.id)
+
+    def prompt_key(self, fields: Sequence[str]) -> str:
+        """Version hash of the backfill prompt for ``fields``"""
+        return prompt_hash(EXTRACTION_MODEL, EXTRACTION_TEMPERATURE, EXTRACTION_SYSTEM_PROMPT,
+                           BACKFILL_PROMPT, sorted(fields))
+
+    def build_prompt(self, fields: Sequence[str], items: List[Dict[str, Any]]) -> str:
+        columns = backfill_fields()
+        field_lines = "\n".join(
+            f"        - {field}: {field_type(columns[field])}"
+            + (f" ({FIELD_HINTS[field]})" if field in FIELD_HINTS else "")
+            for field in fields
+        )
+        people = "\n".join(
+            f"        Person {item['id']}: {item['name']}"
+            + (f" (speaker {item['speaker']})" if item.get("speaker") else "")
+            + f'\n        Transcript: "{item["transcript"]}"\n'
+            for item in items
+        )
+        return BACKFILL_PROMPT.format(fields=field_lines, example=fields[0], people=people)
+
+    def load_items(self, db: Session, contact_ids: List[int], fields: Sequence[str],
+                   include_defaults: bool) -> List[Dict[str, Any]]:
+        """The contacts of a page with their transcripts and the fields each still lacks"""
+        contacts = db.query(Contact)\
+            .options(undefer_group("large_text"),
+                     selectinload(Contact.audio_links).selectinload(AudioContactLink.audio_recording)
+                     .selectinload(AudioRecording.transcript))\
+            .filter(Contact.id.in_(contact_ids)).order_by(Contact.id).all()
+        columns = backfill_fields()
+        items = []
+        for contact in contacts:
+            missing = []
+            for field in fields:
+                value = getattr(contact, field)
+                default = columns[field].default
+                if value is None or value == "" or (
+                    include_defaults and default is not None and default.is_scalar and value == default.arg
+                ):
+                    missing.append(field)
+            links = sorted(
+                (link for link in contact.audio_links
+                 if link.audio_recording is not None and link.audio_recording.transcription),
+                key=lambda link: link.audio_recording_id
+            )
+            transcript = "\n\n".join(link.audio_recording.transcription for link in links)
+            if not missing or not transcript:
+                continue
+            items.append({
+                "id": contact.id,
+                "name": f"{contact.first_name} {contact.last_name or ''}".strip(),
+                "speaker": next((link.speaker for link in links if link.speaker), None),
+                "transcript": transcript[:MAX_TRANSCRIPT_CHARS],
+                "missing": missing,
+            })
+        return items
+
+    def make_batches(self, items: List[Dict[str, Any]], batch_size: int) -> List[List[Dict[str, Any]]]:
+        """Group items by count and transcript length"""
+        batches, batch, chars = [], [], 0
+        for item in items:
+            length = len(item["transcript"])
+            if batch and (len(batch) >= batch_size or chars + length > BATCH_CHAR_BUDGET):
+                batches.append(batch)
+                batch, chars = [], 0
+            batch.append(item)
+            chars += length
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def request(self, client: openai.OpenAI, fields: Sequence[str],
+                batch: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        """One model call for a batch; returns answers by contact ID and the prompt length"""
+        prompt = self.build_prompt(fields, batch)
+        response = client.chat.completions.create(
+            model=EXTRACTION_MODEL,
+            messages=[
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=EXTRACTION_TEMPERATURE
+        )
+        answers = parse_model_json(response.choices[0].message.content)
+        if not isinstance(answers, dict):
+            raise RuntimeError("Model returned JSON that is not an object")
+        return {str(key): value for key, value in answers.items()}, len(prompt)
+
+    def apply(self, db: Session, item: Dict[str, Any], answer: Any) -> List[str]:
+        """Write the answered values of the fields a contact still lacks; returns the fields set"""
+        columns = backfill_fields()
+        answer = answer if isinstance(answer, dict) else {}
+        values = {}
+        for field in item["missing"]:
+            value = coerce_value(columns[field], answer.get(field))
+            if value is not None:
+                values[field] = value
+        if values:
+            db.execute(update(Contact).where(Contact.id == item["id"]).values(**values))
+        return list(values)
+
+    def run(self, db: Session, job: Job) -> Dict[str, Any]:
+        """Backfill ``job.params["fields"]``, resuming from the job's checkpoint"""
+        params = job.params or {}
+        fields = self.validate_fields(params.get("fields") or [])
+        include_defaults = bool(params.get("include_defaults"))
+        batch_size = max(1, int(params.get("batch_size") or 10))
+        concurrency = max(1, int(params.get("concurrency") or 4))
+        embed = params.get("embed", True)
+        prompt_key = self.prompt_key(fields)
+
+        state = dict(job.result or {})
+        state.setdefault("fields", fields)
+        for counter in ("updated_contacts", "updated_values", "unanswered", "model_calls",
+                        "cached", "prompt_chars"):
+            state.setdefault(counter, 0)
+        state.setdefault("failed_contact_ids", [])
+        checkpoint = state.get("checkpoint") or 0
+        processed, succeeded, failed = job.processed or 0, job.succeeded or 0, job.failed or 0
+        if job.total is None:
+            job.total = self.candidates(db, fields, include_defaults).count()
+            db.commit()
+
+        client = None
+        page_size = batch_size * concurrency
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                contact_ids = [row.id for row in self.candidates(
+                    db, fields, include_defaults, after_id=checkpoint
+                ).limit(page_size).all()]
+                if not contact_ids:
+                    break
+                items = self.load_items(db, contact_ids, fields, include_defaults)
+
+                # Answers from an earlier backfill of the same fields and transcript
+                answers, pending = {}, []
+                for item in items:
+                    item["key"] = transcript_hash(f"{item['id']}\n{item['name']}\n{item['transcript']}")
+                    cached = extraction_cache.get(db, item["key"], prompt_key)
+                    if cached is not None:
+                        answers[item["id"]] = cached
+                        state["cached"] += 1
+                    else:
+                        pending.append(item)
+
+                errors = []
+                if pending:
+                    if client is None:
+                        if not settings.openai_api_key:
+                            raise RuntimeError("OpenAI API key not configured")
+                        client = openai.OpenAI(api_key=settings.openai_api_key)
+                    batches = self.make_batches(pending, batch_size)
+                    futures = [pool.submit(self.request, client, fields, batch) for batch in batches]
+                    for batch, future in zip(batches, futures):
+                        try:
+                            batch_answers, prompt_chars = future.result()
+                        except Exception as e:
+                            errors.append(e)
+                            failed += len(batch)
+                            state["failed_contact_ids"] = (
+                                state["failed_contact_ids"] + [item["id"] for item in batch]
+                            )[:100]
+                            print(f"Field backfill batch failed for contacts {[item['id'] for item in batch]}: {e}")
+                            continue
+                        state["model_calls"] += 1
+                        state["prompt_chars"] += prompt_chars
+                        for item in batch:
+                            answer = batch_answers.get(str(item["id"]))
+                            answers[item["id"]] = answer or {}
+                            if isinstance(answer, dict):
+                                # A contact left out of the reply is asked again by a later backfill
+                                extraction_cache.put(item["key"], prompt_key, EXTRACTION_MODEL, answer)
+                if errors and not answers:
+                    # Nothing in the page worked (no API access, outage): retry from the checkpoint
+                    db.rollback()
+                    raise RuntimeError(f"Field backfill failed: {errors[0]}")
+
+                reembed = []
+                for item in items:
+                    if item["id"] not in answers:
+                        continue
+                    written = self.apply(db, item, answers[item["id"]])
+                    if written:
+                        succeeded += 1
+                        state["updated_contacts"] += 1
+                        state["updated_values"] += len(written)
+                        if EMBEDDED_FIELDS.intersection(written):
+                            reembed.append(item["id"])
+                    else:
+                        state["unanswered"] += 1
+
+                processed += len(contact_ids)
+                checkpoint = contact_ids[-1]
+                state["checkpoint"] = checkpoint
+                job_service.progress(db, job, processed, succeeded, failed, result=dict(state))
+                job_service.renew_lease(db, job)
+
+                if embed and reembed and vector_store.openai_client:
+                    self.embed(db, reembed)
+
+        return state
+
+    def embed(self, db: Session, contact_ids: List[int]):
+        contacts = db.query(Contact)\
+            .options(undefer_group("large_text"), selectinload(Contact.interests), selectinload(Contact.skills))\
+            .filter(Contact.id.in_(contact_ids)).all()
+        vector_store.add_contact_embeddings(
+            [(contact.id, contact_embedding_data(contact)) for contact in contacts]
+        )
+
+
+def handle_field_backfill_job(db: Session, job: Job) -> Dict[str, Any]:
+    return field_backfill_service.run(db, job)
+
+
+FIELD_BACKFILL_JOB_HANDLERS = {
+    "contact_field_backfill": handle_field_backfill_job,
+}
+
+
+# Global instance
+field_backfill_service = FieldBackfillService()
@@ -0,0 +1,159 @@
+"""
+Background job tracking service
+
+Long-running work (imports, backfills) records its progress on a ``Job`` row
+so clients can poll ``GET /jobs/{id}`` instead of holding a request open.
+
+Jobs can also be queued for the worker pool (``app/services/worker.py``):
+``enqueue`` adds a pending job, a worker ``claim``s it with a lease, and a job
+whose worker dies is claimed again once the lease expires. Failures are
+retried with exponential backoff up to ``max_attempts``.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+
+from ..models import Job
+
+
+class JobService:
+    """Service for creating jobs and recording their progress"""
+
+    def create(self, db: Session, job_type: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Create a pending job"""
+        job = Job(job_type=job_type, status="pending", params=params or {},
+                  processed=0, succeeded=0, failed=0)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def get(self, db: Session, job_id: int) -> Optional[Job]:
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    def start(self, db: Session, job: Job, total: Optional[int] = None):
+        """Mark a job as running"""
+        job.status = "running"
+        job.total = total
+        job.started_at = datetime.now(timezone.utc)
+        db.commit()
+
+    def progress(self, db: Session, job: Job, processed: int, succeeded: int, failed: int,
+                 result: Optional[Dict[str, Any]] = None):
+        """Record progress; commits so pollers see it immediately"""
+        job.processed = processed
+        job.succeeded = succeeded
+        job.failed = failed
+        if result is not None:
+            job.result = result
+        db.commit()
+
+    def complete(self, db: Session, job: Job, result: Optional[Dict[str, Any]] = None):
+        """Mark a job as completed"""
+        job.status = "completed"
+        if result is not None:
+            job.result = result
+        job.finished_at = datetime.now(timezone.utc)
+        job.lease_expires_at = None
+        db.commit()
+
+    def fail(self, db: Session, job: Job, error: str):
+        """Mark a job as failed, keeping the progress made so far"""
+        job.status = "failed"
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        job.lease_expires_at = None
+        db.commit()
+
+    def enqueue(self, db: Session, job_type: str, params: Optional[Dict[str, Any]] = None,
+                max_attempts: Optional[int] = None) -> Job:
+        """Create a pending job for the worker pool"""
+        job = Job(job_type=job_type, status="pending", params=params or {},
+                  processed=0, succeeded=0, failed=0, attempts=0,
+                  max_attempts=max_attempts or settings.job_max_attempts)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def claim(self, db: Session, job_types: Iterable[str], worker_id: str,
+              lease_seconds: Optional[int] = None) -> Optional[Job]:
+        """Take the oldest runnable job of ``job_types``, or None if there is none.
+
+        Runnable means pending and past its retry backoff, or running with an
+        expired lease. The claim is a conditional UPDATE, so when several
+        workers race for the same row only one of them gets it.
+        """
+        job_types = list(job_types)
+        now = datetime.now(timezone.utc)
+        runnable = or_(
+            (Job.status == "pending") & or_(Job.run_after.is_(None), Job.run_after <= now),
+            (Job.status == "running") & (Job.lease_expires_at < now)
+        )
+        candidates = db.query(Job.id)\
+            .filter(Job.job_type.in_(job_types), runnable)\
+            .order_by(Job.id).limit(5).all()
+        for (job_id,) in candidates:
+            claimed = db.execute(
+                update(Job).where(Job.id == job_id, runnable).values(
+                    status="running",
+                    locked_by=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds or settings.job_lease_seconds),
+                    attempts=Job.attempts + 1,
+                    started_at=now,
+                    error=None
+                )
+            ).rowcount
+            db.commit()
+            if claimed:
+                return self.get(db, job_id)
+        return None
+
+    def renew_lease(self, db: Session, job: Job, lease_seconds: Optional[int] = None):
+        """Extend a claimed job's lease, for handlers that run longer than one lease"""
+        if job.lease_expires_at is None:
+            return
+        job.lease_expires_at = datetime.now(timezone.utc) + timedelta(
+            seconds=lease_seconds or settings.job_lease_seconds
+        )
+        db.commit()
+
+    def heartbeat(self, db: Session, job_id: int, worker_id: str, attempt: int,
+                  lease_seconds: Optional[int] = None) -> bool:
+        """Extend the lease of a job this worker still holds; False once it lost the job
+
+        A conditional UPDATE, so it is safe to run from a thread other than the
+        handler's, with its own session.
+        """
+        renewed = db.execute(
+            update(Job).where(
+                Job.id == job_id, Job.status == "running",
+                Job.locked_by == worker_id, Job.attempts == attempt
+            ).values(lease_expires_at=datetime.now(timezone.utc) + timedelta(
+                seconds=lease_seconds or settings.job_lease_seconds
+            ))
+        ).rowcount
+        db.commit()
+        return bool(renewed)
+
+    def retry_or_fail(self, db: Session, job: Job, error: str):
+        """Put a failed attempt back in the queue with backoff, or fail the job for good"""
+        if (job.attempts or 0) >= (job.max_attempts or 1):
+            self.fail(db, job, error)
+            return
+        job.status = "pending"
+        job.error = error
+        job.locked_by = None
+        job.lease_expires_at = None
+        job.run_after = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.job_retry_backoff * 2 ** ((job.attempts or 1) - 1)
+        )
+        db.commit()
+
+
+# Global instance
+job_service = JobService()
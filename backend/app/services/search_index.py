@@ -0,0 +1,73 @@
+"""
+Trigram substring search index
+
+On SQLite every searchable table has an FTS5 shadow table using the trigram
+tokenizer (created and kept in sync by triggers in migration 003), so a
+``'%term%'`` filter becomes an index probe instead of a full table scan.
+Other databases, and fragments shorter than a trigram, fall back to ``ilike``.
+"""
+from typing import Dict, List
+
+from sqlalchemy import bindparam, or_, text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models import (
+    Contact,
+    InterestAlias,
+    InterestTerm,
+    SkillAlias,
+    SkillTerm,
+)
+
+# FTS5 table and indexed columns, per model
+FTS_TABLES = {
+    Contact: ("contacts_fts", [
+        "first_name", "last_name", "email", "job_title",
+        "company", "location", "business_needs", "personal_notes",
+    ]),
+    InterestTerm: ("interest_terms_fts", ["normalized_name", "category"]),
+    InterestAlias: ("interest_aliases_fts", ["normalized_alias"]),
+    SkillTerm: ("skill_terms_fts", ["normalized_name"]),
+    SkillAlias: ("skill_aliases_fts", ["normalized_alias"]),
+}
+
+
+class SearchIndexService:
+    """Service for substring filters backed by the FTS5 trigram index"""
+
+    def __init__(self):
+        self.enabled = settings.database_url.startswith("sqlite")
+
+    def contains(self, model, columns: List[str], fragment: str):
+        """Filter for rows where any of the columns contains the fragment (case-insensitive)"""
+        fragment = fragment.strip()
+        fts = FTS_TABLES.get(model)
+
+        # The trigram tokenizer cannot match anything shorter than three characters
+        if not self.enabled or not fts or len(fragment) < 3 or not set(columns) <= set(fts[1]):
+            return or_(*[getattr(model, c).ilike(f"%{fragment}%") for c in columns])
+
+        table, _ = fts
+        phrase = '"' + fragment.replace('"', '""') + '"'
+        match = f"{{{' '.join(columns)}}} : {phrase}"
+        return model.id.in_(
+            text(f"SELECT rowid FROM {table} WHERE {table} MATCH :match")
+            .bindparams(bindparam("match", match, unique=True))
+            .columns(rowid=model.id.type)
+        )
+
+    def rebuild(self, db: Session) -> Dict[str, str]:
+        """Rebuild every FTS table from its content table"""
+        if not self.enabled:
+            return {}
+        stats = {}
+        for table, _ in FTS_TABLES.values():
+            db.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+            stats[table] = "rebuilt"
+        db.commit()
+        return stats
+
+
+# Global instance
+search_index = SearchIndexService()
@@ -0,0 +1,264 @@
+"""
+Interest and skill taxonomy service
+
+Maps free-text interest values and skill names onto canonical dictionary
+terms so that filters can resolve a search term to integer IDs once and
+join on the indexed ``interest_id``/``skill_id`` columns instead of running
+``ilike`` over every interest and skill row.
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from ..models import (
+    ContactInterest,
+    ContactSkill,
+    InterestAlias,
+    InterestTerm,
+    SkillAlias,
+    SkillTerm,
+)
+from .search_index import search_index
+
+
+def normalize_term(value: Optional[str]) -> str:
+    """Normalize a term for dictionary lookups ("  Music-Therapy " -> "music therapy")"""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", value).lower()
+    value = re.sub(r"[^\w\s&+#]", " ", value)
+    return " ".join(value.split())
+
+
+class TaxonomyService:
+    """Service for resolving interests and skills to canonical terms"""
+
+    KINDS = {
+        "interest": (InterestTerm, InterestAlias),
+        "skill": (SkillTerm, SkillAlias),
+    }
+
+    def _models(self, kind: str):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown taxonomy kind: {kind}")
+        return self.KINDS[kind]
+
+    def lookup_terms(self, db: Session, kind: str, values: Iterable[str]) -> Dict[str, int]:
+        """Resolve many values to existing term IDs with one query per table"""
+        term_model, alias_model = self._models(kind)
+        keys = {normalize_term(v) for v in values}
+        keys.discard("")
+        if not keys:
+            return {}
+
+        resolved = {}
+        for term_id, key in db.query(term_model.id, term_model.normalized_name)\
+                .filter(term_model.normalized_name.in_(keys)):
+            resolved[key] = term_id
+
+        missing = keys - resolved.keys()
+        if missing:
+            for term_id, key in db.query(alias_model.term_id, alias_model.normalized_alias)\
+                    .filter(alias_model.normalized_alias.in_(missing)):
+                resolved[key] = term_id
+        return resolved
+
+    def get_or_create_terms(
+        self,
+        db: Session,
+        kind: str,
+        values: Iterable[Tuple[str, Optional[str]]]
+    ) -> Dict[str, Tuple[int, str]]:
+        """Resolve (value, category) pairs to (term_id, canonical name), creating missing terms.
+
+        The returned mapping is keyed by the normalized value. New terms are
+        flushed but not committed, so they share the caller's transaction.
+        """
+        term_model, _ = self._models(kind)
+        values = [(v, c) for v, c in values if normalize_term(v)]
+        resolved_ids = self.lookup_terms(db, kind, [v for v, _ in values])
+
+        result = {}
+        if resolved_ids:
+            names = dict(
+                db.query(term_model.id, term_model.name)
+                .filter(term_model.id.in_(set(resolved_ids.values())))
+                .all()
+            )
+            for key, term_id in resolved_ids.items():
+                result[key] = (term_id, names[term_id])
+
+        new_terms = {}
+        for value, category in values:
+            key = normalize_term(value)
+            if key in result or key in new_terms:
+                continue
+            term = term_model(name=value.strip(), normalized_name=key)
+            if kind == "interest":
+                term.category = category
+            db.add(term)
+            new_terms[key] = term
+
+        if new_terms:
+            db.flush()
+            for key, term in new_terms.items():
+                result[key] = (term.id, term.name)
+        return result
+
+    def normalize_interests(self, db: Session, interests: List[dict]) -> List[dict]:
+        """Attach ``interest_id`` and the canonical value to interest dicts"""
+        terms = self.get_or_create_terms(
+            db, "interest",
+            [(i.get("interest_value"), i.get("interest_category")) for i in interests]
+        )
+        normalized = []
+        for interest in interests:
+            term = terms.get(normalize_term(interest.get("interest_value")))
+            if not term:
+                continue
+            normalized.append({
+                **interest,
+                "interest_id": term[0],
+                "interest_value": term[1],
+            })
+        return normalized
+
+    def normalize_skills(self, db: Session, skills: List[dict]) -> List[dict]:
+        """Attach ``skill_id`` and the canonical name to skill dicts"""
+        terms = self.get_or_create_terms(
+            db, "skill",
+            [(s.get("skill_name"), None) for s in skills]
+        )
+        normalized = []
+        for skill in skills:
+            term = terms.get(normalize_term(skill.get("skill_name")))
+            if not term:
+                continue
+            normalized.append({
+                **skill,
+                "skill_id": term[0],
+                "skill_name": term[1],
+            })
+        return normalized
+
+    def match_interest_ids(self, db: Session, fragment: str) -> List[int]:
+        """Find interest term IDs whose name or alias contains the fragment"""
+        key = normalize_term(fragment)
+        if not key:
+            return []
+        term_ids = select(InterestTerm.id).where(
+            search_index.contains(InterestTerm, ["normalized_name"], key)
+        )
+        alias_ids = select(InterestAlias.term_id).where(
+            search_index.contains(InterestAlias, ["normalized_alias"], key)
+        )
+        return [row[0] for row in db.execute(term_ids.union(alias_ids))]
+
+    def interest_condition(self, db: Session, fragment: str):
+        """Filter for contact interests whose term or own category matches the fragment
+
+        The category is checked on each ``contact_interests`` row: a term's
+        ``category`` is only the one it was first seen under, and the same value
+        can be filed under different categories for different contacts.
+        """
+        return or_(
+            ContactInterest.interest_id.in_(self.match_interest_ids(db, fragment)),
+            search_index.contains(ContactInterest, ["interest_category"], fragment)
+        )
+
+    def match_skill_ids(self, db: Session, fragment: str) -> List[int]:
+        """Find skill term IDs whose name or alias contains the fragment"""
+        key = normalize_term(fragment)
+        if not key:
+            return []
+        term_ids = select(SkillTerm.id).where(
+            search_index.contains(SkillTerm, ["normalized_name"], key)
+        )
+        alias_ids = select(SkillAlias.term_id).where(
+            search_index.contains(SkillAlias, ["normalized_alias"], key)
+        )
+        return [row[0] for row in db.execute(term_ids.union(alias_ids))]
+
+    def add_alias(self, db: Session, kind: str, term_id: int, alias: str):
+        """Register an alias for an existing term and re-point rows that used it"""
+        term_model, alias_model = self._models(kind)
+        term = db.query(term_model).filter(term_model.id == term_id).first()
+        if not term:
+            raise ValueError(f"{kind.capitalize()} term {term_id} not found")
+
+        key = normalize_term(alias)
+        if not key:
+            raise ValueError("Alias must not be empty")
+        if key == term.normalized_name:
+            return term
+
+        existing = db.query(alias_model).filter(alias_model.normalized_alias == key).first()
+        if existing:
+            existing.term_id = term.id
+        else:
+            db.add(alias_model(term_id=term.id, alias=alias.strip(), normalized_alias=key))
+
+        # A standalone term with the same spelling is folded into the canonical one
+        duplicate = db.query(term_model).filter(term_model.normalized_name == key).first()
+        if duplicate and duplicate.id != term.id:
+            if kind == "interest":
+                db.query(ContactInterest).filter(ContactInterest.interest_id == duplicate.id)\
+                    .update({"interest_id": term.id, "interest_value": term.name}, synchronize_session=False)
+            else:
+                db.query(ContactSkill).filter(ContactSkill.skill_id == duplicate.id)\
+                    .update({"skill_id": term.id, "skill_name": term.name}, synchronize_session=False)
+            db.query(alias_model).filter(alias_model.term_id == duplicate.id)\
+                .update({"term_id": term.id}, synchronize_session=False)
+            db.delete(duplicate)
+
+        db.flush()
+        return term
+
+    def backfill(self, db: Session, batch_size: int = 500) -> Dict[str, int]:
+        """Link existing interest and skill rows that have no term ID yet"""
+        stats = {"interests_linked": 0, "skills_linked": 0}
+
+        last_id = 0
+        while True:
+            rows = db.query(ContactInterest)\
+                .filter(ContactInterest.interest_id.is_(None), ContactInterest.id > last_id)\
+                .order_by(ContactInterest.id)\
+                .limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            terms = self.get_or_create_terms(
+                db, "interest", [(r.interest_value, r.interest_category) for r in rows]
+            )
+            for row in rows:
+                term = terms.get(normalize_term(row.interest_value))
+                if term:
+                    row.interest_id, row.interest_value = term
+                    stats["interests_linked"] += 1
+            db.commit()
+
+        last_id = 0
+        while True:
+            rows = db.query(ContactSkill)\
+                .filter(ContactSkill.skill_id.is_(None), ContactSkill.id > last_id)\
+                .order_by(ContactSkill.id)\
+                .limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            terms = self.get_or_create_terms(db, "skill", [(r.skill_name, None) for r in rows])
+            for row in rows:
+                term = terms.get(normalize_term(row.skill_name))
+                if term:
+                    row.skill_id, row.skill_name = term
+                    stats["skills_linked"] += 1
+            db.commit()
+
+        return stats
+
+
+# Global instance
+taxonomy_service = TaxonomyService()
@@ -0,0 +1,143 @@
+"""
+Semantic search over transcript passages
+
+Only a summary of each contact is embedded in the contacts collection, so
+anything said in a recording that the extraction prompt did not capture
+cannot be found there. Transcripts are therefore also cut into overlapping
+windows of consecutive segments (about ``WINDOW_CHARS`` characters, sharing
+about ``OVERLAP_CHARS`` with the previous window so a sentence on a boundary
+is found whole in one of them), embedded in batches and stored in their own
+Chroma collection with the recording ID, time range and linked contacts as
+metadata.
+
+Contacts are looked up in ``audio_contact_links`` at search time, so results
+stay correct after contacts are merged or linked later. Transcripts stored
+before segments existed are windowed by characters and have no timestamps.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from ..models import AudioContactLink, AudioRecording, Contact
+from .vector_store import vector_store
+
+WINDOW_CHARS = 1000
+OVERLAP_CHARS = 200
+
+
+def chunk_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Overlapping windows of consecutive segments, each with its time range"""
+    windows = []
+    first = 0
+    while first < len(segments):
+        last, length = first, 0
+        while last < len(segments) and (last == first or length + len(segments[last]["text"]) <= WINDOW_CHARS):
+            length += len(segments[last]["text"]) + 1
+            last += 1
+        window = segments[first:last]
+        windows.append({
+            "start": window[0]["start"],
+            "end": window[-1]["end"],
+            "text": " ".join(segment["text"] for segment in window),
+        })
+        if last == len(segments):
+            break
+        # Start the next window at the segments making up the last OVERLAP_CHARS
+        following, overlap = last, 0
+        while following - 1 > first and overlap + len(segments[following - 1]["text"]) <= OVERLAP_CHARS:
+            following -= 1
+            overlap += len(segments[following]["text"]) + 1
+        first = following
+    return windows
+
+
+def chunk_text(text: str) -> List[Dict[str, Any]]:
+    """Overlapping windows of plain text, cut at spaces, for transcripts without segments"""
+    windows = []
+    start = 0
+    while start < len(text):
+        end = min(start + WINDOW_CHARS, len(text))
+        if end < len(text):
+            end = text.rfind(" ", start + OVERLAP_CHARS, end) + 1 or end
+        windows.append({"start": None, "end": None, "text": text[start:end].strip()})
+        if end == len(text):
+            break
+        next_start = text.find(" ", end - OVERLAP_CHARS, end) + 1
+        start = next_start if start < next_start < end else end
+    return [window for window in windows if window["text"]]
+
+
+class TranscriptIndexService:
+    """Keeps the transcript passage collection in step with the transcripts"""
+
+    def chunks(self, audio_record: AudioRecording) -> List[Dict[str, Any]]:
+        if audio_record.segments:
+            return chunk_segments([
+                {"start": s.start_seconds, "end": s.end_seconds, "text": s.text} for s in audio_record.segments
+            ])
+        return chunk_text(audio_record.transcription or "")
+
+    def index(self, audio_record: AudioRecording, batch_size: int = 100) -> int:
+        """Embed a recording's transcript passages, replacing any from an earlier transcript
+
+        Returns the number of passages; marks the transcript as indexed (not committed).
+        """
+        if audio_record.transcript is None:
+            return 0
+        chunks = []
+        contact_ids = ",".join(str(link.contact_id) for link in audio_record.contact_links)
+        for number, chunk in enumerate(self.chunks(audio_record)):
+            metadata = {"audio_id": audio_record.id, "chunk": number, "contact_ids": contact_ids}
+            if chunk["start"] is not None:
+                metadata["start"] = float(chunk["start"])
+            if chunk["end"] is not None:
+                metadata["end"] = float(chunk["end"])
+            chunks.append((f"{audio_record.id}:{number}", chunk["text"], metadata))
+
+        vector_store.delete_transcript_chunks(audio_record.id)
+        if chunks:
+            vector_store.add_transcript_chunks(chunks, batch_size=batch_size)
+        audio_record.transcript.embedded_at = datetime.now()
+        return len(chunks)
+
+    def search(self, db: Session, query: str, limit: int = 10,
+               contact_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Passages matching ``query`` with their recording, time range and contacts"""
+        audio_ids = None
+        if contact_id is not None:
+            audio_ids = [row.audio_recording_id for row in db.query(AudioContactLink.audio_recording_id)
+                         .filter(AudioContactLink.contact_id == contact_id)]
+        matches = vector_store.search_transcripts(query, limit, audio_ids)
+
+        recordings = {
+            recording.id: recording for recording in db.query(AudioRecording)
+            .options(selectinload(AudioRecording.contact_links).selectinload(AudioContactLink.contact))
+            .filter(AudioRecording.id.in_({match["metadata"]["audio_id"] for match in matches}))
+        }
+        results = []
+        for match in matches:
+            recording = recordings.get(match["metadata"]["audio_id"])
+            if recording is None:
+                continue  # Deleted since it was indexed
+            results.append({
+                "audio_id": recording.id,
+                "file_name": recording.file_name,
+                "start": match["metadata"].get("start"),
+                "end": match["metadata"].get("end"),
+                "text": match["text"],
+                "similarity_score": match["similarity_score"],
+                "contacts": [
+                    {"id": link.contact_id, "name": contact_name(link.contact), "speaker": link.speaker}
+                    for link in recording.contact_links if link.contact is not None
+                ],
+            })
+        return results
+
+
+def contact_name(contact: Contact) -> str:
+    return f"{contact.first_name} {contact.last_name or ''}".strip()
+
+
+# Global instance
+transcript_index = TranscriptIndexService()
@@ -0,0 +1,193 @@
+"""
+Transcription backends
+
+``settings.transcription_backend`` selects where speech is turned into text:
+
+- ``openai``: the hosted ``whisper-1`` API (default).
+- ``local``: Whisper on this machine's CPU, in a pool of
+  ``settings.transcription_workers`` processes. Each process loads the model
+  once when it starts and keeps it for every file it transcribes.
+  ``settings.local_whisper_engine`` picks faster-whisper (CTranslate2,
+  ``int8`` by default) or the reference ``openai-whisper`` package; neither
+  is needed unless the local backend is used.
+
+Every backend returns ``{"text", "segments", "language", "duration"}`` with
+segments as ``{"start", "end", "text"}`` in seconds. ``submit`` queues a file
+and returns a future, which is how ``audio_chunking.py`` transcribes the chunks of a
+long recording in parallel.
+"""
+import importlib.util
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import openai
+
+from ..core.config import settings
+
+# Engine -> module it needs
+LOCAL_ENGINES = {"faster-whisper": "faster_whisper", "openai-whisper": "whisper"}
+
+# Model loaded once per pool process by _init_local_worker
+_local_model = None
+_local_engine = None
+
+
+def _init_local_worker(engine: str, model_name: str, compute_type: str, cpu_threads: int):
+    """Pool initializer: load the Whisper model into this process"""
+    global _local_model, _local_engine
+    _local_engine = engine
+    if engine == "faster-whisper":
+        from faster_whisper import WhisperModel
+
+        _local_model = WhisperModel(
+            model_name, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads
+        )
+    else:
+        import torch
+        import whisper
+
+        torch.set_num_threads(cpu_threads)
+        _local_model = whisper.load_model(model_name, device="cpu")
+
+
+def _transcribe_local(path: str, language: Optional[str] = None) -> Dict[str, Any]:
+    """Transcribe one file with the model loaded in this pool process"""
+    if _local_engine == "faster-whisper":
+        segments, info = _local_model.transcribe(path, language=language, vad_filter=False)
+        segments = [{"start": s.start, "end": s.end, "text": s.text.strip()} for s in segments]
+        return {
+            "text": " ".join(s["text"] for s in segments).strip(),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration,
+        }
+
+    result = _local_model.transcribe(path, language=language, fp16=False)
+    segments = [
+        {"start": s["start"], "end": s["end"], "text": s["text"].strip()} for s in result["segments"]
+    ]
+    return {
+        "text": result["text"].strip(),
+        "segments": segments,
+        "language": result.get("language"),
+        "duration": segments[-1]["end"] if segments else 0.0,
+    }
+
+
+class OpenAITranscriber:
+    """Hosted Whisper API; ``submit`` sends up to ``concurrency`` requests at once"""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or settings.transcription_concurrency
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, language: Optional[str] = None):
+        """Queue a file and return its future (for transcribing several files at once)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="transcription"
+                )
+            return self._pool.submit(self.transcribe, path, language)
+
+    def transcribe(self, path: str, language: Optional[str] = None) -> Dict[str, Any]:
+        if not settings.openai_api_key:
+            raise RuntimeError("OpenAI API key not configured")
+        client = openai.OpenAI(api_key=settings.openai_api_key)
+
+        with open(path, "rb") as audio_file:
+            kwargs = {"language": language} if language else {}
+            transcript = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                response_format="verbose_json",
+                **kwargs
+            )
+
+        segments = [
+            {"start": s.start, "end": s.end, "text": s.text.strip()}
+            for s in (getattr(transcript, "segments", None) or [])
+        ]
+        return {
+            "text": transcript.text,
+            "segments": segments,
+            "language": getattr(transcript, "language", None),
+            "duration": getattr(transcript, "duration", None),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+class LocalWhisperTranscriber:
+    """Whisper on CPU in a process pool; the pool starts on first use"""
+
+    def __init__(
+        self,
+        engine: Optional[str] = None,
+        model_name: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        workers: Optional[int] = None,
+        cpu_threads: Optional[int] = None
+    ):
+        self.engine = engine or settings.local_whisper_engine
+        if self.engine not in LOCAL_ENGINES:
+            raise ValueError(f"Unknown local Whisper engine: {self.engine}")
+        self.model_name = model_name or settings.local_whisper_model
+        self.compute_type = compute_type or settings.local_whisper_compute_type
+        self.workers = workers or settings.transcription_workers
+        self.cpu_threads = cpu_threads or settings.transcription_cpu_threads
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                if importlib.util.find_spec(LOCAL_ENGINES[self.engine]) is None:
+                    raise RuntimeError(f"Local transcription requires the {self.engine} package")
+                # spawn: the API process has threads and open DB connections that must not be forked
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_local_worker,
+                    initargs=(self.engine, self.model_name, self.compute_type, self.cpu_threads)
+                )
+            return self._pool
+
+    def transcribe(self, path: str, language: Optional[str] = None) -> Dict[str, Any]:
+        return self._get_pool().submit(_transcribe_local, path, language).result()
+
+    def submit(self, path: str, language: Optional[str] = None):
+        """Queue a file and return its future (for transcribing several files at once)"""
+        return self._get_pool().submit(_transcribe_local, path, language)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+_transcriber = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber():
+    """The transcriber selected by ``settings.transcription_backend`` (created once)"""
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            backend = settings.transcription_backend
+            if backend == "openai":
+                _transcriber = OpenAITranscriber()
+            elif backend == "local":
+                _transcriber = LocalWhisperTranscriber()
+            else:
+                raise ValueError(f"Unknown transcription backend: {backend}")
+        return _transcriber
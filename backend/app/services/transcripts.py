@@ -0,0 +1,126 @@
+"""
+Transcript storage
+
+Writes transcripts to ``transcripts`` (full text, compressed with
+``settings.transcript_compression``) and ``transcript_segments`` (one row per
+timestamped Whisper segment), and reads segments back by time range or
+speaker without loading the full text.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Boolean, func, type_coerce
+from sqlalchemy.orm import Session
+
+from ..core.compression import compress_text
+from ..core.config import settings
+from ..models import AudioRecording, Transcript, TranscriptSegment
+
+
+def has_transcript():
+    """SQL condition: the recording has a non-empty transcript"""
+    return type_coerce(AudioRecording.transcript.has(Transcript.char_count > 0), Boolean)
+
+
+class TranscriptStore:
+    """Stores and queries recording transcripts"""
+
+    def save(
+        self,
+        db: Session,
+        audio_record: AudioRecording,
+        text: str,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        language: Optional[str] = None
+    ) -> Transcript:
+        """Replace a recording's transcript and segments (not committed)"""
+        data, codec = compress_text(text or "", settings.transcript_compression)
+        segments = [
+            TranscriptSegment(
+                position=position,
+                start_seconds=segment.get("start"),
+                end_seconds=segment.get("end"),
+                speaker=str(segment["speaker"])[:100] if segment.get("speaker") else None,
+                text=segment["text"]
+            )
+            for position, segment in enumerate(s for s in (segments or []) if s.get("text"))
+        ]
+        return self._store(db, audio_record, data, codec, len(text or ""), segments, language)
+
+    def copy(self, db: Session, audio_record: AudioRecording, source: AudioRecording) -> Transcript:
+        """Give a recording the transcript of another one without recompressing it"""
+        original = source.transcript
+        segments = [
+            TranscriptSegment(
+                position=segment.position,
+                start_seconds=segment.start_seconds,
+                end_seconds=segment.end_seconds,
+                speaker=segment.speaker,
+                text=segment.text
+            )
+            for segment in source.segments
+        ]
+        return self._store(db, audio_record, original.text_data, original.compression,
+                           original.char_count, segments, original.language)
+
+    def _store(self, db: Session, audio_record: AudioRecording, data: bytes, codec: str, char_count: int,
+               segments: List[TranscriptSegment], language: Optional[str]) -> Transcript:
+        transcript = audio_record.transcript or Transcript()
+        transcript.text_data = data
+        transcript.compression = codec
+        transcript.char_count = char_count
+        transcript.stored_bytes = len(data)
+        transcript.segment_count = len(segments)
+        transcript.language = language
+        transcript.embedded_at = None  # Passages of any earlier transcript are stale
+        audio_record.transcript = transcript
+        if audio_record.segments:
+            audio_record.segments = []
+            db.flush()  # Delete the old segments before their positions are reused
+        audio_record.segments = segments
+        return transcript
+
+    def find_segments(
+        self,
+        db: Session,
+        audio_id: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        speaker: Optional[str] = None
+    ) -> List[TranscriptSegment]:
+        """Segments of a recording overlapping ``start``-``end`` seconds, optionally by one speaker"""
+        query = db.query(TranscriptSegment).filter(TranscriptSegment.audio_recording_id == audio_id)
+        if start is not None:
+            query = query.filter(TranscriptSegment.end_seconds > start)
+        if end is not None:
+            query = query.filter(TranscriptSegment.start_seconds < end)
+        if speaker is not None:
+            query = query.filter(func.lower(TranscriptSegment.speaker) == speaker.lower())
+        return query.order_by(TranscriptSegment.position).all()
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Transcript count and storage, overall and by codec"""
+        rows = db.query(
+            Transcript.compression,
+            func.count(Transcript.id),
+            func.coalesce(func.sum(Transcript.char_count), 0),
+            func.coalesce(func.sum(Transcript.stored_bytes), 0),
+            func.coalesce(func.sum(Transcript.segment_count), 0),
+        ).group_by(Transcript.compression).all()
+        by_codec = {
+            codec: {"transcripts": count, "characters": chars, "stored_bytes": stored, "segments": segments}
+            for codec, count, chars, stored, segments in rows
+        }
+        characters = sum(row["characters"] for row in by_codec.values())
+        stored_bytes = sum(row["stored_bytes"] for row in by_codec.values())
+        return {
+            "transcripts": sum(row["transcripts"] for row in by_codec.values()),
+            "segments": sum(row["segments"] for row in by_codec.values()),
+            "characters": characters,
+            "stored_bytes": stored_bytes,
+            "compression_ratio": round(characters / stored_bytes, 2) if stored_bytes else None,
+            "by_compression": by_codec,
+        }
+
+
+# Global instance
+transcript_store = TranscriptStore()
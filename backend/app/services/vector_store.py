@@ -3,7 +3,7 @@ ChromaDB vector store service for semantic search
 """
 import chromadb
 from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import openai
 from ..core.config import settings
 
@@ -24,12 +24,18 @@ class VectorStoreService:
                 name=settings.chroma_collection_name,
                 metadata={"hnsw:space": "cosine"}
             )
+            # Passages of recording transcripts, kept apart from the one-per-contact summaries
+            self.transcript_collection = self.client.get_or_create_collection(
+                name=settings.chroma_transcript_collection_name,
+                metadata={"hnsw:space": "cosine"}
+            )
             self.openai_client = openai.OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
             print(f"Vector store initialized successfully")
         except Exception as e:
             print(f"Error initializing vector store: {e}")
             self.client = None
             self.collection = None
+            self.transcript_collection = None
             self.openai_client = None
     
     def generate_embedding(self, text: str) -> List[float]:
@@ -46,9 +52,22 @@ class VectorStoreService:
         except Exception as e:
             raise Exception(f"Failed to generate embedding: {str(e)}")
     
-    def add_contact_embedding(self, contact_id: int, contact_data: Dict[str, Any]):
-        """Add or update contact embedding in vector store"""
-        # Create searchable text from contact data
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts with a single OpenAI request"""
+        if not self.openai_client:
+            raise ValueError("OpenAI API key not configured")
+        
+        try:
+            response = self.openai_client.embeddings.create(
+                model="text-embedding-ada-002",
+                input=texts
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        except Exception as e:
+            raise Exception(f"Failed to generate embeddings: {str(e)}")
+    
+    def build_contact_document(self, contact_data: Dict[str, Any]) -> str:
+        """Create the searchable text embedded for a contact"""
         text_parts = []
         
         if contact_data.get('first_name'):
@@ -82,10 +101,29 @@ class VectorStoreService:
                 else:
                     text_parts.append(f"Skill: {skill}")
         
-        searchable_text = " ".join(text_parts)
+        return " ".join(text_parts)
+    
+    def build_contact_metadata(self, contact_id: int, contact_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create the metadata stored alongside a contact embedding"""
+        return {
+            "contact_id": contact_id,
+            "name": f"{contact_data.get('first_name', '')} {contact_data.get('last_name', '')}".strip(),
+            "job_title": contact_data.get('job_title', ''),
+            "company": contact_data.get('company', ''),
+            "location": contact_data.get('location', ''),
+        }
+    
+    def add_contact_embedding(self, contact_id: int, contact_data: Dict[str, Any]) -> bool:
+        """Add or update contact embedding in vector store; returns whether it was stored
+
+        A contact left without searchable text has its previous embedding removed.
+        """
+        # Create searchable text from contact data
+        searchable_text = self.build_contact_document(contact_data)
         
         if not searchable_text.strip():
-            return  # Skip if no meaningful text
+            self.delete_contact_embedding(contact_id)
+            return False
         
         try:
             # Generate embedding
@@ -96,16 +134,57 @@ class VectorStoreService:
                 ids=[str(contact_id)],
                 embeddings=[embedding],
                 documents=[searchable_text],
-                metadatas=[{
-                    "contact_id": contact_id,
-                    "name": f"{contact_data.get('first_name', '')} {contact_data.get('last_name', '')}".strip(),
-                    "job_title": contact_data.get('job_title', ''),
-                    "company": contact_data.get('company', ''),
-                    "location": contact_data.get('location', ''),
-                }]
+                metadatas=[self.build_contact_metadata(contact_id, contact_data)]
             )
+            return True
         except Exception as e:
             print(f"Error adding contact embedding: {e}")
+            return False
+    
+    def add_contact_embeddings(
+        self,
+        contacts: List[Tuple[int, Dict[str, Any]]],
+        batch_size: int = 100
+    ) -> Dict[int, Optional[str]]:
+        """Add or update many contact embeddings, one OpenAI request and one upsert per batch
+
+        Returns a mapping of contact ID to an error message (None when indexed).
+        """
+        outcome: Dict[int, Optional[str]] = {}
+        documents = []
+        for contact_id, contact_data in contacts:
+            searchable_text = self.build_contact_document(contact_data)
+            if searchable_text.strip():
+                documents.append((contact_id, contact_data, searchable_text))
+            else:
+                outcome[contact_id] = "No searchable text"
+        
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            try:
+                embeddings = self.generate_embeddings([text for _, _, text in batch])
+                self.collection.upsert(
+                    ids=[str(contact_id) for contact_id, _, _ in batch],
+                    embeddings=embeddings,
+                    documents=[text for _, _, text in batch],
+                    metadatas=[self.build_contact_metadata(contact_id, data) for contact_id, data, _ in batch]
+                )
+                for contact_id, _, _ in batch:
+                    outcome[contact_id] = None
+            except Exception as e:
+                print(f"Error adding contact embeddings: {e}")
+                for contact_id, _, _ in batch:
+                    outcome[contact_id] = str(e)
+        
+        return outcome
+    
+    def missing_contact_embeddings(self, contact_ids: List[int]) -> List[int]:
+        """The contacts among ``contact_ids`` that have no embedding stored"""
+        if not contact_ids or not self.collection:
+            return []
+        result = self.collection.get(ids=[str(contact_id) for contact_id in contact_ids], include=[])
+        stored = set(result["ids"])
+        return [contact_id for contact_id in contact_ids if str(contact_id) not in stored]
     
     def search_contacts(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search contacts using semantic similarity"""
@@ -173,6 +252,18 @@ class VectorStoreService:
         except Exception as e:
             print(f"Error deleting contact embedding: {e}")
     
+    def delete_contact_embeddings(self, contact_ids: List[int], batch_size: int = 500) -> List[str]:
+        """Delete many contact embeddings, ``batch_size`` IDs per call; returns the errors"""
+        errors = []
+        for start in range(0, len(contact_ids), batch_size):
+            batch = contact_ids[start:start + batch_size]
+            try:
+                self.collection.delete(ids=[str(contact_id) for contact_id in batch])
+            except Exception as e:
+                print(f"Error deleting contact embeddings: {e}")
+                errors.append(str(e))
+        return errors
+    
     def get_similar_contacts(self, contact_id: int, limit: int = 5) -> List[Dict[str, Any]]:
         """Find contacts similar to a given contact"""
         try:
@@ -211,12 +302,74 @@ class VectorStoreService:
             print(f"Error finding similar contacts: {e}")
             return []
     
+    def add_transcript_chunks(
+        self,
+        chunks: List[Tuple[str, str, Dict[str, Any]]],
+        batch_size: int = 100
+    ):
+        """Add or update transcript passages given as (id, text, metadata), one OpenAI request per batch
+
+        Raises on failure so the caller can leave the transcript marked as not indexed.
+        """
+        if not self.transcript_collection:
+            raise RuntimeError("ChromaDB collection not available")
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            embeddings = self.generate_embeddings([text for _, text, _ in batch])
+            self.transcript_collection.upsert(
+                ids=[chunk_id for chunk_id, _, _ in batch],
+                embeddings=embeddings,
+                documents=[text for _, text, _ in batch],
+                metadatas=[metadata for _, _, metadata in batch]
+            )
+    
+    def delete_transcript_chunks(self, audio_id: int):
+        """Delete every passage of a recording's transcript"""
+        try:
+            if self.transcript_collection:
+                self.transcript_collection.delete(where={"audio_id": audio_id})
+        except Exception as e:
+            print(f"Error deleting transcript chunks: {e}")
+    
+    def search_transcripts(
+        self,
+        query: str,
+        limit: int = 10,
+        audio_ids: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Transcript passages most similar to the query, optionally only from ``audio_ids``"""
+        if not self.openai_client or not self.transcript_collection:
+            return []
+        if audio_ids is not None and not audio_ids:
+            return []
+        if self.transcript_collection.count() == 0:
+            return []
+        
+        kwargs = {}
+        if audio_ids is not None:
+            kwargs["where"] = {"audio_id": {"$in": audio_ids}}
+        results = self.transcript_collection.query(
+            query_embeddings=[self.generate_embedding(query)],
+            n_results=limit,
+            include=["documents", "metadatas", "distances"],
+            **kwargs
+        )
+        return [
+            {
+                "similarity_score": 1 - results['distances'][0][i],
+                "metadata": results['metadatas'][0][i],
+                "text": results['documents'][0][i]
+            }
+            for i in range(len(results['ids'][0] if results['ids'] else []))
+        ]
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector store collection"""
         try:
             count = self.collection.count()
             return {
                 "total_embeddings": count,
+                "transcript_chunks": self.transcript_collection.count() if self.transcript_collection else 0,
                 "collection_name": settings.chroma_collection_name,
                 "persist_directory": settings.chroma_persist_directory
             }
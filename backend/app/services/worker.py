@@ -0,0 +1,174 @@
+"""
+Job worker pool
+
+Runs queued jobs (see ``JobService.enqueue``) on a pool of threads so slow
+model calls never hold an HTTP request open or block the event loop. Each
+worker polls for a job whose type has a handler, claims it with a lease, runs
+the handler with its own session and records the outcome. Failed attempts are
+retried with backoff, and a job whose worker died is claimed again once its
+lease expires. While a handler runs, a heartbeat thread renews the lease every
+third of ``settings.job_lease_seconds``, so long transcriptions are not taken
+over by another worker. When a job was queued with a ``callback_url`` the
+final job state is POSTed there, if the URL still passes ``callback_url_error``.
+
+Workers run inside the API process (``settings.job_workers``) and/or as
+separate processes started with ``run_workers.py``; throughput scales with the
+total number of workers, and they all coordinate through the jobs table.
+"""
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy.orm import Session
+
+from ..core.callbacks import callback_url_error
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import Job
+from .jobs import job_service
+
+JobHandler = Callable[[Session, Job], Optional[Dict[str, Any]]]
+
+# Errors that retrying cannot fix (missing records, invalid input)
+PERMANENT_ERRORS = (LookupError, ValueError)
+
+
+def default_handlers() -> Dict[str, JobHandler]:
+    """Handlers for every job type the worker pool runs"""
+    from .audio_processing import AUDIO_JOB_HANDLERS
+    from .audio_storage import AUDIO_STORAGE_JOB_HANDLERS
+    from .field_backfill import FIELD_BACKFILL_JOB_HANDLERS
+
+    return {**AUDIO_JOB_HANDLERS, **AUDIO_STORAGE_JOB_HANDLERS, **FIELD_BACKFILL_JOB_HANDLERS}
+
+
+class JobWorkerPool:
+    """A pool of threads that claim and run queued jobs"""
+
+    def __init__(
+        self,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None
+    ):
+        self.handlers = handlers if handlers is not None else default_handlers()
+        self.size = settings.job_workers if size is None else size
+        self.poll_interval = settings.job_poll_interval if poll_interval is None else poll_interval
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "JobWorkerPool":
+        self._stop.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.size):
+            thread = threading.Thread(
+                target=self._run, args=(f"{prefix}:{index}",), name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        if self.size:
+            print(f"Started {self.size} job workers for: {', '.join(sorted(self.handlers))}")
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Ask the workers to stop after their current job and wait for them"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once(worker_id)
+            except Exception as e:
+                print(f"Job worker {worker_id} error: {e}")
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self, worker_id: str) -> bool:
+        """Claim and run one job; returns False when the queue was empty"""
+        db = SessionLocal()
+        try:
+            job = job_service.claim(db, self.handlers, worker_id, self.lease_seconds)
+            if job is None:
+                return False
+            job_id, job_type, attempt = job.id, job.job_type, job.attempts
+
+            stop_heartbeat = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=(job_id, worker_id, attempt, stop_heartbeat),
+                name=f"job-heartbeat-{job_id}", daemon=True
+            )
+            heartbeat.start()
+            try:
+                result = self.handlers[job_type](db, job)
+                job = job_service.get(db, job_id)
+                if not self._still_owned(job, worker_id, attempt):
+                    return True
+                job_service.complete(db, job, result=result)
+            except Exception as e:
+                print(f"Job {job_id} ({job_type}) attempt {attempt} failed: {e}")
+                db.rollback()
+                job = job_service.get(db, job_id)
+                if not self._still_owned(job, worker_id, attempt):
+                    return True
+                if isinstance(e, PERMANENT_ERRORS):
+                    job_service.fail(db, job, str(e))
+                else:
+                    job_service.retry_or_fail(db, job, str(e))
+            finally:
+                stop_heartbeat.set()
+                heartbeat.join()
+
+            if job.status in ("completed", "failed"):
+                notify_callback(job)
+            return True
+        finally:
+            db.close()
+
+    def _heartbeat(self, job_id: int, worker_id: str, attempt: int, stop: threading.Event):
+        """Renew the job's lease until ``stop`` is set or the job is lost"""
+        interval = max(self.lease_seconds / 3, 1)
+        while not stop.wait(interval):
+            db = SessionLocal()
+            try:
+                if not job_service.heartbeat(db, job_id, worker_id, attempt, self.lease_seconds):
+                    return
+            except Exception as e:
+                print(f"Job {job_id} heartbeat failed: {e}")
+            finally:
+                db.close()
+
+    def _still_owned(self, job: Optional[Job], worker_id: str, attempt: int) -> bool:
+        # The lease expired and another worker took the job over; its outcome wins
+        if job is None or job.locked_by != worker_id or job.attempts != attempt:
+            print(f"Job {job.id if job else '?'} lease lost by {worker_id}, discarding result")
+            return False
+        return True
+
+
+def notify_callback(job: Job):
+    """POST the final job state to the job's ``callback_url``, if it has one"""
+    url = (job.params or {}).get("callback_url")
+    if not url:
+        return
+    error = callback_url_error(url)
+    if error:
+        print(f"Job {job.id} callback to {url} skipped: {error}")
+        return
+    try:
+        httpx.post(url, json={
+            "id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "result": job.result,
+            "error": job.error,
+        }, timeout=10, follow_redirects=False)
+    except Exception as e:
+        print(f"Job {job.id} callback to {url} failed: {e}")
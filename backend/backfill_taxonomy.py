@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Utility script to link existing interests and skills to the canonical taxonomy
+"""
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.taxonomy import taxonomy_service
+
+def backfill_taxonomy(batch_size: int = 500):
+    """Assign interest_id/skill_id to every interest and skill row missing one"""
+    db = SessionLocal()
+
+    try:
+        stats = taxonomy_service.backfill(db, batch_size=batch_size)
+
+        print(f"\nBackfill complete:")
+        print(f"Interests linked: {stats['interests_linked']}")
+        print(f"Skills linked: {stats['skills_linked']}")
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error during backfill: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Starting taxonomy backfill...")
+    backfill_taxonomy(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
+    print("Done!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one create_contact call per contact vs. the bulk upsert service
+
+Builds a throwaway SQLite database and loads the same synthetic contacts
+(each with interests and skills) both ways, reporting contacts per second.
+Embedding requests are network-bound and excluded from both paths.
+Run from backend directory: python benchmarks/bulk_upsert.py [num_contacts]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Point the app at a scratch database before any app module is imported
+db_file = os.path.join(tempfile.mkdtemp(), "bench_bulk.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+
+from app.api.v1.endpoints.contacts import ContactCreate, create_contact
+from app.core.database import Base, SessionLocal, engine
+from app.models import Contact, ContactInterest
+from app.services.bulk_contacts import bulk_contact_service
+from app.services.vector_store import vector_store
+from database.migrate import run_all_migrations
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Maria", "Ahmed", "Yuki", "Olga", "Pedro"]
+JOBS = ["Software Engineer", "Music Therapist", "Nurse", "Marketing Manager", "Musician", "Teacher"]
+CITIES = ["San Francisco, CA", "New York, NY", "Los Angeles, CA", "Austin, TX", "Chicago, IL"]
+INTERESTS = [("Music", "Piano"), ("Music", "Music Production"), ("Hobbies", "Gardening"),
+             ("Career", "Healthcare"), ("Volunteering", "Elderly Care"), ("Sports", "Hiking")]
+SKILLS = ["Python", "Piano", "Guitar", "Marketing", "Nursing", "Sound Engineering", "Teaching"]
+
+
+def make_contacts(prefix: str, num_contacts: int):
+    rng = random.Random(42)
+    contacts = []
+    for i in range(num_contacts):
+        contacts.append({
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": f"{prefix}{i}",
+            "email": f"{prefix}{i}@example.com",
+            "job_title": rng.choice(JOBS),
+            "location": rng.choice(CITIES),
+            "personal_notes": "Met at the community music night",
+            "interests": [
+                {"interest_category": c, "interest_value": v} for c, v in rng.sample(INTERESTS, 3)
+            ],
+            "skills": [{"skill_name": s} for s in rng.sample(SKILLS, 2)],
+        })
+    return contacts
+
+
+def main():
+    num_contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    Base.metadata.create_all(bind=engine)
+    run_all_migrations("upgrade")
+
+    # Embedding requests are network-bound; measure the database path only
+    vector_store.add_contact_embedding = lambda *args, **kwargs: None
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        for contact in make_contacts("single", num_contacts):
+            create_contact(ContactCreate(**contact), db)
+        single_seconds = time.perf_counter() - start
+
+        items = [ContactCreate(**c).dict(exclude_unset=True) for c in make_contacts("bulk", num_contacts)]
+        start = time.perf_counter()
+        summary = bulk_contact_service.upsert(db, items, chunk_size=500, embed=False)
+        bulk_seconds = time.perf_counter() - start
+        assert summary["created"] == num_contacts, summary["failed"]
+
+        assert db.query(func.count(Contact.id)).scalar() == 2 * num_contacts
+        assert db.query(func.count(ContactInterest.id)).scalar() == 6 * num_contacts
+
+        print(f"\n{'path':<14} {'seconds':>9} {'contacts/s':>11}")
+        print(f"{'per contact':<14} {single_seconds:>9.2f} {num_contacts / single_seconds:>11.0f}")
+        print(f"{'bulk':<14} {bulk_seconds:>9.2f} {num_contacts / bulk_seconds:>11.0f}")
+        print(f"speedup: {single_seconds / bulk_seconds:.1f}x")
+    finally:
+        db.close()
+        os.remove(db_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wall-clock time to transcribe one long recording in parallel chunks
+
+Splits the recording at pauses (see app/services/audio_chunking.py) and
+transcribes the chunks with the local backend at several pool sizes, then once
+more as a single file for comparison. Reports wall time and the speedup over
+one worker; with enough chunks it should grow roughly with the number of
+workers. Model loading is excluded. Needs ffmpeg and faster-whisper (or
+openai-whisper with --engine openai-whisper); nothing is written to the
+database.
+Run from backend directory:
+    python benchmarks/chunked_transcription.py session.mp3 [--workers 1 2 4] [--chunk-seconds 300]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.audio_chunking import SAMPLE_RATE, decode_audio, transcribe_recording, write_wav
+from app.services.transcription import LocalWhisperTranscriber
+
+
+def run(path: str, warmup_file: str, workers: int, chunk_seconds: float, args):
+    transcriber = LocalWhisperTranscriber(
+        engine=args.engine, model_name=args.model, compute_type=args.compute_type,
+        workers=workers, cpu_threads=args.cpu_threads
+    )
+    try:
+        # Load the model in every pool process before timing
+        wait([transcriber.submit(warmup_file) for _ in range(workers)])
+
+        start = time.perf_counter()
+        result = transcribe_recording(path, transcriber=transcriber, chunk_seconds=chunk_seconds)
+        return result, time.perf_counter() - start
+    finally:
+        transcriber.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked transcription wall-clock benchmark")
+    parser.add_argument("file", help="A long recording")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-seconds", type=float, default=settings.transcription_chunk_seconds or 300)
+    parser.add_argument("--cpu-threads", type=int, default=settings.transcription_cpu_threads)
+    parser.add_argument("--engine", default=settings.local_whisper_engine)
+    parser.add_argument("--model", default=settings.local_whisper_model)
+    parser.add_argument("--compute-type", default=settings.local_whisper_compute_type)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # One second of the recording is enough to load the model
+        warmup_file = os.path.join(workdir, "warmup.wav")
+        write_wav(warmup_file, decode_audio(args.file)[:SAMPLE_RATE])
+
+        result, single = run(args.file, warmup_file, 1, 0, args)
+        print(f"{result['duration']:.0f} s of audio, {args.engine} {args.model} ({args.compute_type}), "
+              f"{args.cpu_threads} thread(s) per process, {os.cpu_count()} CPUs")
+        print(f"single file, 1 worker: {single:.1f} s")
+
+        print(f"\n{'workers':>7} {'chunks':>6} {'wall s':>8} {'speedup':>8} {'segments':>9}")
+        baseline = None
+        for workers in args.workers:
+            result, elapsed = run(args.file, warmup_file, workers, args.chunk_seconds, args)
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {result['chunks']:>6} {elapsed:>8.1f} {baseline / elapsed:>8.2f} "
+                  f"{len(result['segments']):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row cost of encoding contact list responses
+
+Compares FastAPI's response_model path (validate every row against
+ContactResponse, jsonable_encoder, stdlib json) with FastJSONResponse (orjson
+straight from the row dicts), for full contacts built from ORM rows and for a
+``?fields=`` column projection built from SQL tuples. Building the dicts is
+included in both paths.
+Run from backend directory: python benchmarks/serialization.py [num_rows]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+# Point the app at a scratch database before any app module is imported
+db_file = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy.orm import selectinload, undefer_group
+
+from app.api.v1.endpoints.contacts import ContactResponse, format_contact_response
+from app.core.database import Base, SessionLocal, engine
+from app.core.responses import FastJSONResponse, orjson, row_serializer
+from app.models import Contact
+from app.services.bulk_contacts import bulk_contact_service
+from database.migrate import run_all_migrations
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Maria", "Ahmed", "Yuki", "Olga", "Pedro"]
+JOBS = ["Software Engineer", "Music Therapist", "Nurse", "Marketing Manager", "Musician", "Teacher"]
+CITIES = ["San Francisco, CA", "New York, NY", "Los Angeles, CA", "Austin, TX", "Chicago, IL"]
+INTERESTS = [("Music", "Piano"), ("Music", "Music Production"), ("Hobbies", "Gardening"),
+             ("Career", "Healthcare"), ("Volunteering", "Elderly Care"), ("Sports", "Hiking")]
+SKILLS = ["Python", "Piano", "Guitar", "Marketing", "Nursing", "Sound Engineering", "Teaching"]
+PROJECTION = ["id", "first_name", "last_name", "email", "company"]
+REPEATS = 5
+
+
+def make_contacts(num_contacts: int):
+    rng = random.Random(42)
+    return [{
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": f"Bench{i}",
+        "email": f"bench{i}@example.com",
+        "job_title": rng.choice(JOBS),
+        "company": "Acme",
+        "location": rng.choice(CITIES),
+        "business_needs": "Looking for a sound engineer for the spring concert",
+        "personal_notes": "Met at the community music night",
+        "interests": [{"interest_category": c, "interest_value": v} for c, v in rng.sample(INTERESTS, 3)],
+        "skills": [{"skill_name": s} for s in rng.sample(SKILLS, 2)],
+    } for i in range(num_contacts)]
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    Base.metadata.create_all(bind=engine)
+    run_all_migrations("upgrade")
+
+    db = SessionLocal()
+    try:
+        bulk_contact_service.upsert(db, make_contacts(num_rows), embed=False)
+        contacts = db.query(Contact).options(
+            undefer_group("large_text"), selectinload(Contact.interests), selectinload(Contact.skills)
+        ).all()
+        tuples = db.query(*[getattr(Contact, f) for f in PROJECTION]).all()
+
+        field = create_response_field(name="Response_get_contacts", type_=List[ContactResponse])
+
+        def validated_full():
+            content = [format_contact_response(c) for c in contacts]
+            encoded = asyncio.run(serialize_response(field=field, response_content=content))
+            return JSONResponse(encoded).body
+
+        def fast_full():
+            return FastJSONResponse([format_contact_response(c) for c in contacts]).body
+
+        def stdlib_projection():
+            return JSONResponse([dict(row._mapping) for row in tuples]).body
+
+        serialize = row_serializer(PROJECTION)
+
+        def fast_projection():
+            return FastJSONResponse([serialize(row) for row in tuples]).body
+
+        assert JSONResponse(asyncio.run(serialize_response(
+            field=field, response_content=[format_contact_response(c) for c in contacts]
+        ))).body.replace(b" ", b"") == fast_full().replace(b" ", b"")
+
+        print(f"\n{num_rows} rows, encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+        print(f"{'path':<34} {'ms':>8} {'us/row':>8}")
+        for name, fn in [
+            ("full rows, response_model", validated_full),
+            ("full rows, FastJSONResponse", fast_full),
+            ("projection, JSONResponse", stdlib_projection),
+            ("projection, FastJSONResponse", fast_projection),
+        ]:
+            seconds = best_of(fn)
+            print(f"{name:<34} {seconds * 1000:>8.2f} {seconds / num_rows * 1e6:>8.1f}")
+    finally:
+        db.close()
+        os.remove(db_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: real-time factor of local Whisper transcription per CPU core
+
+Transcribes the given recordings with the local backend at several pool
+sizes and reports the real-time factor (processing time / audio time) and
+the RTF per core, i.e. how many seconds of one core a second of audio costs.
+Model loading is excluded: every pool process transcribes the shortest file
+once before timing starts. Needs faster-whisper (or openai-whisper with
+--engine openai-whisper) and audio files; nothing is written to the database.
+Run from backend directory:
+    python benchmarks/transcription_rtf.py recordings/*.mp3 [--workers 1 2 4] [--model base]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.transcription import LocalWhisperTranscriber
+
+
+def run(files, workers: int, cpu_threads: int, engine: str, model: str, compute_type: str, warmup_file: str):
+    transcriber = LocalWhisperTranscriber(
+        engine=engine, model_name=model, compute_type=compute_type,
+        workers=workers, cpu_threads=cpu_threads
+    )
+    try:
+        # Load the model in every pool process before timing
+        wait([transcriber.submit(warmup_file) for _ in range(workers)])
+
+        start = time.perf_counter()
+        results = [future.result() for future in [transcriber.submit(path) for path in files]]
+        elapsed = time.perf_counter() - start
+    finally:
+        transcriber.close()
+
+    audio_seconds = sum(result["duration"] or 0 for result in results)
+    cores = workers * cpu_threads
+    rtf = elapsed / audio_seconds if audio_seconds else float("nan")
+    return audio_seconds, elapsed, rtf, rtf * cores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Whisper real-time factor benchmark")
+    parser.add_argument("files", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--cpu-threads", type=int, default=settings.transcription_cpu_threads)
+    parser.add_argument("--engine", default=settings.local_whisper_engine)
+    parser.add_argument("--model", default=settings.local_whisper_model)
+    parser.add_argument("--compute-type", default=settings.local_whisper_compute_type)
+    args = parser.parse_args()
+
+    warmup_file = min(args.files, key=os.path.getsize)
+    print(f"{len(args.files)} files, {args.engine} {args.model} ({args.compute_type}), "
+          f"{args.cpu_threads} thread(s) per process, {os.cpu_count()} CPUs")
+    print(f"\n{'workers':>7} {'audio s':>9} {'wall s':>9} {'RTF':>7} {'RTF/core':>9} {'audio h/h':>10}")
+    for workers in args.workers:
+        audio_seconds, elapsed, rtf, rtf_per_core = run(
+            args.files, workers, args.cpu_threads, args.engine, args.model, args.compute_type, warmup_file
+        )
+        print(f"{workers:>7} {audio_seconds:>9.1f} {elapsed:>9.1f} {rtf:>7.3f} {rtf_per_core:>9.3f} "
+              f"{audio_seconds / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
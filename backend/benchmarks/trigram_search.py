@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: '%term%' substring search as a full scan vs. a trigram index probe
+
+Builds a throwaway SQLite database with synthetic contacts (indexed by the
+FTS5 triggers as they are inserted) and times both strategies for a handful
+of fragments.
+Run from backend directory: python benchmarks/trigram_search.py [num_contacts]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Point the app at a scratch database before any app module is imported
+db_file = os.path.join(tempfile.mkdtemp(), "bench_trigram.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, or_
+
+from app.core.database import Base, SessionLocal, engine
+from app.models import Contact
+from app.services.search_index import search_index
+from database.migrate import run_all_migrations
+
+FIRST_NAMES = ["John", "Jane", "Michael", "Sarah", "David", "Maria", "Ahmed", "Yuki", "Olga", "Pedro"]
+LAST_NAMES = ["Doe", "Smith", "Johnson", "Williams", "Garcia", "Chen", "Kowalski", "Okafor", "Silva", "Kim"]
+JOBS = ["Software Engineer", "Music Therapist", "Nurse", "Marketing Manager", "Social Worker",
+        "Musician", "Teacher", "Accountant", "Sound Engineer", "Event Planner"]
+COMPANIES = ["Tech Corp", "Healing Arts Center", "City Hospital", "Creative Agency", "Harmony Studios",
+             "Community Services", "Music Production House", "Green Grocers", "Sign Makers Inc", "Acme"]
+CITIES = ["San Francisco, CA", "New York, NY", "Los Angeles, CA", "Austin, TX", "Chicago, IL",
+          "Seattle, WA", "Miami, FL", "Denver, CO", "Boston, MA", "Portland, OR"]
+WORDS = ["needs", "a", "storefront", "sign", "help", "with", "marketing", "loves", "singing", "guitar",
+         "volunteer", "elderly", "care", "website", "funding", "piano", "dog", "cat", "garden", "choir"]
+
+SEARCH_FIELDS = [
+    "first_name", "last_name", "email", "job_title",
+    "company", "location", "business_needs", "personal_notes"
+]
+FRAGMENTS = ["music", "storefront", "kowal", "engineer", "austin", "zzzz"]
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def populate(num_contacts: int):
+    rng = random.Random(42)
+    Base.metadata.create_all(bind=engine)
+    run_all_migrations("upgrade")
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = []
+        for i in range(num_contacts):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append({
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first}.{last}{i}@example.com".lower(),
+                "job_title": rng.choice(JOBS),
+                "company": rng.choice(COMPANIES),
+                "location": rng.choice(CITIES),
+                "business_needs": sentence(rng, 8),
+                "personal_notes": sentence(rng, 12),
+            })
+            if len(rows) == 5000:
+                db.execute(insert(Contact), rows)
+                rows = []
+        if rows:
+            db.execute(insert(Contact), rows)
+        db.commit()
+        print(f"Inserted and indexed {num_contacts} contacts in {time.perf_counter() - start:.2f}s")
+    finally:
+        db.close()
+
+
+def time_query(db, condition, repeat: int = 5):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = db.query(func.count(Contact.id)).filter(condition).scalar()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, count
+
+
+def main():
+    num_contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    populate(num_contacts)
+
+    db = SessionLocal()
+    try:
+        print(f"\n{'fragment':<12} {'matches':>8} {'scan ms':>10} {'trigram ms':>11} {'speedup':>8}")
+        for fragment in FRAGMENTS:
+            scan = or_(*[getattr(Contact, f).ilike(f"%{fragment}%") for f in SEARCH_FIELDS])
+            scan_ms, scan_count = time_query(db, scan)
+            trigram_ms, trigram_count = time_query(db, search_index.contains(Contact, SEARCH_FIELDS, fragment))
+            assert scan_count == trigram_count, f"result mismatch for {fragment!r}"
+            print(f"{fragment:<12} {scan_count:>8} {scan_ms:>10.2f} {trigram_ms:>11.2f} {scan_ms / trigram_ms:>7.1f}x")
+    finally:
+        db.close()
+        os.remove(db_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -63,19 +63,36 @@ def create_database():
         else:
             print(f"Database file already exists: {db_path}")
 
+def get_migration_files():
+    """List migration files in the order they must be applied"""
+    migrations_dir = Path(__file__).parent / "migrations"
+    return sorted(path.name for path in migrations_dir.glob("[0-9][0-9][0-9]_*.py"))
+
+
+def run_all_migrations(action: str = "upgrade"):
+    """Run every migration (in reverse order for downgrades)"""
+    migration_files = get_migration_files()
+    if action == "downgrade":
+        migration_files = list(reversed(migration_files))
+    
+    for migration_file in migration_files:
+        if not run_migration(migration_file, action):
+            return False
+    return True
+
 def run_initial_migration():
-    print("Running initial database migration...")
+    print("Running database migrations...")
     create_database()
-    run_migration("001_initial_schema.py", "upgrade")
+    run_all_migrations("upgrade")
 
 def main():
     """Main migration runner"""
     if len(sys.argv) < 2:
         print("Usage: python migrate.py <command> [migration_file]")
         print("Commands:")
-        print("  init     - Create database and run initial migration")
-        print("  upgrade  - Run upgrade migration")
-        print("  downgrade - Run downgrade migration")
+        print("  init     - Create database and run all migrations")
+        print("  upgrade  - Run upgrade migration (all migrations if no file given)")
+        print("  downgrade - Run downgrade migration (all migrations if no file given)")
         print("  reset    - Drop all tables and recreate")
         return
     
@@ -84,20 +101,24 @@ def main():
     if command == "init":
         print("Initializing database...")
         create_database()
-        run_migration("001_initial_schema.py", "upgrade")
+        run_all_migrations("upgrade")
         
     elif command == "upgrade":
-        migration_file = sys.argv[2] if len(sys.argv) > 2 else "001_initial_schema.py"
-        run_migration(migration_file, "upgrade")
+        if len(sys.argv) > 2:
+            run_migration(sys.argv[2], "upgrade")
+        else:
+            run_all_migrations("upgrade")
         
     elif command == "downgrade":
-        migration_file = sys.argv[2] if len(sys.argv) > 2 else "001_initial_schema.py"
-        run_migration(migration_file, "downgrade")
+        if len(sys.argv) > 2:
+            run_migration(sys.argv[2], "downgrade")
+        else:
+            run_all_migrations("downgrade")
         
     elif command == "reset":
         print("Resetting database...")
-        run_migration("001_initial_schema.py", "downgrade")
-        run_migration("001_initial_schema.py", "upgrade")
+        run_all_migrations("downgrade")
+        run_all_migrations("upgrade")
         
     else:
         print(f"Unknown command: {command}")
@@ -0,0 +1,124 @@
+"""
+Interest and skill taxonomy migration
+Creates the canonical interest/skill dictionaries, links existing rows to them
+and backfills the integer term IDs
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create taxonomy tables, add term ID columns and backfill them"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS interest_terms (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(200) NOT NULL,
+                    normalized_name VARCHAR(200) NOT NULL UNIQUE,
+                    category VARCHAR(100),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS interest_aliases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    term_id INTEGER NOT NULL,
+                    alias VARCHAR(200) NOT NULL,
+                    normalized_alias VARCHAR(200) NOT NULL UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (term_id) REFERENCES interest_terms (id)
+                )
+            """))
+
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS skill_terms (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(200) NOT NULL,
+                    normalized_name VARCHAR(200) NOT NULL UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS skill_aliases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    term_id INTEGER NOT NULL,
+                    alias VARCHAR(200) NOT NULL,
+                    normalized_alias VARCHAR(200) NOT NULL UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (term_id) REFERENCES skill_terms (id)
+                )
+            """))
+
+            # Link rows to the dictionaries
+            inspector = inspect(conn)
+            interest_columns = {c["name"] for c in inspector.get_columns("contact_interests")}
+            if "interest_id" not in interest_columns:
+                conn.execute(text("ALTER TABLE contact_interests ADD COLUMN interest_id INTEGER REFERENCES interest_terms (id)"))
+            skill_columns = {c["name"] for c in inspector.get_columns("contact_skills")}
+            if "skill_id" not in skill_columns:
+                conn.execute(text("ALTER TABLE contact_skills ADD COLUMN skill_id INTEGER REFERENCES skill_terms (id)"))
+
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_interests_interest_id ON contact_interests(interest_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_skills_skill_id ON contact_skills(skill_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_interest_aliases_term_id ON interest_aliases(term_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_skill_aliases_term_id ON skill_aliases(term_id)"))
+
+            conn.commit()
+
+        backfill()
+
+        print("Taxonomy schema created successfully!")
+
+    except Exception as e:
+        print(f"Error creating taxonomy schema: {e}")
+        raise
+
+
+def backfill():
+    """Link existing interest and skill rows to canonical terms"""
+    from app.core.database import SessionLocal
+    from app.services.taxonomy import taxonomy_service
+
+    db = SessionLocal()
+    try:
+        stats = taxonomy_service.backfill(db)
+        print(f"Taxonomy backfill: {stats['interests_linked']} interests, {stats['skills_linked']} skills linked")
+    finally:
+        db.close()
+
+
+def downgrade():
+    """Drop taxonomy tables (term ID columns are left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE contact_interests SET interest_id = NULL"))
+            conn.execute(text("UPDATE contact_skills SET skill_id = NULL"))
+            for table in ['interest_aliases', 'skill_aliases', 'interest_terms', 'skill_terms']:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+            conn.commit()
+
+        print("Taxonomy schema dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping taxonomy schema: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
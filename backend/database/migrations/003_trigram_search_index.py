@@ -0,0 +1,113 @@
+"""
+Trigram search index migration
+Creates FTS5 trigram tables over contacts and taxonomy terms, the triggers that
+keep them in sync on every write, and builds them from the existing rows
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+# FTS table -> (content table, indexed columns)
+FTS_TABLES = {
+    "contacts_fts": ("contacts", [
+        "first_name", "last_name", "email", "job_title",
+        "company", "location", "business_needs", "personal_notes"
+    ]),
+    "interest_terms_fts": ("interest_terms", ["normalized_name", "category"]),
+    "interest_aliases_fts": ("interest_aliases", ["normalized_alias"]),
+    "skill_terms_fts": ("skill_terms", ["normalized_name"]),
+    "skill_aliases_fts": ("skill_aliases", ["normalized_alias"]),
+}
+
+
+def upgrade():
+    """Create FTS5 trigram tables and sync triggers"""
+    if not settings.database_url.startswith("sqlite"):
+        print("Trigram search index is SQLite-only, skipping")
+        return
+    
+    try:
+        engine = create_engine(settings.database_url)
+        
+        with engine.connect() as conn:
+            for fts_table, (content_table, columns) in FTS_TABLES.items():
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": fts_table}
+                ).first()
+                if exists:
+                    continue
+                
+                column_list = ", ".join(columns)
+                new_values = ", ".join(f"new.{c}" for c in columns)
+                old_values = ", ".join(f"old.{c}" for c in columns)
+                
+                conn.execute(text(f"""
+                    CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                        {column_list},
+                        content='{content_table}',
+                        content_rowid='id',
+                        tokenize='trigram'
+                    )
+                """))
+                conn.execute(text(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} BEGIN
+                        INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                    END
+                """))
+                conn.execute(text(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} BEGIN
+                        INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    END
+                """))
+                conn.execute(text(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {content_table} BEGIN
+                        INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                        INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                    END
+                """))
+                
+                # Index the rows written before the table existed
+                conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+            
+            conn.commit()
+        
+        print("Trigram search index created successfully!")
+        
+    except Exception as e:
+        print(f"Error creating trigram search index: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the FTS tables and their triggers"""
+    if not settings.database_url.startswith("sqlite"):
+        return
+    
+    try:
+        engine = create_engine(settings.database_url)
+        
+        with engine.connect() as conn:
+            for fts_table in FTS_TABLES:
+                for suffix in ["ai", "ad", "au"]:
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}"))
+                conn.execute(text(f"DROP TABLE IF EXISTS {fts_table}"))
+            
+            conn.commit()
+        
+        print("Trigram search index dropped successfully!")
+        
+    except Exception as e:
+        print(f"Error dropping trigram search index: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,74 @@
+"""
+Contact import migration
+Creates the jobs table used to report progress of long-running work such as
+spreadsheet imports, and indexes lower(email) for upsert matching
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create the jobs table and the email lookup index"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_type VARCHAR(50) NOT NULL,
+                    status VARCHAR(50) DEFAULT 'pending',
+                    params JSON,
+                    total INTEGER,
+                    processed INTEGER DEFAULT 0,
+                    succeeded INTEGER DEFAULT 0,
+                    failed INTEGER DEFAULT 0,
+                    result JSON,
+                    error TEXT,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_job_type ON jobs(job_type)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs(status)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contacts_email_lower ON contacts(lower(email))"))
+
+            conn.commit()
+
+        print("Contact import schema created successfully!")
+
+    except Exception as e:
+        print(f"Error creating contact import schema: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the jobs table and the email lookup index"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS jobs"))
+            conn.execute(text("DROP INDEX IF EXISTS ix_contacts_email_lower"))
+            conn.commit()
+
+        print("Contact import schema dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping contact import schema: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
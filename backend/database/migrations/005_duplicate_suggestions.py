@@ -0,0 +1,71 @@
+"""
+Duplicate contact suggestions migration
+Creates the table holding scored duplicate pairs found by the dedupe job
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create the duplicate suggestions table"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS contact_duplicate_suggestions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    contact_id INTEGER NOT NULL,
+                    duplicate_contact_id INTEGER NOT NULL,
+                    score FLOAT NOT NULL,
+                    features JSON,
+                    status VARCHAR(50) DEFAULT 'pending',
+                    job_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE CASCADE,
+                    FOREIGN KEY (duplicate_contact_id) REFERENCES contacts (id) ON DELETE CASCADE,
+                    FOREIGN KEY (job_id) REFERENCES jobs (id),
+                    CONSTRAINT uq_duplicate_suggestion_pair UNIQUE (contact_id, duplicate_contact_id)
+                )
+            """))
+
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_duplicate_suggestions_contact_id ON contact_duplicate_suggestions(contact_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_duplicate_suggestions_duplicate_contact_id ON contact_duplicate_suggestions(duplicate_contact_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_duplicate_suggestions_status ON contact_duplicate_suggestions(status)"))
+
+            conn.commit()
+
+        print("Duplicate suggestions table created successfully!")
+
+    except Exception as e:
+        print(f"Error creating duplicate suggestions table: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the duplicate suggestions table"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS contact_duplicate_suggestions"))
+            conn.commit()
+
+        print("Duplicate suggestions table dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping duplicate suggestions table: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
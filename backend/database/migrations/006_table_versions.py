@@ -0,0 +1,85 @@
+"""
+Table versions migration
+Creates per-table version counters and the triggers that bump them on every
+insert, update and delete, used to build ETags without reading the rows
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+VERSIONED_TABLES = [
+    "contacts",
+    "contact_interests",
+    "contact_skills",
+    "events",
+    "event_participations",
+]
+
+
+def upgrade():
+    """Create the table_versions table and its triggers"""
+    if not settings.database_url.startswith("sqlite"):
+        print("Table version triggers are SQLite-only, skipping")
+        return
+
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS table_versions (
+                    table_name VARCHAR(100) PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """))
+
+            for table in VERSIONED_TABLES:
+                conn.execute(
+                    text("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (:name, 0)"),
+                    {"name": table}
+                )
+                for operation in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(text(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_version_{operation.lower()}
+                        AFTER {operation} ON {table} BEGIN
+                            UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                        END
+                    """))
+
+            conn.commit()
+
+        print("Table versions created successfully!")
+
+    except Exception as e:
+        print(f"Error creating table versions: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the version triggers and the table_versions table"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            for table in VERSIONED_TABLES:
+                for operation in ("insert", "update", "delete"):
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_version_{operation}"))
+            conn.execute(text("DROP TABLE IF EXISTS table_versions"))
+            conn.commit()
+
+        print("Table versions dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping table versions: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,54 @@
+"""
+Contact archive migration
+Adds the archived_at column used to soft-archive contacts
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Add contacts.archived_at and its index"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("contacts")}
+            if "archived_at" not in columns:
+                conn.execute(text("ALTER TABLE contacts ADD COLUMN archived_at TIMESTAMP"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contacts_archived_at ON contacts(archived_at)"))
+            conn.commit()
+
+        print("Contact archive column created successfully!")
+
+    except Exception as e:
+        print(f"Error creating contact archive column: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the archive index and un-archive every contact (the column is left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_contacts_archived_at"))
+            conn.execute(text("UPDATE contacts SET archived_at = NULL"))
+            conn.commit()
+
+        print("Contact archive column dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping contact archive column: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,57 @@
+"""
+Audio upload metadata migration
+Adds the file size and SHA-256 content hash recorded while uploads stream to disk
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Add audio_recordings.file_size and content_hash"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "file_size" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN file_size BIGINT"))
+            if "content_hash" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN content_hash VARCHAR(64)"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_audio_recordings_content_hash ON audio_recordings(content_hash)"
+            ))
+            conn.commit()
+
+        print("Audio upload metadata created successfully!")
+
+    except Exception as e:
+        print(f"Error creating audio upload metadata: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the content hash index (the columns are left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_audio_recordings_content_hash"))
+            conn.commit()
+
+        print("Audio upload metadata dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping audio upload metadata: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,62 @@
+"""
+Job queue migration
+Adds the attempt, retry and lease columns used by the job worker pool
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+QUEUE_COLUMNS = {
+    "attempts": "INTEGER DEFAULT 0",
+    "max_attempts": "INTEGER DEFAULT 1",
+    "run_after": "TIMESTAMP",
+    "lease_expires_at": "TIMESTAMP",
+    "locked_by": "VARCHAR(100)",
+}
+
+
+def upgrade():
+    """Add queue columns to jobs"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("jobs")}
+            for name, definition in QUEUE_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(text(f"ALTER TABLE jobs ADD COLUMN {name} {definition}"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_queue ON jobs(status, job_type, run_after)"))
+            conn.commit()
+
+        print("Job queue columns created successfully!")
+
+    except Exception as e:
+        print(f"Error creating job queue columns: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the queue index (the columns are left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_jobs_queue"))
+            conn.commit()
+
+        print("Job queue columns dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping job queue columns: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
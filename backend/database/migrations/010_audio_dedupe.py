@@ -0,0 +1,64 @@
+"""
+Audio deduplication migration
+Links repeated uploads of the same recording to the first one and stores the
+extraction result so duplicates can reuse it
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Add audio_recordings.duplicate_of_id, extraction_result and the reuse flags"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "duplicate_of_id" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE audio_recordings ADD COLUMN duplicate_of_id INTEGER REFERENCES audio_recordings(id)"
+                ))
+            if "extraction_result" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN extraction_result JSON"))
+            if "transcription_reused" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN transcription_reused BOOLEAN DEFAULT 0"))
+            if "extraction_reused" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN extraction_reused BOOLEAN DEFAULT 0"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_audio_recordings_duplicate_of_id ON audio_recordings(duplicate_of_id)"
+            ))
+            conn.commit()
+
+        print("Audio dedupe columns created successfully!")
+
+    except Exception as e:
+        print(f"Error creating audio dedupe columns: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the duplicate index (the columns are left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_audio_recordings_duplicate_of_id"))
+            conn.commit()
+
+        print("Audio dedupe columns dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping audio dedupe columns: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,73 @@
+"""
+Extraction cache migration
+Stores extraction results keyed by transcript and prompt hash, and records the
+prompt version behind each recording's extraction
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create the extraction cache table and audio_recordings.extraction_prompt_hash"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS extraction_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    transcript_hash VARCHAR(64) NOT NULL,
+                    prompt_hash VARCHAR(64) NOT NULL,
+                    model VARCHAR(50),
+                    result JSON NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    last_hit_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT uq_extraction_cache_key UNIQUE (transcript_hash, prompt_hash)
+                )
+            """))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_extraction_cache_prompt_hash ON extraction_cache(prompt_hash)"))
+
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "extraction_prompt_hash" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN extraction_prompt_hash VARCHAR(64)"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_audio_recordings_extraction_prompt_hash "
+                "ON audio_recordings(extraction_prompt_hash)"
+            ))
+            conn.commit()
+
+        print("Extraction cache table created successfully!")
+
+    except Exception as e:
+        print(f"Error creating extraction cache table: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the extraction cache table (the audio_recordings column is left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_audio_recordings_extraction_prompt_hash"))
+            conn.execute(text("DROP TABLE IF EXISTS extraction_cache"))
+            conn.commit()
+
+        print("Extraction cache table dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping extraction cache table: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,69 @@
+"""
+Audio contact links migration
+Links every person extracted from a recording to it, not just the main contact
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create the audio contact links table"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS audio_contact_links (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    audio_recording_id INTEGER NOT NULL,
+                    contact_id INTEGER NOT NULL,
+                    speaker VARCHAR(100),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (audio_recording_id) REFERENCES audio_recordings (id) ON DELETE CASCADE,
+                    FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE CASCADE,
+                    CONSTRAINT uq_audio_contact_link UNIQUE (audio_recording_id, contact_id)
+                )
+            """))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_audio_contact_links_audio_recording_id ON audio_contact_links(audio_recording_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_audio_contact_links_contact_id ON audio_contact_links(contact_id)"))
+
+            # Existing recordings are linked to their one contact
+            conn.execute(text("""
+                INSERT OR IGNORE INTO audio_contact_links (audio_recording_id, contact_id)
+                SELECT id, contact_id FROM audio_recordings WHERE contact_id IS NOT NULL
+            """))
+            conn.commit()
+
+        print("Audio contact links table created successfully!")
+
+    except Exception as e:
+        print(f"Error creating audio contact links table: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the audio contact links table"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS audio_contact_links"))
+            conn.commit()
+
+        print("Audio contact links table dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping audio contact links table: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,109 @@
+"""
+Transcripts migration
+Moves transcripts out of audio_recordings into compressed rows with timestamped segments
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.compression import compress_text, decompress_text
+from app.core.config import settings
+
+
+def upgrade():
+    """Create the transcript tables and move existing transcriptions into them"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    audio_recording_id INTEGER NOT NULL UNIQUE,
+                    compression VARCHAR(10) NOT NULL DEFAULT 'none',
+                    text_data BLOB NOT NULL,
+                    char_count INTEGER NOT NULL DEFAULT 0,
+                    stored_bytes INTEGER NOT NULL DEFAULT 0,
+                    segment_count INTEGER NOT NULL DEFAULT 0,
+                    language VARCHAR(20),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (audio_recording_id) REFERENCES audio_recordings (id) ON DELETE CASCADE
+                )
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS transcript_segments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    audio_recording_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    start_seconds FLOAT,
+                    end_seconds FLOAT,
+                    speaker VARCHAR(100),
+                    text TEXT NOT NULL,
+                    FOREIGN KEY (audio_recording_id) REFERENCES audio_recordings (id) ON DELETE CASCADE,
+                    CONSTRAINT uq_transcript_segment_position UNIQUE (audio_recording_id, position)
+                )
+            """))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_transcripts_id ON transcripts(id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_transcript_segments_id ON transcript_segments(id)"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_transcript_segments_recording_start "
+                "ON transcript_segments(audio_recording_id, start_seconds)"
+            ))
+
+            # Existing transcriptions have no timestamps, so they get no segments
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "transcription" in columns:
+                rows = conn.execute(text(
+                    "SELECT id, transcription FROM audio_recordings WHERE transcription IS NOT NULL"
+                )).fetchall()
+                for audio_id, transcription in rows:
+                    data, codec = compress_text(transcription, settings.transcript_compression)
+                    conn.execute(text("""
+                        INSERT OR IGNORE INTO transcripts
+                            (audio_recording_id, compression, text_data, char_count, stored_bytes, segment_count)
+                        VALUES (:audio_id, :codec, :data, :chars, :stored, 0)
+                    """), {"audio_id": audio_id, "codec": codec, "data": data,
+                           "chars": len(transcription), "stored": len(data)})
+                conn.execute(text("UPDATE audio_recordings SET transcription = NULL WHERE transcription IS NOT NULL"))
+            conn.commit()
+
+        print("Transcript tables created successfully!")
+
+    except Exception as e:
+        print(f"Error creating transcript tables: {e}")
+        raise
+
+
+def downgrade():
+    """Copy transcripts back into audio_recordings and drop the transcript tables"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "transcription" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN transcription TEXT"))
+            rows = conn.execute(text(
+                "SELECT audio_recording_id, compression, text_data FROM transcripts"
+            )).fetchall()
+            for audio_id, codec, data in rows:
+                conn.execute(text("UPDATE audio_recordings SET transcription = :text WHERE id = :audio_id"),
+                             {"text": decompress_text(data, codec), "audio_id": audio_id})
+            conn.execute(text("DROP TABLE IF EXISTS transcript_segments"))
+            conn.execute(text("DROP TABLE IF EXISTS transcripts"))
+            conn.commit()
+
+        print("Transcript tables dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping transcript tables: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,41 @@
+"""
+Transcript embeddings migration
+Records when a transcript's passages were added to the vector store
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Add transcripts.embedded_at"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("transcripts")}
+            if "embedded_at" not in columns:
+                conn.execute(text("ALTER TABLE transcripts ADD COLUMN embedded_at TIMESTAMP"))
+            conn.commit()
+
+        print("Transcript embedding column created successfully!")
+
+    except Exception as e:
+        print(f"Error creating transcript embedding column: {e}")
+        raise
+
+
+def downgrade():
+    """Nothing to undo (the column is left in place)"""
+    print("Transcript embedding column left in place")
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,60 @@
+"""
+Audio transcoding migration
+Tracks recordings whose files were transcoded and whose originals were archived
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+
+def upgrade():
+    """Add stored_size, original_path and transcoded_at to audio_recordings"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("audio_recordings")}
+            if "stored_size" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN stored_size BIGINT"))
+            if "original_path" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN original_path VARCHAR(500)"))
+            if "transcoded_at" not in columns:
+                conn.execute(text("ALTER TABLE audio_recordings ADD COLUMN transcoded_at TIMESTAMP"))
+            # Recordings sharing a file are looked up and updated together by path
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_audio_recordings_file_path ON audio_recordings(file_path)"
+            ))
+            conn.commit()
+
+        print("Audio transcoding columns created successfully!")
+
+    except Exception as e:
+        print(f"Error creating audio transcoding columns: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the file_path index (the columns are left in place)"""
+    try:
+        engine = create_engine(settings.database_url)
+
+        with engine.connect() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_audio_recordings_file_path"))
+            conn.commit()
+
+        print("Audio transcoding index dropped successfully!")
+
+    except Exception as e:
+        print(f"Error dropping audio transcoding index: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -283,6 +283,19 @@ def seed_query_history(conn):
     print(f"Seeded {len(queries)} query history entries")
 
 
+def link_taxonomy():
+    """Link seeded interests and skills to canonical taxonomy terms"""
+    from app.core.database import SessionLocal
+    from app.services.taxonomy import taxonomy_service
+    
+    db = SessionLocal()
+    try:
+        stats = taxonomy_service.backfill(db)
+        print(f"Linked {stats['interests_linked']} interests and {stats['skills_linked']} skills to the taxonomy")
+    finally:
+        db.close()
+
+
 def main():
     """Main seeding function"""
     try:
@@ -306,6 +319,8 @@ def main():
             
             conn.commit()
             print("Database seeding completed successfully!")
+        
+        link_taxonomy()
             
     except Exception as e:
         print(f"Error seeding database: {e}")
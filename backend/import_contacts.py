@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Utility script to import contacts from a CSV or XLSX spreadsheet
+
+Usage: python import_contacts.py people.csv [--mapping mapping.json] [--chunk-size 1000] [--no-embed]
+"""
+import argparse
+import json
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.contact_import import contact_import_service, detect_format
+from app.services.jobs import job_service
+
+def import_contacts(path: str, mapping_path: str = None, chunk_size: int = 1000, embed: bool = True):
+    """Import a spreadsheet, recording progress on a contact_import job"""
+    file_format = detect_format(path)
+    mapping = None
+    if mapping_path:
+        with open(mapping_path) as f:
+            mapping = json.load(f)
+
+    db = SessionLocal()
+
+    try:
+        job = job_service.create(db, "contact_import", {
+            "file_name": os.path.basename(path),
+            "format": file_format,
+            "mapping": mapping,
+            "chunk_size": chunk_size,
+            "embed": embed
+        })
+        print(f"Created job {job.id}")
+
+        stats = contact_import_service.run(db, job.id, path, file_format, mapping, chunk_size, embed)
+
+        print(f"\nImport complete:")
+        print(f"Created: {stats['created']}")
+        print(f"Updated: {stats['updated']}")
+        print(f"Failed: {stats['failed']}")
+        for error in stats["errors"][:20]:
+            print(f"  Row {error['row']}: {error['error']}")
+
+    except Exception as e:
+        print(f"Error during import: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import contacts from a spreadsheet")
+    parser.add_argument("path", help="CSV or XLSX file")
+    parser.add_argument("--mapping", help="JSON file describing the column mapping")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--no-embed", action="store_true", help="Skip vector store embeddings")
+    args = parser.parse_args()
+
+    print("Starting contact import...")
+    import_contacts(args.path, args.mapping, args.chunk_size, not args.no_embed)
+    print("Done!")
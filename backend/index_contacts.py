@@ -9,6 +9,8 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.core.database import SessionLocal
+from sqlalchemy.orm import undefer_group
+
 from app.models import Contact
 from app.services.vector_store import vector_store
 
@@ -18,7 +20,7 @@ def index_all_contacts():
     
     try:
         # Get all contacts
-        contacts = db.query(Contact).all()
+        contacts = db.query(Contact).options(undefer_group("large_text")).all()
         print(f"Found {len(contacts)} contacts to index")
         
         indexed_count = 0
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Utility script to index recording transcripts for passage search
+
+Embeds the transcripts not indexed yet (transcribed before transcript search
+existed, or whose indexing failed), or all of them with --all.
+
+Usage: python index_transcripts.py [--all] [--batch-size 100]
+"""
+import argparse
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import selectinload
+
+from app.core.database import SessionLocal
+from app.models import AudioRecording, Transcript
+from app.services.transcript_index import transcript_index
+from app.services.vector_store import vector_store
+
+def index_transcripts(reindex: bool = False, batch_size: int = 100):
+    """Embed transcript passages, one recording at a time"""
+    db = SessionLocal()
+    
+    try:
+        query = db.query(AudioRecording.id).join(Transcript)
+        if not reindex:
+            query = query.filter(Transcript.embedded_at.is_(None))
+        audio_ids = [row.id for row in query.order_by(AudioRecording.id)]
+        print(f"Found {len(audio_ids)} transcripts to index")
+        
+        indexed_count = 0
+        chunk_count = 0
+        failed_count = 0
+        
+        for audio_id in audio_ids:
+            recording = db.query(AudioRecording)\
+                .options(selectinload(AudioRecording.segments), selectinload(AudioRecording.contact_links))\
+                .filter(AudioRecording.id == audio_id).first()
+            try:
+                chunks = transcript_index.index(recording, batch_size=batch_size)
+                db.commit()
+                indexed_count += 1
+                chunk_count += chunks
+                print(f"Indexed recording {audio_id}: {chunks} passages")
+            except Exception as e:
+                db.rollback()
+                failed_count += 1
+                print(f"Failed to index recording {audio_id}: {e}")
+        
+        print(f"\nIndexing complete:")
+        print(f"Successfully indexed: {indexed_count} recordings, {chunk_count} passages")
+        print(f"Failed: {failed_count}")
+        
+        stats = vector_store.get_collection_stats()
+        print(f"Vector store now contains {stats.get('transcript_chunks', 0)} transcript passages")
+        
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index recording transcripts for passage search")
+    parser.add_argument("--all", action="store_true", help="Re-index transcripts that are already indexed")
+    parser.add_argument("--batch-size", type=int, default=100, help="Passages embedded per OpenAI request")
+    args = parser.parse_args()
+    
+    if not vector_store.openai_client:
+        parser.error("OpenAI API key not configured")
+    
+    print("Starting transcript indexing...")
+    index_transcripts(reindex=args.all, batch_size=args.batch_size)
+    print("Done!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Utility script to ingest a directory of audio recordings
+
+Registers every recording in the directory and transcribes it, extracts
+contacts from it and embeds them, with a pool of workers per stage. Running it
+again resumes where it stopped; with --watch it keeps picking up new files
+until interrupted.
+
+Usage: python ingest_audio.py recordings/ [--watch 30] [--transcribe-workers 2] [--extract-workers 2]
+                                          [--embed-batch-size 50] [--queue-size 8] [--people] [--no-extract] [--no-embed]
+"""
+import argparse
+import asyncio
+import signal
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.audio_ingest import STAGES, AudioIngestPipeline
+
+def print_summary(stats: dict):
+    """Per-stage counts and throughput of a run"""
+    hours = stats.get("elapsed_seconds", 0) / 3600
+    audio_hours = stats["audio_seconds"] / 3600
+    print(f"\nIngestion summary ({stats.get('elapsed_seconds', 0):.0f} s):")
+    for stage in STAGES:
+        print(f"{stage.capitalize():<11} {stats[stage]:>6} done, {stats['failed'][stage]} failed")
+    print(f"Already processed: {stats['already_done']}")
+    print(f"Audio transcribed: {audio_hours:.2f} h")
+    if hours:
+        print(f"Throughput: {stats['transcribe'] / hours:.1f} files/hour, "
+              f"{audio_hours / hours:.2f} audio-hours/hour")
+
+def ingest_audio(directory: str, watch: float = None, **options):
+    """Run the ingestion pipeline over a directory and print a summary"""
+    pipeline = AudioIngestPipeline(directory, **options)
+    # Stop on SIGTERM as on Ctrl-C, so a supervised daemon still prints its summary
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(pipeline.run(watch_interval=watch))
+    except KeyboardInterrupt:
+        print("\nInterrupted; run again to resume")
+    finally:
+        print_summary(pipeline.stats)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a directory of audio recordings")
+    parser.add_argument("directory", help="Directory to scan for .mp3, .wav, .m4a and .flac files")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep scanning every SECONDS for new files")
+    parser.add_argument("--transcribe-workers", type=int, default=2)
+    parser.add_argument("--extract-workers", type=int, default=2)
+    parser.add_argument("--embed-batch-size", type=int, default=50)
+    parser.add_argument("--queue-size", type=int, default=8, help="Recordings waiting per stage before the previous one pauses")
+    parser.add_argument("--no-recursive", action="store_true", help="Only scan the top-level directory")
+    parser.add_argument("--no-extract", action="store_true", help="Only register and transcribe")
+    parser.add_argument("--people", action="store_true", help="Extract every person in a recording, not just one")
+    parser.add_argument("--no-embed", action="store_true", help="Skip vector store embeddings")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"{args.directory} is not a directory")
+
+    print("Starting audio ingestion...")
+    ingest_audio(
+        args.directory,
+        watch=args.watch,
+        transcribe_workers=args.transcribe_workers,
+        extract_workers=args.extract_workers,
+        embed_batch_size=args.embed_batch_size,
+        queue_size=args.queue_size,
+        extract=not args.no_extract,
+        embed=not args.no_embed,
+        recursive=not args.no_recursive,
+        extract_mode="people" if args.people else "single"
+    )
+    print("Done!")
@@ -6,27 +6,37 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.database import engine
+from app.core.uploads import UploadSizeLimitMiddleware
 from app.models import Contact, ContactInterest, ContactSkill, AudioRecording, Event, EventParticipation, QueryHistory
 from app.api.v1.api import api_router
+from app.services.worker import JobWorkerPool
 from database.migrate import run_initial_migration
 
 # FIXME:Got it
 # Create database tables
 Contact.metadata.create_all(bind=engine)
 
+# Setup DB migration on startup
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    run_initial_migration()
+    # Transcription/extraction job workers (JOB_WORKERS=0 to run them only via run_workers.py)
+    workers = JobWorkerPool().start()
+    yield
+    workers.stop()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.project_name,
     description="AI-powered contact management and networking system with ChromaDB integration",
     version="2.0.0",
-    openapi_url=f"{settings.api_v1_str}/openapi.json"
+    openapi_url=f"{settings.api_v1_str}/openapi.json",
+    lifespan=lifespan
 )
 # One more thing: I can't reach out to your TG. What's wrong?
-# Setup DB migration on startup
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    run_initial_migration()
-    yield
+
+# Enforce upload size limits while the body arrives (added first so CORS wraps its 413s)
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # Set up CORS
 app.add_middleware(
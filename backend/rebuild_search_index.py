@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Utility script to rebuild the trigram substring-search index
+"""
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.search_index import search_index
+
+def rebuild_search_index():
+    """Regenerate the FTS5 trigram tables from contacts and taxonomy terms"""
+    db = SessionLocal()
+    
+    try:
+        stats = search_index.rebuild(db)
+        
+        print(f"\nRebuild complete:")
+        for table, count in stats.items():
+            print(f"{table}: {count}")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error during rebuild: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Rebuilding search index...")
+    rebuild_search_index()
+    print("Done!")
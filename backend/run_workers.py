@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Utility script to run job workers outside the API process
+
+Workers coordinate through the jobs table, so any number of these processes
+can run next to the API (set JOB_WORKERS=0 there to keep all model calls out
+of the API process).
+
+Usage: python run_workers.py [--workers 4] [--poll-interval 1.0]
+"""
+import argparse
+import signal
+import sys
+import os
+import threading
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.worker import JobWorkerPool
+
+def run_workers(workers: int, poll_interval: float):
+    """Run a worker pool until interrupted"""
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopped.set())
+
+    pool = JobWorkerPool(size=workers, poll_interval=poll_interval).start()
+    try:
+        while not stopped.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Stopping workers after their current jobs...")
+        pool.stop(timeout=settings.job_lease_seconds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run transcription and extraction job workers")
+    parser.add_argument("--workers", type=int, default=max(settings.job_workers, 1))
+    parser.add_argument("--poll-interval", type=float, default=settings.job_poll_interval)
+    args = parser.parse_args()
+
+    print("Starting job workers...")
+    run_workers(args.workers, args.poll_interval)
+    print("Done!")